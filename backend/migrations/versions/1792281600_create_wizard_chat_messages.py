@@ -0,0 +1,87 @@
+"""create wizard_chat_messages
+
+Revision ID: 6f1e2d3c4b5a
+Revises: b5d9a7c1e234
+Create Date: 2026-10-18
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6f1e2d3c4b5a"
+down_revision: str | Sequence[str] | None = "b5d9a7c1e234"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Move wizard chat history out of mcp_servers.meta into its own table."""
+    _ = op.create_table(
+        "wizard_chat_messages",
+        sa.Column("server_id", sa.UUID(), nullable=False),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("role", sa.String(length=20), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["server_id"], ["mcp_servers.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_wizard_chat_messages_server_id_seq",
+        "wizard_chat_messages",
+        ["server_id", "seq"],
+        unique=True,
+    )
+    op.execute(
+        """
+        INSERT INTO wizard_chat_messages
+            (id, server_id, seq, role, content, created_at, updated_at)
+        SELECT
+            gen_random_uuid(),
+            s.id,
+            m.seq,
+            coalesce(m.message ->> 'role', 'user'),
+            coalesce(m.message ->> 'content', ''),
+            s.updated_at,
+            s.updated_at
+        FROM mcp_servers AS s
+        CROSS JOIN LATERAL jsonb_array_elements(s.meta -> 'step_zero_chat_history')
+            WITH ORDINALITY AS m(message, seq)
+        WHERE jsonb_typeof(s.meta -> 'step_zero_chat_history') = 'array'
+        """
+    )
+    op.execute(
+        "UPDATE mcp_servers SET meta = meta - 'step_zero_chat_history' "
+        "WHERE meta -> 'step_zero_chat_history' IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Fold the messages back into mcp_servers.meta and drop the table."""
+    op.execute(
+        """
+        UPDATE mcp_servers AS s
+        SET meta = s.meta || jsonb_build_object('step_zero_chat_history', h.messages)
+        FROM (
+            SELECT
+                server_id,
+                jsonb_agg(
+                    jsonb_build_object('role', role, 'content', content)
+                    ORDER BY seq
+                ) AS messages
+            FROM wizard_chat_messages
+            GROUP BY server_id
+        ) AS h
+        WHERE h.server_id = s.id
+        """
+    )
+    op.drop_index(
+        "ix_wizard_chat_messages_server_id_seq", table_name="wizard_chat_messages"
+    )
+    op.drop_table("wizard_chat_messages")
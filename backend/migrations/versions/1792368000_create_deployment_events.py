@@ -0,0 +1,41 @@
+"""create deployment_events
+
+Revision ID: 8a2c4e6f1b3d
+Revises: 6f1e2d3c4b5a
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8a2c4e6f1b3d"
+down_revision: str | Sequence[str] | None = "6f1e2d3c4b5a"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Log of shared runtime mount changes replayed by every runtime process."""
+    _ = op.create_table(
+        "deployment_events",
+        sa.Column("seq", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("server_id", sa.UUID(), nullable=False),
+        sa.Column("kind", sa.String(length=20), nullable=False),
+        sa.Column("origin", sa.String(length=64), nullable=False),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_deployment_events_seq"), "deployment_events", ["seq"], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_deployment_events_seq"), table_name="deployment_events")
+    op.drop_table("deployment_events")
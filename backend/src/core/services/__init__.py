@@ -1,6 +1,11 @@
 # Core services exports
 
 
+# Capabilities
+from core.services.capabilities import (
+    get_capability_registry as get_capability_registry,
+)
+
 # Tier service
 from core.services.tier_service import CodeValidator as CodeValidator
 from core.services.tier_service import CURATED_LIBRARIES as CURATED_LIBRARIES
@@ -0,0 +1,159 @@
+"""
+Which curated libraries this runtime can actually import.
+
+CURATED_LIBRARIES is policy: what generated tool code may import. The
+capability registry is what is installed: it imports every curated module
+once, records its distribution version and which allowed symbols exist, and
+caches the derived views (code-generation prompt listing, tool namespace
+entries). Probing can import heavy packages such as playwright, so the API
+lifespan warms the registry in a worker thread before any tool is compiled.
+"""
+
+import asyncio
+import importlib
+import threading
+from dataclasses import dataclass
+from importlib import metadata
+from types import ModuleType
+from typing import Any
+
+from loguru import logger
+
+from core.services.tier_service import CURATED_LIBRARIES
+
+
+@dataclass(frozen=True)
+class LibraryCapability:
+    """
+    Probe result for one CURATED_LIBRARIES entry.
+
+    symbols is None when every export is allowed, otherwise the allowed
+    symbols the installed module actually has.
+    """
+
+    name: str
+    module: ModuleType | None
+    version: str | None
+    symbols: tuple[str, ...] | None
+
+    @property
+    def available(self) -> bool:
+        return self.module is not None
+
+    @property
+    def base_module(self) -> str:
+        return self.name.split(".")[0]
+
+
+def _distribution_version(
+    module_name: str, distributions: dict[str, list[str]]
+) -> str | None:
+    for dist in distributions.get(module_name.split(".")[0], []):
+        try:
+            return metadata.version(dist)
+        except metadata.PackageNotFoundError:
+            continue
+    return None
+
+
+class CapabilityRegistry:
+    """Lazily probed, cached view of the installed curated libraries."""
+
+    def __init__(self, libraries: dict[str, list[str] | None] | None = None):
+        self._libraries = CURATED_LIBRARIES if libraries is None else libraries
+        self._capabilities: dict[str, LibraryCapability] | None = None
+        self._prompt_listing: str | None = None
+        self._namespace_entries: dict[str, Any] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def libraries(self) -> dict[str, LibraryCapability]:
+        """Every curated entry, in CURATED_LIBRARIES order, probed on first use."""
+        if self._capabilities is None:
+            with self._lock:
+                if self._capabilities is None:
+                    self._capabilities = self._probe()
+        return self._capabilities
+
+    async def warm(self) -> None:
+        """Probe off the event loop."""
+        _ = await asyncio.to_thread(lambda: self.libraries)
+
+    def available(self) -> list[LibraryCapability]:
+        return [c for c in self.libraries.values() if c.available]
+
+    def is_installed(self, module_name: str) -> bool:
+        """Whether a curated module (or any curated module under its base) imports."""
+        capability = self.libraries.get(module_name)
+        if capability is not None:
+            return capability.available
+        base = module_name.split(".")[0]
+        return any(
+            c.available for c in self.libraries.values() if c.base_module == base
+        )
+
+    def prompt_listing(self) -> str:
+        """AVAILABLE_LIBRARIES block for the code generation prompt."""
+        if self._prompt_listing is None:
+            self._prompt_listing = "\n".join(
+                f"- {c.name}"
+                + (f" ({c.version})" if c.version else "")
+                + ": "
+                + ("all exports" if c.symbols is None else ", ".join(c.symbols))
+                for c in self.available()
+            )
+        return self._prompt_listing
+
+    def namespace_entries(self) -> dict[str, Any]:
+        """
+        Globals every tool namespace starts with.
+
+        Each module is bound under its top-level name, plus its allowed
+        symbols. Later entries win, as they did when each namespace imported
+        the libraries itself.
+        """
+        if self._namespace_entries is None:
+            entries: dict[str, Any] = {}
+            for c in self.available():
+                entries[c.base_module] = c.module
+                for symbol in c.symbols or ():
+                    entries[symbol] = getattr(c.module, symbol)
+            self._namespace_entries = entries
+        return dict(self._namespace_entries)
+
+    def _probe(self) -> dict[str, LibraryCapability]:
+        distributions = metadata.packages_distributions()
+        capabilities: dict[str, LibraryCapability] = {}
+        for name, allowed in self._libraries.items():
+            try:
+                module = importlib.import_module(name)
+            except ImportError:
+                capabilities[name] = LibraryCapability(name, None, None, None)
+                continue
+            symbols = (
+                None
+                if allowed is None
+                else tuple(s for s in allowed if hasattr(module, s))
+            )
+            capabilities[name] = LibraryCapability(
+                name=name,
+                module=module,
+                version=_distribution_version(name, distributions),
+                symbols=symbols,
+            )
+        missing = [n for n, c in capabilities.items() if not c.available]
+        logger.info(
+            f"Curated libraries: {len(capabilities) - len(missing)} available, "
+            f"missing: {', '.join(missing) or 'none'}"
+        )
+        return capabilities
+
+
+_capability_registry: CapabilityRegistry | None = None
+
+
+def get_capability_registry() -> CapabilityRegistry:
+    global _capability_registry
+    if _capability_registry is None:
+        _capability_registry = CapabilityRegistry()
+    return _capability_registry
@@ -0,0 +1,158 @@
+"""Access token signing keys, preloaded once and selected by kid."""
+
+import base64
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from loguru import logger
+
+from settings import settings
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256", "EdDSA")
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    """A parsed key. private_key is None for verification-only keys."""
+
+    kid: str
+    algorithm: str
+    public_key: Any
+    private_key: Any = None
+
+    @property
+    def is_asymmetric(self) -> bool:
+        return self.algorithm in ASYMMETRIC_ALGORITHMS
+
+    def to_jwk(self) -> dict[str, Any]:
+        jwk: dict[str, Any] = jwt.get_algorithm_by_name(self.algorithm).to_jwk(
+            self.public_key, as_dict=True
+        )
+        jwk.update(kid=self.kid, alg=self.algorithm, use="sig")
+        return jwk
+
+
+def _key_id(public_key: Any) -> str:
+    """Stable kid derived from the public key (first 16 chars of its SHA-256)."""
+    der = public_key.public_bytes(
+        serialization.Encoding.DER,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    digest = hashlib.sha256(der).digest()
+    return base64.urlsafe_b64encode(digest).decode().rstrip("=")[:16]
+
+
+def load_key(
+    algorithm: str,
+    public_pem: str,
+    private_pem: str | None = None,
+    kid: str | None = None,
+) -> SigningKey:
+    """Parse PEM key material for an asymmetric algorithm."""
+    if algorithm not in ASYMMETRIC_ALGORITHMS:
+        raise ValueError(f"Unsupported JWT algorithm {algorithm!r}")
+    impl = jwt.get_algorithm_by_name(algorithm)
+    private_key = impl.prepare_key(private_pem.strip()) if private_pem else None
+    if public_pem.strip():
+        public_key = impl.prepare_key(public_pem.strip())
+    elif private_key is not None:
+        public_key = private_key.public_key()
+    else:
+        raise ValueError("A public or private key is required")
+    return SigningKey(
+        kid=kid or _key_id(public_key),
+        algorithm=algorithm,
+        public_key=public_key,
+        private_key=private_key,
+    )
+
+
+class JWTKeyring:
+    """
+    Signs access tokens with the active key and verifies them by ``kid``.
+
+    Keys are parsed once at construction instead of on every sign/verify.
+    Tokens carry the signing key's ``kid`` header; verification picks the
+    matching key, so a rotation is: publish the new public key as a
+    verification key on every worker, switch the active key, then drop the
+    old key after the access token lifetime has passed. Tokens without a
+    ``kid`` (issued before key ids) are checked against the active key.
+
+    Without asymmetric keys the keyring falls back to HS256 with the admin
+    API key, as before, and publishes an empty JWKS.
+    """
+
+    def __init__(self, active: SigningKey, verification: list[SigningKey]) -> None:
+        self.active = active
+        self._keys: dict[str, SigningKey] = {active.kid: active}
+        for key in verification:
+            _ = self._keys.setdefault(key.kid, key)
+
+    @classmethod
+    def from_settings(cls) -> "JWTKeyring":
+        if settings.JWT_PRIVATE_KEY.strip():
+            active = load_key(
+                settings.JWT_ALGORITHM,
+                settings.JWT_PUBLIC_KEY,
+                settings.JWT_PRIVATE_KEY,
+                kid=settings.JWT_KEY_ID or None,
+            )
+        else:
+            logger.warning("JWT_PRIVATE_KEY is not set; signing tokens with HS256")
+            secret = settings.ADMIN_ROUTES_API_KEY
+            active = SigningKey(
+                kid="hs256", algorithm="HS256", public_key=secret, private_key=secret
+            )
+        verification = [
+            load_key(
+                entry.get("alg", settings.JWT_ALGORITHM),
+                entry["public_key"],
+                kid=entry.get("kid"),
+            )
+            for entry in json.loads(settings.JWT_VERIFICATION_KEYS or "[]")
+        ]
+        return cls(active, verification)
+
+    def sign(self, payload: dict[str, Any]) -> str:
+        return jwt.encode(
+            payload,
+            self.active.private_key,
+            algorithm=self.active.algorithm,
+            headers={"kid": self.active.kid},
+        )
+
+    def decode(
+        self,
+        token: str,
+        audience: str | None = None,
+        require: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Verify a token's signature and claims.
+
+        Raises jwt.InvalidTokenError (or a subclass) like jwt.decode.
+        """
+        key: SigningKey | None = self.active
+        # Only parse the header when there is more than one key to pick from
+        kid = (
+            jwt.get_unverified_header(token).get("kid") if len(self._keys) > 1 else None
+        )
+        if kid is not None:
+            key = self._keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown signing key {kid!r}")
+        return jwt.decode(
+            token,
+            key.public_key,
+            algorithms=[key.algorithm],
+            audience=audience,
+            options={"require": require or []},
+        )
+
+    def jwks(self) -> dict[str, list[dict[str, Any]]]:
+        """Public keys as a JWK Set (RFC 7517)."""
+        return {"keys": [k.to_jwk() for k in self._keys.values() if k.is_asymmetric]}
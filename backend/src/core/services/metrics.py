@@ -0,0 +1,247 @@
+"""
+Minimal in-process Prometheus metrics.
+
+Counters and histograms are kept in a process-wide registry and rendered
+in the Prometheus text exposition format (0.0.4) by the /metrics route.
+Values that already live elsewhere (auth counters, cache stats, DB pool)
+are read at scrape time and rendered with format_family() instead of
+being mirrored here.
+"""
+
+import math
+import threading
+from collections.abc import Iterable, Sequence
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = dict[str, str]
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def format_sample(name: str, labels: Labels, value: float) -> str:
+    if labels:
+        rendered = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+        return f"{name}{{{rendered}}} {_format_value(value)}"
+    return f"{name} {_format_value(value)}"
+
+
+def format_family(
+    name: str,
+    help_text: str,
+    metric_type: str,
+    samples: Iterable[tuple[Labels, float]],
+) -> str:
+    """Render one metric family (HELP, TYPE and samples)."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    lines.extend(format_sample(name, labels, value) for labels, value in samples)
+    return "\n".join(lines)
+
+
+class Counter:
+    """Monotonic counter with a fixed set of label names."""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0.0)
+
+    def render(self) -> str:
+        with self._lock:
+            items = list(self._values.items())
+        return format_family(
+            self.name,
+            self.help_text,
+            "counter",
+            ((dict(zip(self.labelnames, key)), value) for key, value in items),
+        )
+
+
+class Gauge:
+    """Settable gauge with a fixed set of label names."""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        with self._lock:
+            self._values[labelvalues] = value
+
+    def remove(self, *labelvalues: str) -> None:
+        with self._lock:
+            _ = self._values.pop(labelvalues, None)
+
+    def render(self) -> str:
+        with self._lock:
+            items = list(self._values.items())
+        return format_family(
+            self.name,
+            self.help_text,
+            "gauge",
+            ((dict(zip(self.labelnames, key)), value) for key, value in items),
+        )
+
+
+class Histogram:
+    """Cumulative histogram with a fixed set of label names."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labelvalues -> (per-bucket counts, sum, count)
+        self._values: dict[tuple[str, ...], tuple[list[int], float, int]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        with self._lock:
+            counts, total, count = self._values.get(
+                labelvalues, ([0] * len(self.buckets), 0.0, 0)
+            )
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[labelvalues] = (counts, total + value, count + 1)
+
+    def count(self, *labelvalues: str) -> int:
+        entry = self._values.get(labelvalues)
+        return entry[2] if entry else 0
+
+    def render(self) -> str:
+        with self._lock:
+            items = [(k, (list(c), s, n)) for k, (c, s, n) in self._values.items()]
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for key, (counts, total, count) in items:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(
+                    format_sample(
+                        f"{self.name}_bucket",
+                        {**labels, "le": _format_value(bound)},
+                        cumulative,
+                    )
+                )
+            lines.append(
+                format_sample(f"{self.name}_bucket", {**labels, "le": "+Inf"}, count)
+            )
+            lines.append(format_sample(f"{self.name}_sum", labels, total))
+            lines.append(format_sample(f"{self.name}_count", labels, count))
+        return "\n".join(lines)
+
+
+class MetricsRegistry:
+    """Process-wide collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: list[Counter | Gauge | Histogram] = []
+
+    def counter(
+        self, name: str, help_text: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        metric = Counter(name, help_text, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        metric = Gauge(name, help_text, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, help_text, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics)
+
+
+metrics = MetricsRegistry()
+
+mcp_server_requests_total = metrics.counter(
+    "mcp_server_requests_total",
+    "HTTP requests routed to a shared MCP server",
+    ["server_id"],
+)
+mcp_tool_calls_total = metrics.counter(
+    "mcp_tool_calls_total",
+    "MCP tool calls by server, tool and outcome",
+    ["server_id", "tool", "status"],
+)
+mcp_tool_call_duration_seconds = metrics.histogram(
+    "mcp_tool_call_duration_seconds",
+    "MCP tool call latency",
+    ["server_id", "tool"],
+)
+mcp_tool_rejections_total = metrics.counter(
+    "mcp_tool_rejections_total",
+    "MCP tool calls rejected by execution limits",
+    ["server_id", "tool", "reason"],
+)
+mcp_compile_duration_seconds = metrics.histogram(
+    "mcp_compile_duration_seconds",
+    "Time to compile all tools of a server",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+mcp_server_last_compile_seconds = metrics.gauge(
+    "mcp_server_last_compile_seconds",
+    "Duration of the most recent tool compilation per server",
+    ["server_id"],
+)
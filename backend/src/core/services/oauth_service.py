@@ -3,12 +3,20 @@
 import base64
 import hashlib
 import secrets
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any
 from uuid import UUID
 
 import jwt
+from core.services.jwt_keyring import JWTKeyring
+from core.services.token_cache import (
+    AccessTokenCache,
+    LocalRevocationChannel,
+    RevocationIndex,
+    TokenRevocation,
+)
 from infrastructure.models.oauth import OAuthClient
 from infrastructure.repositories.oauth import (
     OAuthAccessTokenCreate,
@@ -103,6 +111,10 @@ class OAuthService:
     refresh_token_lifetime: int
     auth_code_lifetime: int
     supported_scopes: list[str]
+    token_cache: AccessTokenCache
+    revocations: LocalRevocationChannel
+    revocation_index: RevocationIndex
+    keyring: JWTKeyring
 
     def __init__(self):
         self.issuer = settings.OAUTH_ISSUER
@@ -110,6 +122,24 @@ class OAuthService:
         self.refresh_token_lifetime = settings.REFRESH_TOKEN_LIFETIME
         self.auth_code_lifetime = settings.AUTH_CODE_LIFETIME
         self.supported_scopes = settings.OAUTH_SCOPES.split()
+        # A validation is never reused for longer than one revocation refresh,
+        # so a revocation on another worker applies here within that window
+        # even while index refreshes are failing
+        self.token_cache = AccessTokenCache(
+            max_entries=settings.OAUTH_TOKEN_CACHE_MAX_ENTRIES,
+            max_ttl=min(
+                settings.OAUTH_TOKEN_CACHE_MAX_TTL,
+                settings.OAUTH_REVOCATION_REFRESH_SECONDS,
+            ),
+        )
+        self.revocations = LocalRevocationChannel()
+        self.revocations.subscribe(self._on_revocation)
+        self.keyring = JWTKeyring.from_settings()
+        self.revocation_index = RevocationIndex(
+            lambda since: Provider.oauth_access_token_repo().get_revoked_since(since),
+            refresh_interval=settings.OAUTH_REVOCATION_REFRESH_SECONDS,
+            on_revoked=self.token_cache.invalidate_jtis,
+        )
 
     # =========================================================================
     # PKCE Verification
@@ -397,20 +427,8 @@ class OAuthService:
             "scope": scope,
         }
 
-        # Sign with RS256 if keys are configured, otherwise use HS256
-        if settings.JWT_PRIVATE_KEY:
-            access_token = jwt.encode(
-                access_token_payload,
-                settings.JWT_PRIVATE_KEY,
-                algorithm=settings.JWT_ALGORITHM,
-            )
-        else:
-            # Fallback to HS256 with admin key (not recommended for production)
-            access_token = jwt.encode(
-                access_token_payload,
-                settings.ADMIN_ROUTES_API_KEY,
-                algorithm="HS256",
-            )
+        # Signed with the keyring's active key (kid header set)
+        access_token = self.keyring.sign(access_token_payload)
 
         # Store access token metadata
         access_token_hash = hashlib.sha256(access_token.encode()).hexdigest()
@@ -466,25 +484,27 @@ class OAuthService:
 
         Returns the decoded JWT payload if valid.
         Raises OAuthError if invalid.
+
+        Successful validations are cached until the token expires (see
+        AccessTokenCache), so repeat calls skip the signature check and the
+        revocation lookup. Revocations invalidate the cache: on this worker
+        immediately, on other workers when their RevocationIndex next
+        refreshes. The revocation lookup itself only hits the DB when the
+        RevocationIndex cannot rule the jti out.
         """
+        audience = str(server_id) if server_id else ""
+        cached = self.token_cache.get(token, audience)
+        if cached is not None:
+            return cached
+        generation = self.token_cache.generation
+
         try:
-            # Decode and verify the JWT
-            if settings.JWT_PUBLIC_KEY:
-                payload = jwt.decode(
-                    token,
-                    settings.JWT_PUBLIC_KEY,
-                    audience=str(server_id),  # TODO: poshel naxui
-                    algorithms=[settings.JWT_ALGORITHM],
-                    options={"require": ["exp", "iat", "sub", "jti"]},
-                )
-            else:
-                # Fallback to HS256 with admin key
-                payload = jwt.decode(
-                    token,
-                    settings.ADMIN_ROUTES_API_KEY,
-                    algorithms=["HS256"],
-                    options={"require": ["exp", "iat", "sub", "jti"]},
-                )
+            # Decode and verify the JWT with the key named by its kid
+            payload = self.keyring.decode(
+                token,
+                audience=str(server_id),
+                require=["exp", "iat", "sub", "jti"],
+            )
         except jwt.ExpiredSignatureError:
             raise InvalidGrantError("Access token has expired")
         except jwt.InvalidTokenError as e:
@@ -498,11 +518,12 @@ class OAuthService:
 
         # Check if token is revoked
         jti = payload.get("jti")
-        if jti:
+        if jti and self.revocation_index.might_be_revoked(jti):
             is_valid = await Provider.oauth_access_token_repo().is_token_valid(jti)
             if not is_valid:
                 raise InvalidGrantError("Access token has been revoked")
 
+        self.token_cache.put(token, audience, payload, generation=generation)
         return payload
 
     # =========================================================================
@@ -533,10 +554,44 @@ class OAuthService:
             )
             if access_token:
                 _ = await Provider.oauth_access_token_repo().revoke(access_token.jti)
+                await self.revocations.publish(TokenRevocation(jti=access_token.jti))
                 return True
 
         return False
 
+    async def revoke_all_for_user(
+        self, user_id: str, server_id: UUID | None = None
+    ) -> int:
+        """Revoke every access and refresh token of a user on a server (or all)."""
+        revoked = await Provider.oauth_access_token_repo().revoke_all_for_user(
+            user_id, server_id
+        )
+        revoked += await Provider.oauth_refresh_token_repo().revoke_all_for_user(
+            user_id, server_id
+        )
+        try:
+            # The jtis are not known here; pull them into the index so a
+            # validation racing this call cannot re-cache one of them
+            _ = await self.revocation_index.refresh()
+        except Exception as e:
+            logger.error(f"Failed to refresh token revocation index: {e}")
+        await self.revocations.publish(
+            TokenRevocation(
+                user_id=user_id,
+                audience=str(server_id) if server_id is not None else None,
+            )
+        )
+        logger.info(f"Revoked {revoked} tokens for user {user_id} on {server_id}")
+        return revoked
+
+    def _on_revocation(self, event: TokenRevocation) -> None:
+        _ = self.token_cache.invalidate(event)
+        if event.jti is not None:
+            # Upper bound on the token's exp; pruned on the next refresh after it
+            self.revocation_index.add(
+                event.jti, time.time() + self.access_token_lifetime
+            )
+
 
 # Singleton instance
 oauth_service = OAuthService()
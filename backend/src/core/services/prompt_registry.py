@@ -0,0 +1,121 @@
+"""
+LLM prompt templates from core/prompts, parsed once and cached by mtime.
+
+Files are read and YAML-parsed when the registry is preloaded at import, so
+wizard request paths never touch the filesystem. With hot_reload enabled each
+lookup stats the file and re-parses it when its mtime changed; a reload that
+fails to parse or validate is logged and the previous version kept.
+"""
+
+import string
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, cast
+
+import yaml
+from loguru import logger
+
+from settings import settings
+
+PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
+
+
+def format_placeholders(template: str) -> frozenset[str]:
+    """Top-level field names a str.format template refers to."""
+    names: set[str] = set()
+    for _, field_name, _, _ in string.Formatter().parse(template):
+        if field_name:
+            names.add(field_name.split(".", 1)[0].split("[", 1)[0])
+    return frozenset(names)
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A parsed prompt file. source is the raw file text."""
+
+    name: str
+    source: str
+    data: dict[str, Any]
+    mtime_ns: int
+
+    def field(self, key: str = "prompt") -> str:
+        value = self.data.get(key, "")
+        return value if isinstance(value, str) else ""
+
+
+class PromptRegistry:
+    """Cache of prompt files keyed by file name."""
+
+    def __init__(self, prompts_dir: Path = PROMPTS_DIR, hot_reload: bool = False):
+        self.prompts_dir = prompts_dir
+        self.hot_reload = hot_reload
+        self._templates: dict[str, PromptTemplate] = {}
+        self._requirements: dict[str, tuple[str, frozenset[str]]] = {}
+        self._lock = threading.Lock()
+
+    def require_placeholders(
+        self, name: str, placeholders: Iterable[str], key: str = "prompt"
+    ) -> None:
+        """
+        Declare the keyword arguments a template will be .format()-ed with.
+
+        The template is (re)validated now and on every reload: referring to a
+        placeholder outside this set would raise KeyError at format time, so
+        it is rejected up front.
+        """
+        self._requirements[name] = (key, frozenset(placeholders))
+        with self._lock:
+            self._templates[name] = self._load(name)
+
+    def preload(self) -> None:
+        """Parse every *.yaml file in the prompts directory."""
+        with self._lock:
+            for path in sorted(self.prompts_dir.glob("*.yaml")):
+                self._templates[path.name] = self._load(path.name)
+
+    def get(self, name: str) -> PromptTemplate:
+        template = self._templates.get(name)
+        if template is not None and not self.hot_reload:
+            return template
+        with self._lock:
+            template = self._templates.get(name)
+            if template is None:
+                template = self._templates[name] = self._load(name)
+                return template
+            try:
+                mtime_ns = (self.prompts_dir / name).stat().st_mtime_ns
+                if mtime_ns != template.mtime_ns:
+                    template = self._templates[name] = self._load(name)
+                    logger.info(f"Reloaded prompt {name}")
+            except (OSError, ValueError, yaml.YAMLError) as e:
+                logger.error(f"Keeping previous prompt {name}: {e}")
+            return template
+
+    def _load(self, name: str) -> PromptTemplate:
+        path = self.prompts_dir / name
+        mtime_ns = path.stat().st_mtime_ns
+        source = path.read_text()
+        raw = cast(object, yaml.safe_load(source))
+        template = PromptTemplate(
+            name=name,
+            source=source,
+            data=cast(dict[str, Any], raw) if isinstance(raw, dict) else {},
+            mtime_ns=mtime_ns,
+        )
+        if name in self._requirements:
+            key, placeholders = self._requirements[name]
+            used = format_placeholders(template.field(key))
+            unknown = used - placeholders
+            if unknown:
+                raise ValueError(
+                    f"Prompt {name} uses unknown placeholders: {sorted(unknown)}"
+                )
+            unused = placeholders - used
+            if unused:
+                logger.warning(f"Prompt {name} does not use: {sorted(unused)}")
+        return template
+
+
+prompt_registry = PromptRegistry(hot_reload=settings.PROMPTS_HOT_RELOAD)
@@ -1,8 +1,10 @@
 """Request-scoped context for ephemeral environment variables."""
 
-from collections import UserDict
-from collections.abc import Iterator
+import os
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping
 from contextvars import ContextVar
+from itertools import chain
+from types import MappingProxyType
 from typing import override
 from uuid import UUID
 
@@ -17,15 +19,32 @@ request_customer_id: ContextVar[UUID | None] = ContextVar(
 )
 
 
-class DynamicEnvDict(UserDict[str, str]):
+class DynamicEnvDict(MutableMapping[str, str]):
     """
-    A dict-like object that checks request context before static values.
+    A layered env mapping that checks request context before static values.
 
     Lookup order:
     1. Per-request context (from headers via middleware)
-    2. Static env vars (from DB, set at compile time)
+    2. Static env vars (from DB, set at compile time), plus any host
+       variables named in host_allowlist, copied once at construction
+
+    The host environment is excluded unless allowlisted. Lookups are O(1)
+    and nothing is merged: iteration walks the layers lazily, and keys(),
+    items() and values() are the standard lazy views. Writes go to the
+    static layer.
     """
 
+    def __init__(
+        self,
+        static: Mapping[str, str] | None = None,
+        host_allowlist: Iterable[str] = (),
+    ) -> None:
+        self.data: dict[str, str] = {
+            key: os.environ[key] for key in host_allowlist if key in os.environ
+        }
+        self.data.update(static or {})
+        self._snapshot: tuple[dict[str, str], Mapping[str, str]] | None = None
+
     @override
     def __getitem__(self, key: str) -> str:
         # 1. Check per-request context
@@ -33,50 +52,59 @@ class DynamicEnvDict(UserDict[str, str]):
         if key in ctx_vars:
             return ctx_vars[key]
         # 2. Check static env vars (self.data)
-        if key in self.data:
-            return self.data[key]
-        raise KeyError(key)
+        return self.data[key]
 
     @override
     def get(self, key: str, default: str | None = None) -> str | None:
         """Get an environment variable with optional default."""
-        try:
-            return self[key]
-        except KeyError:
-            return default
+        ctx_vars = request_env_vars.get()
+        if key in ctx_vars:
+            return ctx_vars[key]
+        return self.data.get(key, default)
 
     @override
     def __contains__(self, key: object) -> bool:
         """Check if key exists in any of the env sources."""
-        if not isinstance(key, str):
-            return False
-        ctx_vars = request_env_vars.get()
-        return key in ctx_vars or key in self.data
+        return key in request_env_vars.get() or key in self.data
 
     @override
-    def keys(self) -> list[str]:
-        """Return all keys from all sources."""
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over all keys; request values shadow static ones."""
         ctx_vars = request_env_vars.get()
-        all_keys = set(self.data.keys())
-        all_keys.update(ctx_vars.keys())
-        return list(all_keys)
+        if not ctx_vars:
+            return iter(self.data)
+        return chain(ctx_vars, (k for k in self.data if k not in ctx_vars))
 
     @override
-    def values(self) -> list[str]:
-        """Return all values."""
-        return [self[k] for k in self.keys()]
+    def __len__(self) -> int:
+        """Return count of all unique keys."""
+        ctx_vars = request_env_vars.get()
+        if not ctx_vars:
+            return len(self.data)
+        return len(self.data) + sum(1 for k in ctx_vars if k not in self.data)
 
     @override
-    def items(self) -> list[tuple[str, str]]:
-        """Return all key-value pairs."""
-        return [(k, self[k]) for k in self.keys()]
+    def __setitem__(self, key: str, value: str) -> None:
+        self.data[key] = value
+        self._snapshot = None
 
     @override
-    def __iter__(self) -> Iterator[str]:
-        """Iterate over all keys."""
-        return iter(self.keys())
+    def __delitem__(self, key: str) -> None:
+        del self.data[key]
+        self._snapshot = None
 
-    @override
-    def __len__(self) -> int:
-        """Return count of all unique keys."""
-        return len(self.keys())
+    def snapshot(self) -> Mapping[str, str]:
+        """
+        Frozen merged view for the current request.
+
+        Built on first use in a request and reused for the rest of it (the
+        request's env dict is matched by identity); writes to the static
+        layer discard it.
+        """
+        ctx_vars = request_env_vars.get()
+        cached = self._snapshot
+        if cached is not None and cached[0] is ctx_vars:
+            return cached[1]
+        frozen = MappingProxyType({**self.data, **ctx_vars})
+        self._snapshot = (ctx_vars, frozen)
+        return frozen
@@ -0,0 +1,221 @@
+"""
+Deployment-change events shared by every shared runtime process.
+
+Activating, remounting or deleting a server only changes the FastAPI app of
+the process that handled the request. Each change is published on a
+runtime event bus, and every process subscribed to it mounts, remounts or
+unmounts the server itself (see entrypoints.mcp.shared_runtime).
+
+Two buses share one interface (subscribe/publish/catch_up/start/aclose):
+
+- LocalRuntimeEventBus delivers in-process, for a single worker and tests.
+- PostgresRuntimeEventBus appends each event to the deployment_events
+  table and NOTIFYs listeners. Listeners only use the notification as a
+  wake-up and read the table from the last seq they applied, so events
+  missed while the LISTEN connection was down are replayed in order on
+  reconnect, and a periodic poll covers a connection that died silently.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from enum import Enum
+from uuid import UUID
+
+import asyncpg
+from loguru import logger
+
+from infrastructure.repositories.deployment import DEPLOYMENT_EVENTS_CHANNEL
+from infrastructure.repositories.repo_provider import Provider
+from settings import settings
+
+
+class RuntimeEventKind(str, Enum):
+    MOUNTED = "mounted"
+    REMOUNTED = "remounted"
+    UNMOUNTED = "unmounted"
+
+
+@dataclass(frozen=True)
+class RuntimeEvent:
+    """
+    A server's shared runtime mount changed.
+
+    origin identifies the publishing runtime, which has already applied
+    the change itself. seq is assigned by the bus on publish.
+    """
+
+    server_id: UUID
+    kind: RuntimeEventKind
+    origin: str
+    seq: int = 0
+
+
+RuntimeEventHandler = Callable[[RuntimeEvent], Awaitable[None]]
+
+
+class _Subscribers:
+    def __init__(self) -> None:
+        self._handlers: list[RuntimeEventHandler] = []
+
+    def subscribe(self, handler: RuntimeEventHandler) -> None:
+        self._handlers.append(handler)
+
+    async def deliver(self, event: RuntimeEvent) -> None:
+        for handler in self._handlers:
+            try:
+                await handler(event)
+            except Exception as e:
+                logger.error(f"Runtime event handler failed for {event}: {e}")
+
+
+class LocalRuntimeEventBus(_Subscribers):
+    """In-process runtime event bus; handlers run before publish returns."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._seq = 0
+
+    async def publish(self, event: RuntimeEvent) -> RuntimeEvent:
+        self._seq += 1
+        event = RuntimeEvent(event.server_id, event.kind, event.origin, self._seq)
+        await self.deliver(event)
+        return event
+
+    async def catch_up(self) -> int:
+        return 0
+
+    def start(self) -> None:
+        return None
+
+    async def aclose(self) -> None:
+        return None
+
+
+class PostgresRuntimeEventBus(_Subscribers):
+    """
+    Runtime event bus on the deployment_events table and LISTEN/NOTIFY.
+
+    Events are delivered from a single background task, in seq order,
+    after the newest event that existed at the first catch_up() (call it
+    before loading servers at startup; that load reflects everything
+    before it).
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        poll_interval: float = 30.0,
+        reconnect_delay: float = 5.0,
+        retention: timedelta = timedelta(days=1),
+    ) -> None:
+        super().__init__()
+        self.dsn = dsn
+        self.poll_interval = poll_interval
+        self.reconnect_delay = reconnect_delay
+        self.retention = retention
+        self.last_seq: int | None = None
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    async def publish(self, event: RuntimeEvent) -> RuntimeEvent:
+        seq = await Provider.deployment_event_repo().append(
+            event.server_id, event.kind.value, event.origin
+        )
+        return RuntimeEvent(event.server_id, event.kind, event.origin, seq)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            _ = self._task.cancel()
+            _ = await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def catch_up(self) -> int:
+        """
+        Deliver every event after last_seq. Returns the number delivered.
+
+        The first call only records the current position.
+        """
+        repo = Provider.deployment_event_repo()
+        if self.last_seq is None:
+            self.last_seq = await repo.latest_seq()
+            return 0
+        delivered = 0
+        while True:
+            rows = await repo.get_since(self.last_seq)
+            for row in rows:
+                self.last_seq = row.seq
+                await self.deliver(
+                    RuntimeEvent(
+                        row.server_id, RuntimeEventKind(row.kind), row.origin, row.seq
+                    )
+                )
+            delivered += len(rows)
+            if not rows:
+                return delivered
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._prune()
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    f"Runtime event listener failed: {e} - "
+                    + f"reconnecting in {self.reconnect_delay:.0f}s"
+                )
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _listen(self) -> None:
+        conn = await asyncpg.connect(self.dsn)
+        try:
+            await conn.add_listener(DEPLOYMENT_EVENTS_CHANNEL, self._on_notify)
+            # LISTEN is active before reading, so nothing falls in between
+            caught_up = await self.catch_up()
+            logger.info(
+                f"Listening for runtime events after seq {self.last_seq} "
+                + f"(replayed {caught_up})"
+            )
+            while not conn.is_closed():
+                try:
+                    _ = await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except TimeoutError:
+                    pass
+                self._wakeup.clear()
+                _ = await self.catch_up()
+        finally:
+            await conn.close()
+
+    def _on_notify(self, conn: object, pid: int, channel: str, payload: object) -> None:
+        self._wakeup.set()
+
+    async def _prune(self) -> None:
+        cutoff = datetime.now(UTC).replace(tzinfo=None) - self.retention
+        deleted = await Provider.deployment_event_repo().delete_before(cutoff)
+        if deleted:
+            logger.debug(f"Pruned {deleted} runtime events older than {cutoff}")
+
+
+RuntimeEventBus = LocalRuntimeEventBus | PostgresRuntimeEventBus
+
+_runtime_event_bus: RuntimeEventBus | None = None
+
+
+def get_runtime_event_bus() -> RuntimeEventBus:
+    global _runtime_event_bus
+    if _runtime_event_bus is None:
+        if settings.MCP_RUNTIME_EVENTS_BACKEND == "postgres":
+            _runtime_event_bus = PostgresRuntimeEventBus(
+                str(settings.ASYNC_DB_DSN).replace("+asyncpg", ""),
+                poll_interval=settings.MCP_RUNTIME_EVENTS_POLL_SECONDS,
+            )
+        else:
+            _runtime_event_bus = LocalRuntimeEventBus()
+    return _runtime_event_bus
@@ -0,0 +1,90 @@
+"""
+Consistent-hash assignment of shared MCP servers to runtime nodes.
+
+With settings.MCP_SHARD_NODES set, each runtime node compiles and mounts
+only the servers whose id hashes to it, and proxies requests for other
+servers to their owner. Nodes are identified by their base URL, which is
+also the proxy target. Every node places vnodes points on a hash ring
+and a server belongs to the first point at or after its own hash, so
+adding or removing a node only moves the servers on the ring arcs it
+gains or loses (about 1/N of them) and leaves every other assignment alone.
+"""
+
+import bisect
+import hashlib
+from collections.abc import Sequence
+from uuid import UUID
+
+from settings import settings
+
+
+def _ring_hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest())
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes."""
+
+    def __init__(self, nodes: Sequence[str], vnodes: int = 128) -> None:
+        self.nodes = tuple(sorted(set(nodes)))
+        if not self.nodes:
+            raise ValueError("A hash ring needs at least one node")
+        points = sorted(
+            (_ring_hash(f"{node}#{i}"), node)
+            for node in self.nodes
+            for i in range(max(1, vnodes))
+        )
+        self._points = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def owner(self, key: str) -> str:
+        index = bisect.bisect_left(self._points, _ring_hash(key))
+        return self._owners[index % len(self._owners)]
+
+
+class ShardAssignment:
+    """Which runtime node owns each server, as seen from self_node."""
+
+    def __init__(self, nodes: Sequence[str], self_node: str, vnodes: int = 128):
+        self.ring = HashRing(nodes, vnodes)
+        if self_node not in self.ring.nodes:
+            raise ValueError(
+                f"MCP_SHARD_SELF {self_node!r} is not one of the shard nodes "
+                + f"{list(self.ring.nodes)}"
+            )
+        self.self_node = self_node
+
+    def owner(self, server_id: UUID) -> str:
+        return self.ring.owner(str(server_id))
+
+    def owns(self, server_id: UUID) -> bool:
+        return self.owner(server_id) == self.self_node
+
+
+def _node_list(value: str) -> list[str]:
+    return [node.strip().rstrip("/") for node in value.split(",") if node.strip()]
+
+
+_shard_assignment: ShardAssignment | None = None
+_shard_assignment_loaded = False
+
+
+def get_shard_assignment() -> ShardAssignment | None:
+    """This node's shard assignment, or None when sharding is disabled."""
+    global _shard_assignment, _shard_assignment_loaded
+    if not _shard_assignment_loaded:
+        nodes = _node_list(settings.MCP_SHARD_NODES)
+        if nodes:
+            _shard_assignment = ShardAssignment(
+                nodes,
+                settings.MCP_SHARD_SELF.strip().rstrip("/"),
+                vnodes=settings.MCP_SHARD_VNODES,
+            )
+        _shard_assignment_loaded = True
+    return _shard_assignment
+
+
+def owns_server(server_id: UUID) -> bool:
+    """Whether this node serves server_id (always true without sharding)."""
+    assignment = get_shard_assignment()
+    return assignment is None or assignment.owns(server_id)
@@ -1,11 +1,19 @@
 """Tier management and curated library validation for freemium model."""
 
 import ast
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from enum import Enum
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel
 
+if TYPE_CHECKING:
+    from core.services.capabilities import CapabilityRegistry
+
 
 class Tier(str, Enum):
     FREE = "free"
@@ -100,6 +108,132 @@ TIER_LIMITS = {
 }
 
 
+# Calls rejected in free tier code (also removed from builtins at runtime)
+RESTRICTED_CALLS = frozenset(
+    {"eval", "exec", "compile", "open", "dir", "globals", "locals", "vars"}
+)
+
+# Map schema type names to Python annotation patterns that indicate a mismatch
+_SCHEMA_TO_PYTHON: dict[str, set[str]] = {
+    "string": {"dict", "Dict", "list", "List", "set", "Set", "tuple", "Tuple"},
+    "integer": {"dict", "Dict", "str", "string"},
+    "boolean": {"dict", "Dict", "str", "string", "int", "integer"},
+    "number": {"dict", "Dict", "str", "string"},
+    "array": {"dict", "Dict", "str", "string", "int", "integer"},
+}
+
+VALIDATION_CACHE_MAX_ENTRIES = 4096
+
+
+@dataclass(frozen=True)
+class FunctionSignature:
+    """Name, parameter names and annotation sources of a function definition."""
+
+    name: str
+    params: frozenset[str]
+    annotations: dict[str, str]
+
+    @classmethod
+    def of(
+        cls, func_def: ast.AsyncFunctionDef | ast.FunctionDef
+    ) -> "FunctionSignature":
+        args = [
+            arg
+            for arg in func_def.args.args + func_def.args.kwonlyargs
+            if arg.arg != "self"
+        ]
+        return cls(
+            name=func_def.name,
+            params=frozenset(arg.arg for arg in args),
+            annotations={
+                arg.arg: ast.unparse(arg.annotation)
+                for arg in args
+                if arg.annotation is not None
+            },
+        )
+
+
+@dataclass(frozen=True)
+class CodeFacts:
+    """
+    What validation needs from a module, collected in one walk of its AST.
+
+    imports holds (module, None) for `import module` and (module, names)
+    for `from module import names`, in source walk order. signature is the
+    first async def, or the first def when there is none.
+    """
+
+    imports: tuple[tuple[str, tuple[str, ...] | None], ...]
+    restricted_calls: tuple[str, ...]
+    signature: FunctionSignature | None
+
+    @classmethod
+    def collect(cls, tree: ast.Module) -> "CodeFacts":
+        imports: list[tuple[str, tuple[str, ...] | None]] = []
+        restricted_calls: list[str] = []
+        first_async: ast.AsyncFunctionDef | None = None
+        first_def: ast.FunctionDef | None = None
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                imports.extend((alias.name, None) for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                if node.module:
+                    names = tuple(alias.name for alias in node.names)
+                    imports.append((node.module, names))
+            elif isinstance(node, ast.Call):
+                if isinstance(node.func, ast.Name) and node.func.id in RESTRICTED_CALLS:
+                    restricted_calls.append(node.func.id)
+            elif isinstance(node, ast.AsyncFunctionDef):
+                if first_async is None:
+                    first_async = node
+            elif isinstance(node, ast.FunctionDef):
+                if first_def is None:
+                    first_def = node
+        func_def = first_async or first_def
+        return cls(
+            imports=tuple(imports),
+            restricted_calls=tuple(restricted_calls),
+            signature=FunctionSignature.of(func_def) if func_def else None,
+        )
+
+
+def _cache_key(*parts: Any) -> str:
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+class ValidationCache:
+    """LRU of validation results keyed by a hash of code and constraints."""
+
+    def __init__(self, max_entries: int = VALIDATION_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[str, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> tuple[str, ...] | None:
+        with self._lock:
+            errors = self._entries.get(key)
+            if errors is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return errors
+
+    def put(self, key: str, errors: tuple[str, ...]) -> None:
+        with self._lock:
+            self._entries[key] = errors
+            if len(self._entries) > self.max_entries:
+                _ = self._entries.popitem(last=False)
+
+
+validation_cache = ValidationCache()
+
+
 class CodeValidationError(Exception):
     """Raised when code validation fails."""
 
@@ -112,9 +246,20 @@ class CodeValidator:
     tier: Tier
     limits: TierLimits
 
-    def __init__(self, tier: Tier = Tier.FREE):
+    def __init__(
+        self,
+        tier: Tier = Tier.FREE,
+        capabilities: "CapabilityRegistry | None" = None,
+    ):
+        """
+        With capabilities, curated imports must also be installed in this
+        runtime (used when generating code, so the LLM retries with a
+        library that will actually import).
+        """
         self.tier = tier
         self.limits = TIER_LIMITS[tier]
+        self.capabilities = capabilities
+        self._installed: list[str] | None = None
 
     def validate(
         self,
@@ -126,6 +271,11 @@ class CodeValidator:
         """
         Validate code against tier restrictions and optional schema constraints.
 
+        Results are cached by a hash of the code, tier, constraints and
+        installed libraries, so revalidating unchanged code (LLM retries
+        that repeat themselves, remounts, restarts of the same tools) skips
+        parsing entirely.
+
         Args:
             code: Python source code to validate.
             expected_params: If provided, the function signature must contain
@@ -135,59 +285,64 @@ class CodeValidator:
         Returns:
             List of validation errors (empty if valid).
         """
+        key = _cache_key(
+            code,
+            self.tier.value,
+            sorted(expected_params) if expected_params is not None else None,
+            expected_name,
+            sorted(expected_types.items()) if expected_types is not None else None,
+            self._installed_key(),
+        )
+        cached = validation_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        errors = self._validate(code, expected_params, expected_name, expected_types)
+        validation_cache.put(key, tuple(errors))
+        return errors
+
+    def _installed_key(self) -> list[str] | None:
+        if self.capabilities is None:
+            return None
+        if self._installed is None:
+            self._installed = sorted(c.name for c in self.capabilities.available())
+        return self._installed
+
+    def _validate(
+        self,
+        code: str,
+        expected_params: set[str] | None,
+        expected_name: str | None,
+        expected_types: dict[str, str] | None,
+    ) -> list[str]:
         errors: list[str] = []
 
         try:
-            tree = ast.parse(code)
+            facts = CodeFacts.collect(ast.parse(code))
         except SyntaxError as e:
             return [f"Syntax error: {e}"]
 
-        if not self.limits.curated_only:
-            # Paid tier: skip import checks but still validate signature
-            if expected_params is not None or expected_name is not None:
-                errors.extend(
-                    self._validate_signature(
-                        tree, expected_params, expected_name, expected_types
-                    )
-                )
-            return errors
-
-        # Check imports
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    error = self._check_import(alias.name)
-                    if error:
-                        errors.append(error)
-
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    error = self._check_import_from(node.module, node.names)
-                    if error:
-                        errors.append(error)
+        if self.limits.curated_only:
+            # Check imports
+            for module, names in facts.imports:
+                if names is None:
+                    error = self._check_import(module)
+                else:
+                    error = self._check_import_from(module, names)
+                if error:
+                    errors.append(error)
 
             # Check for dangerous function calls
-            elif isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name):
-                    if node.func.id in (
-                        "eval",
-                        "exec",
-                        "compile",
-                        "open",
-                        "dir",
-                        "globals",
-                        "locals",
-                        "vars",
-                    ):
-                        errors.append(
-                            f"Function '{node.func.id}' is not allowed (restricted at runtime)"
-                        )
-
-        # Validate function signature against expected schema
+            for func_name in facts.restricted_calls:
+                errors.append(
+                    f"Function '{func_name}' is not allowed (restricted at runtime)"
+                )
+
+        # Validate function signature against expected schema (every tier)
         if expected_params is not None or expected_name is not None:
             errors.extend(
                 self._validate_signature(
-                    tree, expected_params, expected_name, expected_types
+                    facts.signature, expected_params, expected_name, expected_types
                 )
             )
 
@@ -195,7 +350,7 @@ class CodeValidator:
 
     def _validate_signature(
         self,
-        tree: ast.Module,
+        signature: "FunctionSignature | None",
         expected_params: set[str] | None,
         expected_name: str | None,
         expected_types: dict[str, str] | None = None,
@@ -210,44 +365,20 @@ class CodeValidator:
         """
         errors: list[str] = []
 
-        # Find the first async function definition
-        func_def: ast.AsyncFunctionDef | ast.FunctionDef | None = None
-        for node in ast.walk(tree):
-            if isinstance(node, ast.AsyncFunctionDef):
-                func_def = node
-                break
-            if isinstance(node, ast.FunctionDef) and func_def is None:
-                func_def = node
-
-        if func_def is None:
+        if signature is None:
             errors.append("No function definition found in generated code")
             return errors
 
         # Check function name
-        if expected_name is not None and func_def.name != expected_name:
+        if expected_name is not None and signature.name != expected_name:
             errors.append(
                 f"Function name mismatch: expected '{expected_name}', "
-                f"got '{func_def.name}'"
+                f"got '{signature.name}'"
             )
 
-        # Build a map of param name -> AST annotation string
-        ast_annotations: dict[str, str] = {}
-        all_args = func_def.args.args + func_def.args.kwonlyargs
-        for arg in all_args:
-            if arg.arg == "self":
-                continue
-            if arg.annotation is not None:
-                ast_annotations[arg.arg] = ast.unparse(arg.annotation)
-
         # Check parameter names
         if expected_params is not None:
-            actual_params: set[str] = set()
-            for arg in func_def.args.args:
-                if arg.arg != "self":
-                    actual_params.add(arg.arg)
-            for arg in func_def.args.kwonlyargs:
-                actual_params.add(arg.arg)
-
+            actual_params = signature.params
             missing = expected_params - actual_params
             extra = actual_params - expected_params
 
@@ -266,26 +397,8 @@ class CodeValidator:
         # If schema says "string" but code annotates as "dict"/"list"/"Dict"/"List",
         # the runtime Pydantic validation will reject calls with string arguments.
         if expected_types is not None:
-            # Map schema type names to Python annotation patterns that indicate a mismatch
-            _SCHEMA_TO_PYTHON: dict[str, set[str]] = {
-                "string": {
-                    "dict",
-                    "Dict",
-                    "list",
-                    "List",
-                    "set",
-                    "Set",
-                    "tuple",
-                    "Tuple",
-                },
-                "integer": {"dict", "Dict", "str", "string"},
-                "boolean": {"dict", "Dict", "str", "string", "int", "integer"},
-                "number": {"dict", "Dict", "str", "string"},
-                "array": {"dict", "Dict", "str", "string", "int", "integer"},
-            }
-
             for param_name, schema_type in expected_types.items():
-                ast_type = ast_annotations.get(param_name)
+                ast_type = signature.annotations.get(param_name)
                 if ast_type is None:
                     continue  # No annotation — can't check
 
@@ -311,9 +424,16 @@ class CodeValidator:
         if base_module not in CURATED_LIBRARIES:
             return f"Module '{module_name}' is not in curated libraries. Allowed: {', '.join(sorted(CURATED_LIBRARIES.keys()))}"
 
-        return None
+        return self._check_installed(module_name)
+
+    def _check_installed(self, module_name: str) -> str | None:
+        """Check that a curated module is installed, when capabilities are known."""
+        if self.capabilities is None or self.capabilities.is_installed(module_name):
+            return None
+        installed = sorted({c.base_module for c in self.capabilities.available()})
+        return f"Module '{module_name}' is not installed in the runtime. Installed: {', '.join(installed)}"
 
-    def _check_import_from(self, module: str, names: list[ast.alias]) -> str | None:
+    def _check_import_from(self, module: str, names: tuple[str, ...]) -> str | None:
         """Check if a from-import is allowed."""
         base_module = module.split(".")[0]
 
@@ -323,13 +443,17 @@ class CodeValidator:
         if base_module not in CURATED_LIBRARIES:
             return f"Module '{module}' is not in curated libraries"
 
+        error = self._check_installed(module)
+        if error:
+            return error
+
         allowed_names = CURATED_LIBRARIES.get(base_module)
         if allowed_names is None:
             return None  # All exports allowed
 
-        for alias in names:
-            if alias.name != "*" and alias.name not in allowed_names:
-                return f"'{alias.name}' from '{module}' is not allowed. Allowed: {', '.join(allowed_names)}"
+        for name in names:
+            if name != "*" and name not in allowed_names:
+                return f"'{name}' from '{module}' is not allowed. Allowed: {', '.join(allowed_names)}"
 
         return None
 
@@ -0,0 +1,305 @@
+"""In-process cache of validated OAuth access tokens and revoked jtis."""
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from loguru import logger
+
+from infrastructure.repositories.oauth import RevokedAccessToken
+
+
+@dataclass(frozen=True)
+class TokenRevocation:
+    """
+    A revocation event published on the LocalRevocationChannel.
+
+    Either a single token (jti) or every token of a user is invalidated,
+    on one audience (server) or, with audience None, on all of them.
+    """
+
+    jti: str | None = None
+    user_id: str | None = None
+    audience: str | None = None
+
+
+class LocalRevocationChannel:
+    """
+    Delivers revocations made by this worker to its own subscribers.
+
+    Subscribers are called synchronously on publish. Other workers learn
+    about the revocation from the DB when their RevocationIndex refreshes,
+    which drops the jti from their caches within one refresh interval.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: list[Callable[[TokenRevocation], None]] = []
+
+    def subscribe(self, callback: Callable[[TokenRevocation], None]) -> None:
+        self._subscribers.append(callback)
+
+    async def publish(self, event: TokenRevocation) -> None:
+        for callback in self._subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Revocation subscriber failed for {event}: {e}")
+
+
+@dataclass
+class TokenCacheStats:
+    """Counters for AccessTokenCache."""
+
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    entries: int = 0
+
+
+@dataclass
+class _CachedToken:
+    claims: dict[str, Any]
+    expires_at: float
+
+
+class AccessTokenCache:
+    """
+    Bounded TTL/LRU cache of validated access tokens → claims.
+
+    Entries are keyed by (sha256(token), audience) so a hit requires the
+    exact token bytes that were verified; a forged token that merely reuses
+    a cached jti never matches. Each entry expires at the token's ``exp``
+    (capped at ``max_ttl`` seconds after caching), and revocations remove
+    entries by jti or by (user, audience).
+
+    Callers pass the ``generation`` read before validating to put(); if a
+    revocation landed in between, the result is not cached.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_ttl: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max(1, max_entries)
+        self.max_ttl = max_ttl
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], _CachedToken] = OrderedDict()
+        self._stats = TokenCacheStats()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Incremented by every invalidation."""
+        return self._generation
+
+    @property
+    def stats(self) -> TokenCacheStats:
+        with self._lock:
+            return TokenCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                invalidations=self._stats.invalidations,
+                entries=len(self._entries),
+            )
+
+    @staticmethod
+    def _key(token: str, audience: str) -> tuple[str, str]:
+        return hashlib.sha256(token.encode()).hexdigest(), audience
+
+    def get(self, token: str, audience: str) -> dict[str, Any] | None:
+        """Return cached claims for a token, or None if absent or expired."""
+        key = self._key(token, audience)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            if entry.expires_at <= self._clock():
+                del self._entries[key]
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return dict(entry.claims)
+
+    def put(
+        self,
+        token: str,
+        audience: str,
+        claims: dict[str, Any],
+        generation: int | None = None,
+    ) -> None:
+        """Cache claims of a token that was just verified."""
+        now = self._clock()
+        expires_at = min(float(claims.get("exp", 0)), now + self.max_ttl)
+        if expires_at <= now:
+            return
+        key = self._key(token, audience)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = _CachedToken(
+                claims=dict(claims), expires_at=expires_at
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                _ = self._entries.popitem(last=False)
+
+    def invalidate(self, event: TokenRevocation) -> int:
+        """Drop entries matching a revocation. Returns the number removed."""
+        with self._lock:
+            stale = [
+                key
+                for key, entry in self._entries.items()
+                if (event.jti is not None and entry.claims.get("jti") == event.jti)
+                or (
+                    event.user_id is not None
+                    and entry.claims.get("sub") == event.user_id
+                    and (
+                        event.audience is None
+                        or entry.claims.get("aud") == event.audience
+                    )
+                )
+            ]
+            for key in stale:
+                del self._entries[key]
+            self._generation += 1
+            self._stats.invalidations += len(stale)
+        return len(stale)
+
+    def invalidate_jtis(self, jtis: set[str]) -> int:
+        """Drop entries of any of the given jtis in one pass."""
+        with self._lock:
+            stale = [
+                key
+                for key, entry in self._entries.items()
+                if entry.claims.get("jti") in jtis
+            ]
+            for key in stale:
+                del self._entries[key]
+            self._generation += 1
+            self._stats.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _epoch(value: datetime) -> float:
+    # Token timestamps are stored as naive UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
+
+
+class RevocationIndex:
+    """
+    In-memory set of revoked, unexpired access token jtis.
+
+    Loaded in full once, then incrementally by the rows' ``updated_at``
+    every ``refresh_interval`` seconds, so a revocation made on another
+    worker takes effect here within one interval. A jti missing from the
+    index is treated as not revoked. jtis first seen by a refresh are
+    passed to ``on_revoked`` so validations cached before the revocation
+    are dropped too. Until the first load succeeds, or
+    once refreshes have failed for longer than ``max_staleness``,
+    might_be_revoked() answers True for every jti and callers fall back to
+    the per-token DB check.
+    """
+
+    # updated_at is now() at transaction start, so a revocation committed
+    # late can land just behind the watermark; each refresh re-reads this
+    # overlap.
+    WATERMARK_OVERLAP = timedelta(seconds=5)
+
+    def __init__(
+        self,
+        loader: Callable[[datetime | None], Awaitable[Sequence[RevokedAccessToken]]],
+        refresh_interval: float = 10.0,
+        max_staleness: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        on_revoked: Callable[[set[str]], object] | None = None,
+    ) -> None:
+        self.refresh_interval = refresh_interval
+        self.max_staleness = (
+            max_staleness if max_staleness is not None else 3 * refresh_interval
+        )
+        self._loader = loader
+        self._clock = clock
+        self._on_revoked = on_revoked
+        self._revoked: dict[str, float] = {}  # jti -> expires_at (epoch seconds)
+        self._watermark: datetime | None = None
+        self._refreshed_at: float | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    @property
+    def is_fresh(self) -> bool:
+        return (
+            self._refreshed_at is not None
+            and self._clock() - self._refreshed_at <= self.max_staleness
+        )
+
+    def might_be_revoked(self, jti: str) -> bool:
+        """False only if the jti is known not to be revoked as of the last refresh."""
+        return not self.is_fresh or jti in self._revoked
+
+    def add(self, jti: str, expires_at: float) -> None:
+        """Record a revocation made by this worker without waiting for a refresh."""
+        self._revoked[jti] = expires_at
+
+    async def refresh(self) -> int:
+        """Load revocations since the watermark. Returns the number of rows read."""
+        since = (
+            self._watermark - self.WATERMARK_OVERLAP
+            if self._watermark is not None
+            else None
+        )
+        rows = await self._loader(since)
+        new_jtis = {row.jti for row in rows if row.jti not in self._revoked}
+        for row in rows:
+            self._revoked[row.jti] = _epoch(row.expires_at)
+            if row.updated_at is not None and (
+                self._watermark is None or row.updated_at > self._watermark
+            ):
+                self._watermark = row.updated_at
+        now = time.time()
+        self._revoked = {
+            jti: expires_at
+            for jti, expires_at in self._revoked.items()
+            if expires_at > now
+        }
+        self._refreshed_at = self._clock()
+        if new_jtis and self._on_revoked is not None:
+            _ = self._on_revoked(new_jtis)
+        return len(rows)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_periodically())
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            _ = self._task.cancel()
+            _ = await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            try:
+                _ = await self.refresh()
+            except Exception as e:
+                logger.error(f"Failed to refresh token revocation index: {e}")
+            await asyncio.sleep(self.refresh_interval)
@@ -0,0 +1,428 @@
+"""
+Runtime-managed database connection pools for tool code.
+
+Every server namespace gets ``get_db_pool(env_var="DATABASE_URL")``, which
+reads a DSN through the server's env layers and returns a pool shared by
+all of that server's tools, keyed by (server_id, DSN). Tool calls then
+reuse connections instead of paying connect + auth on every invocation
+and opening a burst of connections on the customer's database.
+
+The driver follows the DSN scheme: postgres/postgresql -> asyncpg,
+mysql -> aiomysql, and an explicit ``+driver`` suffix or ``driver=`` wins
+(psycopg pools need the optional psycopg_pool package). Each server may
+hold MCP_TOOL_DB_MAX_POOLS pools of up to MCP_TOOL_DB_POOL_MAX_SIZE
+connections; opening one more closes the server's least recently used
+pool. Pools unused for MCP_TOOL_DB_POOL_IDLE_SECONDS are closed by a
+background reaper, pools of a server whose env vars changed are retired,
+and the runtime closes the rest when the server's last sub-app lifespan
+ends. With the process execution backend each worker keeps its own pools,
+which only the idle reaper closes.
+
+``get_db_pool`` returns a ToolDBPool that forwards to the driver's pool.
+Each tool call that uses it holds a lease on the pool until the call ends
+(at most MCP_TOOL_TIMEOUT_SECONDS), and a leased pool is never evicted,
+reaped or closed, so one caller's DSN cannot close the pool under another
+caller's queries. A ToolDBPool kept in set_state is leased by every later
+call that uses it; if its pool was closed in between, it switches to the
+server's live pool for the same DSN when there is one.
+"""
+
+import asyncio
+import functools
+import importlib
+import inspect
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import unquote, urlsplit
+from uuid import UUID
+
+from loguru import logger
+
+from settings import settings
+
+# DSN schemes that imply a driver when the DSN names none
+_SCHEME_DRIVERS = {
+    "postgres": "asyncpg",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+}
+
+
+class ToolDBPoolError(Exception):
+    """A pool could not be resolved or opened for tool code."""
+
+
+@dataclass(frozen=True)
+class PoolDriver:
+    """How to open and close the pools of one driver."""
+
+    open: Callable[[str, int, float], Awaitable[Any]]
+    close: Callable[[Any, float], Awaitable[None]]
+
+
+async def _open_asyncpg(dsn: str, max_size: int, idle_seconds: float) -> Any:
+    asyncpg = importlib.import_module("asyncpg")
+    return await asyncpg.create_pool(
+        dsn.replace("+asyncpg", "", 1),
+        min_size=0,
+        max_size=max_size,
+        max_inactive_connection_lifetime=idle_seconds,
+    )
+
+
+async def _close_asyncpg(pool: Any, timeout: float) -> None:
+    try:
+        await asyncio.wait_for(pool.close(), timeout)
+    except TimeoutError:
+        pool.terminate()
+
+
+async def _open_aiomysql(dsn: str, max_size: int, idle_seconds: float) -> Any:
+    aiomysql = importlib.import_module("aiomysql")
+    url = urlsplit(dsn)
+    return await aiomysql.create_pool(
+        host=url.hostname or "localhost",
+        port=url.port or 3306,
+        user=unquote(url.username) if url.username else None,
+        password=unquote(url.password) if url.password else "",
+        db=url.path.lstrip("/") or None,
+        minsize=0,
+        maxsize=max_size,
+        pool_recycle=int(idle_seconds),
+    )
+
+
+async def _close_aiomysql(pool: Any, timeout: float) -> None:
+    pool.close()
+    try:
+        await asyncio.wait_for(pool.wait_closed(), timeout)
+    except TimeoutError:
+        pool.terminate()
+
+
+async def _open_psycopg(dsn: str, max_size: int, idle_seconds: float) -> Any:
+    try:
+        psycopg_pool = importlib.import_module("psycopg_pool")
+    except ImportError as e:
+        raise ToolDBPoolError("psycopg pools need the psycopg_pool package") from e
+    pool = psycopg_pool.AsyncConnectionPool(
+        dsn.replace("+psycopg", "", 1),
+        min_size=0,
+        max_size=max_size,
+        max_idle=idle_seconds,
+        open=False,
+    )
+    await pool.open()
+    return pool
+
+
+async def _close_psycopg(pool: Any, timeout: float) -> None:
+    await pool.close(timeout=timeout)
+
+
+DRIVERS: dict[str, PoolDriver] = {
+    "asyncpg": PoolDriver(_open_asyncpg, _close_asyncpg),
+    "aiomysql": PoolDriver(_open_aiomysql, _close_aiomysql),
+    "psycopg": PoolDriver(_open_psycopg, _close_psycopg),
+}
+
+
+def resolve_driver(dsn: str, driver: str | None = None) -> str:
+    """Driver name for a DSN: explicit argument, then +suffix, then scheme."""
+    scheme = urlsplit(dsn).scheme.lower()
+    base, _, suffix = scheme.partition("+")
+    name = driver or suffix or _SCHEME_DRIVERS.get(base, base)
+    if name not in DRIVERS:
+        raise ToolDBPoolError(
+            f"No pooled driver for {scheme or 'DSN'!r}; "
+            + f"supported: {', '.join(sorted(DRIVERS))}"
+        )
+    return name
+
+
+def _is_closed(pool: Any) -> bool:
+    """Whether tool code closed the pool behind the registry's back."""
+    is_closing = getattr(pool, "is_closing", None)
+    if callable(is_closing):
+        return bool(is_closing())
+    return bool(getattr(pool, "closed", False) or getattr(pool, "_closed", False))
+
+
+@dataclass(eq=False)
+class _PoolEntry:
+    server_id: UUID
+    dsn: str
+    driver: str
+    pool: Any
+    last_used: float = field(default_factory=time.monotonic)
+    leases: int = 0
+    # Leases are released when their call ends; this bounds a leaked one
+    leased_until: float = 0.0
+    closed: bool = False
+    handle: "ToolDBPool | None" = None
+
+    def in_use(self, now: float) -> bool:
+        return self.leases > 0 and now < self.leased_until
+
+
+# Entries leased by the running tool call (None outside a leased call)
+_call_leases: ContextVar[set[_PoolEntry] | None] = ContextVar(
+    "tool_db_call_leases", default=None
+)
+
+
+class ToolDBPool:
+    """The pool handed to tool code; attribute access leases it to the call."""
+
+    def __init__(self, registry: "ToolDBPoolRegistry", entry: _PoolEntry) -> None:
+        self._registry = registry
+        self._entry = entry
+
+    def __getattr__(self, name: str) -> Any:
+        self._entry = self._registry.lease(self._entry)
+        return getattr(self._entry.pool, name)
+
+
+class ToolDBPoolRegistry:
+    """Pools opened for tool code, keyed by (server_id, DSN)."""
+
+    def __init__(
+        self,
+        max_pools: int | None = None,
+        max_size: int | None = None,
+        idle_seconds: float | None = None,
+    ) -> None:
+        self.max_pools = max_pools or settings.MCP_TOOL_DB_MAX_POOLS
+        self.max_size = max_size or settings.MCP_TOOL_DB_POOL_MAX_SIZE
+        self.idle_seconds = idle_seconds or settings.MCP_TOOL_DB_POOL_IDLE_SECONDS
+        self._pools: dict[tuple[UUID, str], _PoolEntry] = {}
+        self._opening: dict[tuple[UUID, str], asyncio.Task[_PoolEntry]] = {}
+        # Taken out of service but not closed yet (closed by the reaper);
+        # retire_server may run in a compile worker thread without a loop
+        self._retired: list[_PoolEntry] = []
+        self._closing: set[asyncio.Task[None]] = set()
+        self._reaper: asyncio.Task[None] | None = None
+        self._lock = threading.Lock()
+
+    def pool_count(self, server_id: UUID | None = None) -> int:
+        return sum(
+            server_id is None or key[0] == server_id for key in list(self._pools)
+        )
+
+    def leased(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Return an async function with func's signature that releases its
+        pool leases when the call ends."""
+
+        @functools.wraps(func)
+        async def leasing(*args: Any, **kwargs: Any) -> Any:
+            leases: set[_PoolEntry] = set()
+            token = _call_leases.set(leases)
+            try:
+                result = func(*args, **kwargs)
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+            finally:
+                _call_leases.reset(token)
+                self._release(leases)
+
+        return leasing
+
+    def lease(self, entry: _PoolEntry) -> _PoolEntry:
+        """Lease entry (or its live replacement) to the running tool call."""
+        if entry.closed:
+            entry = self._pools.get((entry.server_id, entry.dsn), entry)
+        now = time.monotonic()
+        entry.last_used = now
+        leases = _call_leases.get()
+        if leases is not None and entry not in leases:
+            with self._lock:
+                entry.leases += 1
+                entry.leased_until = max(
+                    entry.leased_until, now + settings.MCP_TOOL_TIMEOUT_SECONDS
+                )
+            leases.add(entry)
+        return entry
+
+    def _release(self, leases: set[_PoolEntry]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for entry in leases:
+                entry.leases -= 1
+                entry.last_used = now
+
+    async def acquire(
+        self, server_id: UUID, dsn: str, driver: str | None = None
+    ) -> ToolDBPool:
+        """Return the server's pool for dsn, opening it on first use."""
+        driver_name = resolve_driver(dsn, driver)
+        key = (server_id, dsn)
+        self._ensure_reaper()
+
+        entry = self._pools.get(key)
+        if entry is not None and _is_closed(entry.pool):
+            with self._lock:
+                if self._pools.get(key) is entry:
+                    del self._pools[key]
+            entry = None
+
+        if entry is None:
+            task = self._opening.get(key)
+            if task is None:
+                self._make_room(server_id)
+                task = asyncio.create_task(self._open(key, driver_name))
+                self._opening[key] = task
+            # A cancelled tool call must not cancel the open other calls await
+            entry = await asyncio.shield(task)
+
+        entry = self.lease(entry)
+        if entry.handle is None:
+            entry.handle = ToolDBPool(self, entry)
+        return entry.handle
+
+    async def _open(self, key: tuple[UUID, str], driver_name: str) -> _PoolEntry:
+        server_id, dsn = key
+        try:
+            pool = await DRIVERS[driver_name].open(
+                dsn, self.max_size, self.idle_seconds
+            )
+        except ToolDBPoolError:
+            _ = self._opening.pop(key, None)
+            raise
+        except Exception as e:
+            _ = self._opening.pop(key, None)
+            logger.warning(f"Failed to open {driver_name} pool for {server_id}: {e}")
+            raise ToolDBPoolError(f"Could not open {driver_name} pool: {e}") from e
+
+        entry = _PoolEntry(server_id=server_id, dsn=dsn, driver=driver_name, pool=pool)
+        with self._lock:
+            self._pools[key] = entry
+        _ = self._opening.pop(key, None)
+        logger.info(f"Opened {driver_name} pool for server {server_id}")
+        return entry
+
+    def _make_room(self, server_id: UUID) -> None:
+        """Close the server's least recently used idle pools beyond max_pools - 1."""
+        now = time.monotonic()
+        with self._lock:
+            owned = [k for k in self._pools if k[0] == server_id]
+            excess = len(owned) - self.max_pools + 1
+            unleased = sorted(
+                (k for k in owned if not self._pools[k].in_use(now)),
+                key=lambda k: self._pools[k].last_used,
+            )
+            if excess > len(unleased):
+                raise ToolDBPoolError(
+                    f"All {self.max_pools} DB pools of this server are in use; "
+                    + "retry shortly"
+                )
+            evicted = [self._pools.pop(k) for k in unleased[: max(0, excess)]]
+        for entry in evicted:
+            logger.info(
+                f"Server {server_id} is over {self.max_pools} DB pools - "
+                + f"closing its least recently used {entry.driver} pool"
+            )
+            self._close_soon(entry)
+
+    def retire_server(self, server_id: UUID) -> None:
+        """Stop handing out a server's pools; the reaper closes them once
+        their leases end."""
+        with self._lock:
+            keys = [k for k in self._pools if k[0] == server_id]
+            self._retired.extend(self._pools.pop(k) for k in keys)
+
+    async def close_server(self, server_id: UUID) -> None:
+        """Close every pool of a server (unmounted, evicted or shut down).
+
+        Pools still leased by a call are left to the reaper.
+        """
+        self.retire_server(server_id)
+        now = time.monotonic()
+        with self._lock:
+            entries = [
+                e
+                for e in self._retired
+                if e.server_id == server_id and not e.in_use(now)
+            ]
+            self._retired = [e for e in self._retired if e not in entries]
+        _ = await asyncio.gather(*(self._close(e) for e in entries))
+
+    async def reap_idle(self) -> int:
+        """Close unleased retired pools and pools unused for idle_seconds."""
+        now = time.monotonic()
+        cutoff = now - self.idle_seconds
+        with self._lock:
+            idle = [
+                k
+                for k, e in self._pools.items()
+                if e.last_used < cutoff and not e.in_use(now)
+            ]
+            entries = [
+                *(e for e in self._retired if not e.in_use(now)),
+                *(self._pools.pop(k) for k in idle),
+            ]
+            self._retired = [e for e in self._retired if e.in_use(now)]
+        _ = await asyncio.gather(*(self._close(e) for e in entries))
+        return len(entries)
+
+    async def close_all(self) -> None:
+        if self._reaper is not None:
+            _ = self._reaper.cancel()
+            self._reaper = None
+        with self._lock:
+            entries = [*self._retired, *self._pools.values()]
+            self._retired = []
+            self._pools.clear()
+        _ = await asyncio.gather(
+            *(self._close(e) for e in entries), *self._closing, return_exceptions=True
+        )
+
+    def _ensure_reaper(self) -> None:
+        loop = asyncio.get_running_loop()
+        if (
+            self._reaper is None
+            or self._reaper.done()
+            or self._reaper.get_loop() is not loop
+        ):
+            self._reaper = loop.create_task(self._reap_forever())
+
+    async def _reap_forever(self) -> None:
+        interval = max(1.0, self.idle_seconds / 4)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                _ = await self.reap_idle()
+            except Exception as e:
+                logger.error(f"Tool DB pool reaper failed: {e}")
+
+    def _close_soon(self, entry: _PoolEntry) -> None:
+        task = asyncio.get_running_loop().create_task(self._close(entry))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close(self, entry: _PoolEntry) -> None:
+        entry.closed = True
+        try:
+            await DRIVERS[entry.driver].close(
+                entry.pool, settings.MCP_TOOL_DB_CLOSE_TIMEOUT_SECONDS
+            )
+        except Exception as e:
+            logger.warning(
+                f"Failed to close {entry.driver} pool for {entry.server_id}: {e}"
+            )
+        else:
+            logger.info(f"Closed {entry.driver} pool for server {entry.server_id}")
+
+
+_tool_db_pools: ToolDBPoolRegistry | None = None
+
+
+def get_tool_db_pools() -> ToolDBPoolRegistry:
+    global _tool_db_pools
+    if _tool_db_pools is None:
+        _tool_db_pools = ToolDBPoolRegistry()
+    return _tool_db_pools
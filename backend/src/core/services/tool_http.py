@@ -0,0 +1,104 @@
+"""
+Connection-pooled HTTP client shared by the tools of one server.
+
+Every server namespace gets an ``http_client`` so tool calls reuse TCP/TLS
+connections instead of opening a new httpx.AsyncClient per call. Tool code
+cannot close it (``async with http_client`` and ``aclose()`` are no-ops);
+the runtime closes its connections when the server's last sub-app
+lifespan ends. HTTP/2 is negotiated when the optional ``h2`` package is
+installed (httpx[http2]).
+
+The client is shared by every end user's calls, so it keeps no state
+between them: cookies from responses are never stored, and ``headers``
+and ``cookies`` are read-only copies. Tool code passes per-user headers
+and cookies on each request instead.
+"""
+
+import importlib.util
+import ssl
+from http.cookiejar import Cookie, CookieJar, DefaultCookiePolicy
+from types import TracebackType
+from typing import Any, Self
+from urllib.request import Request
+
+import httpx
+
+from settings import settings
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Building an SSL context loads the CA bundle; do it once for every client
+_ssl_context: ssl.SSLContext | None = None
+
+
+def _shared_ssl_context() -> ssl.SSLContext:
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context()
+    return _ssl_context
+
+
+class _RejectAllCookies(DefaultCookiePolicy):
+    """Cookie policy that never stores a cookie from a response."""
+
+    def set_ok(self, cookie: Cookie, request: Request) -> bool:
+        return False
+
+
+class ServerHTTPClient(httpx.AsyncClient):
+    """httpx.AsyncClient whose lifetime belongs to the runtime, not the tool."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        kwargs["cookies"] = CookieJar(policy=_RejectAllCookies())
+        kwargs.setdefault("http2", HTTP2_AVAILABLE)
+        kwargs.setdefault("verify", _shared_ssl_context())
+        kwargs.setdefault("timeout", settings.MCP_TOOL_HTTP_TIMEOUT_SECONDS)
+        kwargs.setdefault(
+            "limits",
+            httpx.Limits(
+                max_connections=settings.MCP_TOOL_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.MCP_TOOL_HTTP_MAX_KEEPALIVE,
+            ),
+        )
+        super().__init__(**kwargs)
+
+    @property
+    def headers(self) -> httpx.Headers:
+        """A copy of the default headers; changing it has no effect."""
+        return httpx.Headers(self._headers)
+
+    @headers.setter
+    def headers(self, headers: httpx.Headers) -> None:
+        if hasattr(self, "_headers"):
+            raise AttributeError(
+                "http_client.headers is read-only; pass headers= per request"
+            )
+        httpx.AsyncClient.headers.fset(self, headers)
+
+    @property
+    def cookies(self) -> httpx.Cookies:
+        """Always empty; pass cookies= per request."""
+        return httpx.Cookies()
+
+    @cookies.setter
+    def cookies(self, cookies: httpx.Cookies) -> None:
+        raise AttributeError(
+            "http_client.cookies is read-only; pass cookies= per request"
+        )
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None = None,
+        exc_value: BaseException | None = None,
+        traceback: TracebackType | None = None,
+    ) -> None:
+        """No-op: the client outlives the tool's async with block."""
+
+    async def aclose(self) -> None:
+        """No-op for tool code; the runtime calls close_pool()."""
+
+    async def close_pool(self) -> None:
+        await super().aclose()
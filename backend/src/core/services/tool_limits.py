@@ -0,0 +1,163 @@
+"""Execution bounds for compiled tools in the shared runtime."""
+
+import asyncio
+import functools
+import inspect
+from collections.abc import Callable
+from typing import Any, NoReturn
+from uuid import UUID
+
+from fastmcp.exceptions import ToolError
+from loguru import logger
+
+from core.services.metrics import mcp_tool_rejections_total
+from settings import settings
+
+
+class ToolExecutionLimiter:
+    """
+    Per-call timeout, per-server concurrency and per-customer in-flight cap.
+
+    compile_tool wraps every compiled function with wrap(). A call first
+    takes one of the customer's in-flight slots (rejected at once if none
+    are left), then waits up to ``queue_timeout`` for one of the server's
+    ``server_concurrency`` slots, then runs under ``timeout``. Rejections
+    raise ToolError, which FastMCP returns to the client as an MCP error
+    result, and are counted in mcp_tool_rejections_total.
+
+    Synchronous tool functions run inline on the event loop as before; the
+    timeout can only interrupt coroutines at an await.
+    """
+
+    def __init__(
+        self,
+        timeout: float | None = None,
+        server_concurrency: int | None = None,
+        queue_timeout: float | None = None,
+        customer_in_flight: int | None = None,
+    ) -> None:
+        self.timeout = (
+            timeout if timeout is not None else settings.MCP_TOOL_TIMEOUT_SECONDS
+        )
+        self.server_concurrency = max(
+            1,
+            server_concurrency
+            if server_concurrency is not None
+            else settings.MCP_SERVER_MAX_CONCURRENT_CALLS,
+        )
+        self.queue_timeout = (
+            queue_timeout
+            if queue_timeout is not None
+            else settings.MCP_SERVER_QUEUE_TIMEOUT_SECONDS
+        )
+        self.customer_in_flight = max(
+            1,
+            customer_in_flight
+            if customer_in_flight is not None
+            else settings.MCP_CUSTOMER_MAX_IN_FLIGHT_CALLS,
+        )
+        self._server_slots: dict[UUID, asyncio.Semaphore] = {}
+        self._customer_calls: dict[UUID, int] = {}
+
+    def in_flight(self, customer_id: UUID) -> int:
+        return self._customer_calls.get(customer_id, 0)
+
+    def forget_server(self, server_id: UUID) -> None:
+        """Drop a server's semaphore (calls holding it finish normally)."""
+        _ = self._server_slots.pop(server_id, None)
+
+    def wrap(
+        self,
+        func: Callable[..., Any],
+        tool: str,
+        server_id: UUID,
+        customer_id: UUID,
+    ) -> Callable[..., Any]:
+        """Return an async function with func's signature, run under the limits."""
+
+        @functools.wraps(func)
+        async def limited(*args: Any, **kwargs: Any) -> Any:
+            return await self.run(
+                func,
+                args,
+                kwargs,
+                tool=tool,
+                server_id=server_id,
+                customer_id=customer_id,
+            )
+
+        return limited
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        tool: str,
+        server_id: UUID,
+        customer_id: UUID,
+    ) -> Any:
+        if self.in_flight(customer_id) >= self.customer_in_flight:
+            self._reject(
+                "customer_limit",
+                tool,
+                server_id,
+                f"Too many concurrent tool calls (limit {self.customer_in_flight}); "
+                + "retry shortly",
+            )
+
+        self._customer_calls[customer_id] = self.in_flight(customer_id) + 1
+        try:
+            slots = self._server_slots.get(server_id)
+            if slots is None:
+                slots = asyncio.Semaphore(self.server_concurrency)
+                self._server_slots[server_id] = slots
+            try:
+                _ = await asyncio.wait_for(slots.acquire(), self.queue_timeout)
+            except TimeoutError:
+                self._reject(
+                    "server_busy",
+                    tool,
+                    server_id,
+                    "Server is busy; retry shortly",
+                )
+            deadline = asyncio.timeout(self.timeout)
+            try:
+                async with deadline:
+                    result = func(*args, **kwargs)
+                    if inspect.isawaitable(result):
+                        result = await result
+                    return result
+            except TimeoutError:
+                if not deadline.expired():
+                    raise
+                self._reject(
+                    "timeout",
+                    tool,
+                    server_id,
+                    f"Tool '{tool}' timed out after {self.timeout:g}s",
+                )
+            finally:
+                slots.release()
+        finally:
+            remaining = self._customer_calls.get(customer_id, 1) - 1
+            if remaining > 0:
+                self._customer_calls[customer_id] = remaining
+            else:
+                _ = self._customer_calls.pop(customer_id, None)
+
+    @staticmethod
+    def _reject(reason: str, tool: str, server_id: UUID, message: str) -> NoReturn:
+        mcp_tool_rejections_total.inc(str(server_id), tool, reason)
+        logger.warning(f"Rejected tool call {tool} on {server_id}: {reason}")
+        raise ToolError(message)
+
+
+_tool_limiter: ToolExecutionLimiter | None = None
+
+
+def get_tool_limiter() -> ToolExecutionLimiter:
+    global _tool_limiter
+    if _tool_limiter is None:
+        _tool_limiter = ToolExecutionLimiter()
+    return _tool_limiter
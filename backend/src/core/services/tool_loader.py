@@ -1,17 +1,34 @@
 ## Dynamic tool loader for shared MCP runtime.
 from __future__ import annotations
 
-import importlib
+import builtins
+import hashlib
+import json
 import os
-from types import ModuleType
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import CodeType, MappingProxyType, ModuleType
 from typing import TYPE_CHECKING, Any, Callable
 from uuid import UUID
 
 from fastmcp.tools.tool import FunctionTool
 from loguru import logger
 
+from core.services.capabilities import get_capability_registry
+from core.services.metrics import (
+    mcp_compile_duration_seconds,
+    mcp_server_last_compile_seconds,
+)
 from core.services.request_context import DynamicEnvDict
 from core.services.tier_service import CURATED_LIBRARIES, CodeValidator, Tier
+from core.services.tool_db import ToolDBPoolError, get_tool_db_pools
+from core.services.tool_http import ServerHTTPClient
+from core.services.tool_limits import get_tool_limiter
+from core.services.tool_process_pool import get_process_tool_executor
+from settings import settings
 
 if TYPE_CHECKING:
     from infrastructure.models.mcp_server import MCPServer, MCPTool
@@ -28,6 +45,54 @@ class ToolCompilationError(Exception):
     pass
 
 
+# Builtins removed from the tool execution environment
+BAD_BUILTINS = frozenset(
+    {
+        "eval",
+        "exec",
+        "compile",
+        "open",
+        "input",
+        "__import__",
+        "globals",
+        "locals",
+        "vars",
+        "dir",
+        "help",
+        "breakpoint",
+        "exit",
+        "quit",
+        "license",
+        "copyright",
+        "credits",
+        "delattr",
+    }
+)
+
+# CPython internal modules that standard library functions need at runtime.
+# e.g. datetime.strptime() imports _strptime; codecs/encodings handle text I/O.
+CPYTHON_INTERNALS = frozenset(
+    {
+        "_strptime",
+        "_codecs",
+        "encodings",
+        "encodings.utf_8",
+        "encodings.ascii",
+        "io",
+        "abc",
+        "contextvars",
+    }
+)
+
+
+def _host_env_allowlist() -> list[str]:
+    return [
+        name.strip()
+        for name in settings.MCP_TOOL_HOST_ENV_ALLOWLIST.split(",")
+        if name.strip()
+    ]
+
+
 def make_mock_os(static_env_override: dict[str, str]) -> ModuleType:
     """
     Create a mock os module with environment variable overrides.
@@ -35,7 +100,8 @@ def make_mock_os(static_env_override: dict[str, str]) -> ModuleType:
     The returned module's environ attribute is a DynamicEnvDict that checks:
     1. Per-request context (from headers via middleware)
     2. Static env vars (from DB, passed here)
-    3. Real os.environ (fallback)
+    3. Host env vars listed in MCP_TOOL_HOST_ENV_ALLOWLIST (nothing else
+       from the real os.environ is visible)
 
     Also overrides os.getenv() and os.getenvb() to use the same lookup.
 
@@ -47,18 +113,22 @@ def make_mock_os(static_env_override: dict[str, str]) -> ModuleType:
     """
     mock_os = ModuleType("os")
 
-    for attr in dir(os):
-        setattr(mock_os, attr, getattr(os, attr))
+    # Everything except the env accessors resolves to the real os on access
+    # (module __getattr__, PEP 562) instead of being copied per server
+    mock_os.__getattr__ = lambda attr: getattr(os, attr)
+    mock_os._static_env = dict(static_env_override)
 
-    # Use DynamicEnvDict for layered env var lookup
-    mock_environ = DynamicEnvDict({**os.environ, **static_env_override})
-    setattr(mock_os, "environ", mock_environ)
+    # Use DynamicEnvDict for layered env var lookup; host env only if allowlisted
+    mock_environ = DynamicEnvDict(
+        static_env_override, host_allowlist=_host_env_allowlist()
+    )
+    mock_os.environ = mock_environ
 
     # Override getenv to use our mock environ
     def mock_getenv(key: str, default: str | None = None) -> str | None:
         return mock_environ.get(key, default)
 
-    setattr(mock_os, "getenv", mock_getenv)
+    mock_os.getenv = mock_getenv
 
     # Override getenvb (bytes version) - falls back to real if key not in mock
     def mock_getenvb(key: bytes, default: bytes | None = None) -> bytes | None:
@@ -68,16 +138,11 @@ def make_mock_os(static_env_override: dict[str, str]) -> ModuleType:
             return result.encode("utf-8")
         return default
 
-    setattr(mock_os, "getenvb", mock_getenvb)
+    mock_os.getenvb = mock_getenvb
 
     return mock_os
 
 
-def _import_module(path: str):
-    """Import a module from a dotted path."""
-    return importlib.import_module(path)
-
-
 def _parameters_to_json_schema(parameters: list[dict[str, Any]]) -> dict[str, Any]:
     """
     Convert aima-mcp parameters_schema (list of param dicts) to MCP JSON Schema.
@@ -130,12 +195,134 @@ def _normalize_parameters(
     return v
 
 
+def _hash_code(code: str) -> str:
+    """Content hash of tool source, used to share code objects across servers."""
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+def _tool_fingerprint(
+    name: str,
+    code: str,
+    parameters: list[dict[str, Any]] | dict[str, Any],
+    tier: Tier,
+    env_vars: dict[str, str],
+) -> str:
+    """
+    Hash everything that affects the compiled function of a tool.
+
+    The description is deliberately left out: it only lives on the FunctionTool
+    wrapper, so a description-only edit can reuse the compiled function.
+    """
+    payload = json.dumps(
+        {
+            "name": name,
+            "code": _hash_code(code),
+            "parameters": parameters,
+            "tier": tier.value,
+            "env_vars": sorted(env_vars.items()),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Upper bound on distinct tool sources kept as compiled code objects.
+CODE_CACHE_MAX_ENTRIES = 4096
+
+
+@dataclass
+class CompileCacheStats:
+    """Hit/miss counters for the compiled-tool cache."""
+
+    hits: int = 0
+    misses: int = 0
+    code_hits: int = 0
+    code_misses: int = 0
+    entries: int = 0
+    code_entries: int = 0
+
+
+@dataclass
+class _CompiledToolEntry:
+    fingerprint: str
+    tool: FunctionTool
+
+
+# Names the curated "os" entry exposes; bound per namespace to its mock os
+_OS_NAMES = frozenset({"os", *(CURATED_LIBRARIES.get("os") or ())})
+
+
+def _make_guarded_import(tier: Tier) -> Callable[..., Any]:
+    real_import = __import__
+    allowed_imports = frozenset(CURATED_LIBRARIES)
+
+    def guarded_import(
+        name: str,
+        globals: dict[str, Any] | None = None,
+        locals: dict[str, Any] | None = None,
+        fromlist: tuple[str, ...] = (),
+        level: int = 0,
+    ) -> Any:
+        if tier != Tier.FREE:
+            return real_import(name, globals, locals, fromlist, level)
+        # Allow CPython internals needed by curated stdlib modules
+        if name in CPYTHON_INTERNALS:
+            return real_import(name, globals, locals, fromlist, level)
+        if name not in allowed_imports:
+            raise ImportError(f"Import of {name} not allowed in this context.")
+        if name == "os":
+            # The importing tool's own server namespace holds its mock os
+            if globals is None or "os" not in globals:
+                raise ImportError("Import of os not allowed in this context.")
+            return globals["os"]
+        return real_import(name, globals, locals, fromlist, level)
+
+    return guarded_import
+
+
 class DynamicToolLoader:
-    """Loads and compiles customer tools for the shared runtime."""
+    """
+    Loads and compiles customer tools for the shared runtime.
+
+    Tool globals are split in two layers. Builtins (minus BAD_BUILTINS), the
+    guarded __import__ and the curated modules/symbols form one read-only
+    mapping per tier, built once and installed as every namespace's
+    __builtins__. A server's own namespace dict only holds what differs:
+    its mock os, shared state helpers, pooled http_client, get_db_pool and
+    the compiled tool functions.
+    """
 
     def __init__(self):
         self._compiled_tools: dict[str, FunctionTool] = {}
         self._customer_namespaces: dict[UUID, dict[str, Any]] = {}
+        # (namespace_key, tool_id) -> last compiled tool and the fingerprint it
+        # was built from. One entry per live tool, replaced on change.
+        self._tool_cache: dict[tuple[UUID, str], _CompiledToolEntry] = {}
+        # code hash -> compiled code object, shared by every server running
+        # the same source (LRU bounded by CODE_CACHE_MAX_ENTRIES).
+        self._code_objects: OrderedDict[str, CodeType] = OrderedDict()
+        self._stats: CompileCacheStats = CompileCacheStats()
+        # Servers are compiled from worker threads (startup, lazy activation).
+        # _lock guards every shared dict and counter; a per-server lock makes
+        # each server's cache check, exec and namespace update single-writer.
+        self._lock: threading.Lock = threading.Lock()
+        self._server_locks: dict[UUID, threading.RLock] = {}
+        # Hash of the env vars each server was last compiled with
+        self._server_env: dict[UUID, str] = {}
+        self._base_builtins: dict[Tier, Mapping[str, Any]] = {}
+
+    @property
+    def cache_stats(self) -> CompileCacheStats:
+        """Snapshot of compiled-tool cache counters."""
+        return CompileCacheStats(
+            hits=self._stats.hits,
+            misses=self._stats.misses,
+            code_hits=self._stats.code_hits,
+            code_misses=self._stats.code_misses,
+            entries=len(self._tool_cache),
+            code_entries=len(self._code_objects),
+        )
 
     def compile_tool(
         self,
@@ -166,51 +353,113 @@ class DynamicToolLoader:
 
         Returns:
             Compiled fastmcp FunctionTool ready for injection
-        """
-        # Validate code for free tier
-        if tier == Tier.FREE:
-            validator = CodeValidator(tier)
-            errors: list[str] = validator.validate(code)
-            if errors:
-                raise ToolCompilationError(f"Code validation failed: {errors}")
 
+        Tools are cached per namespace by a fingerprint of their code,
+        parameters, tier and env vars. When the fingerprint is unchanged the
+        previously compiled FunctionTool is reused (with the new description
+        applied if only that changed), skipping validation and exec entirely.
+        """
         # Use server_id for namespace when available so each server gets its own
         # env vars. Otherwise multiple servers with same customer_id would share
         # a namespace and the last compiled server's env vars would overwrite.
         namespace_key: UUID = server_id if server_id is not None else customer_id
-        if namespace_key not in self._customer_namespaces:
-            self._customer_namespaces[namespace_key] = self._create_safe_namespace()
+        cache_key = f"{customer_id}:{tool_id}"
 
-        namespace = self._customer_namespaces[namespace_key]
+        with self._server_lock(namespace_key):
+            # Before the cache check: a cached tool may still follow new env vars
+            self._track_env(namespace_key, env_vars or {})
+            fingerprint = _tool_fingerprint(
+                name, code, parameters, tier, env_vars or {}
+            )
+            entry = self._tool_cache.get((namespace_key, tool_id))
+            if (
+                entry is not None
+                and entry.fingerprint == fingerprint
+                and namespace_key in self._customer_namespaces
+            ):
+                with self._lock:
+                    self._stats.hits += 1
+                tool = entry.tool
+                if tool.description != description:
+                    tool = tool.model_copy(update={"description": description})
+                    entry.tool = tool
+                with self._lock:
+                    self._compiled_tools[cache_key] = tool
+                return tool
+
+            with self._lock:
+                self._stats.misses += 1
+
+            # Validate code for free tier
+            if tier == Tier.FREE:
+                validator = CodeValidator(tier)
+                errors: list[str] = validator.validate(code)
+                if errors:
+                    raise ToolCompilationError(f"Code validation failed: {errors}")
+
+            # Compile the function
+            try:
+                func: Callable[..., Any] = self.build_function(
+                    namespace_key, name, code, env_vars or {}, tier
+                )
+            except Exception as e:
+                logger.error(f"Failed to compile tool {name}: {e}")
+                raise ToolCompilationError(f"Compilation failed: {e}")
+
+            # Opt-in: run the tool's code in the worker process pool
+            if settings.MCP_TOOL_EXECUTION_BACKEND == "process":
+                func = get_process_tool_executor().wrap(
+                    func, namespace_key, name, code, env_vars or {}, tier, customer_id
+                )
 
-        # Compile the function
-        try:
-            func: Callable[..., Any] = self._compile_function(
-                name, description, parameters, code, namespace, env_vars or {}, tier
+            # Hold get_db_pool() leases until the call ends
+            func = get_tool_db_pools().leased(func)
+
+            # Bound execution time and concurrency on the shared event loop
+            func = get_tool_limiter().wrap(
+                func, tool=name, server_id=namespace_key, customer_id=customer_id
             )
-        except Exception as e:
-            logger.error(f"Failed to compile tool {name}: {e}")
-            raise ToolCompilationError(f"Compilation failed: {e}")
-
-        # Create the FunctionTool
-        tool = FunctionTool.from_function(
-            fn=func,
-            name=name,  # Namespaced name
-            description=description,
-        )
 
-        # Override parameters with stored schema so MCP clients receive argument
-        # names, types, and descriptions. FunctionTool infers schema from the
-        # compiled function, but LLM-generated code may omit Field(description=...),
-        # and the DB is the source of truth for tool metadata.
-        params_list = _normalize_parameters(parameters)
-        if params_list:
-            tool.parameters = _parameters_to_json_schema(params_list)
+            # Create the FunctionTool
+            tool = FunctionTool.from_function(
+                fn=func,
+                name=name,  # Namespaced name
+                description=description,
+            )
 
-        cache_key = f"{customer_id}:{tool_id}"
-        self._compiled_tools[cache_key] = tool
+            # Override parameters with stored schema so MCP clients receive argument
+            # names, types, and descriptions. FunctionTool infers schema from the
+            # compiled function, but LLM-generated code may omit Field(description=...),
+            # and the DB is the source of truth for tool metadata.
+            params_list = _normalize_parameters(parameters)
+            if params_list:
+                tool.parameters = _parameters_to_json_schema(params_list)
+
+            with self._lock:
+                self._compiled_tools[cache_key] = tool
+                self._tool_cache[(namespace_key, tool_id)] = _CompiledToolEntry(
+                    fingerprint=fingerprint, tool=tool
+                )
 
-        return tool
+            return tool
+
+    def build_function(
+        self,
+        namespace_key: UUID,
+        name: str,
+        code: str,
+        env_vars: dict[str, str],
+        tier: Tier,
+    ) -> Callable[..., Any]:
+        """Exec validated code in namespace_key's namespace; return function name."""
+        with self._server_lock(namespace_key):
+            self._track_env(namespace_key, env_vars)
+            with self._lock:
+                namespace = self._customer_namespaces.get(namespace_key)
+                if namespace is None:
+                    namespace = self._create_safe_namespace(namespace_key)
+                    self._customer_namespaces[namespace_key] = namespace
+            return self._compile_function(name, "", [], code, namespace, env_vars, tier)
 
     def get_customer_tools(
         self,
@@ -256,42 +505,107 @@ class DynamicToolLoader:
 
     def invalidate_customer_tools(self, customer_id: UUID) -> None:
         """Remove all cached tools for a customer."""
-        keys_to_remove = [
-            k for k in self._compiled_tools if k.startswith(f"{customer_id}:")
-        ]
-        for key in keys_to_remove:
-            del self._compiled_tools[key]
+        with self._lock:
+            keys_to_remove = [
+                k for k in self._compiled_tools if k.startswith(f"{customer_id}:")
+            ]
+            for key in keys_to_remove:
+                del self._compiled_tools[key]
+
+        self.invalidate_server_tools(customer_id)
+
+    def invalidate_server_tools(self, server_id: UUID) -> None:
+        """Drop cached compiled tools, shared state and the namespace for a server."""
+        with self._server_lock(server_id), self._lock:
+            keys = [k for k in self._tool_cache if k[0] == server_id]
+            tools = {id(self._tool_cache.pop(k).tool) for k in keys}
+            # _compiled_tools is keyed by customer_id:tool_id; drop this
+            # server's entries by identity
+            for key in [k for k, t in self._compiled_tools.items() if id(t) in tools]:
+                del self._compiled_tools[key]
+            _ = self._customer_namespaces.pop(server_id, None)
+            _ = self._server_locks.pop(server_id, None)
+            _ = self._server_env.pop(server_id, None)
+        get_tool_limiter().forget_server(server_id)
+
+    def _track_env(self, namespace_key: UUID, env_vars: dict[str, str]) -> None:
+        """Retire a server's DB pools when its env vars (and so DSNs) change."""
+        env_hash = hashlib.sha256(
+            json.dumps(sorted(env_vars.items())).encode("utf-8")
+        ).hexdigest()
+        with self._lock:
+            previous = self._server_env.get(namespace_key)
+            self._server_env[namespace_key] = env_hash
+        if previous is not None and previous != env_hash:
+            get_tool_db_pools().retire_server(namespace_key)
+
+    def _server_lock(self, namespace_key: UUID) -> threading.RLock:
+        with self._lock:
+            lock = self._server_locks.get(namespace_key)
+            if lock is None:
+                lock = self._server_locks[namespace_key] = threading.RLock()
+            return lock
+
+    async def close_http_client(self, namespace_key: UUID) -> None:
+        """
+        Close a server's pooled HTTP connections.
 
-        if customer_id in self._customer_namespaces:
-            del self._customer_namespaces[customer_id]
+        A fresh, unconnected client takes its place, so a server that is
+        started again (lazy reactivation, redeploy) reuses its namespace.
+        """
+        namespace = self._customer_namespaces.get(namespace_key)
+        if namespace is None:
+            return
+        client = namespace.get("http_client")
+        namespace["http_client"] = ServerHTTPClient()
+        if isinstance(client, ServerHTTPClient):
+            await client.close_pool()
+
+    def _get_code_object(self, code: str) -> CodeType:
+        """Compile source to a code object, reusing it for identical source."""
+        code_hash = _hash_code(code)
+        with self._lock:
+            code_obj = self._code_objects.get(code_hash)
+            if code_obj is not None:
+                self._stats.code_hits += 1
+                self._code_objects.move_to_end(code_hash)
+                return code_obj
+            self._stats.code_misses += 1
+
+        code_obj = compile(code, "<string>", "exec")
+        with self._lock:
+            self._code_objects[code_hash] = code_obj
+            if len(self._code_objects) > CODE_CACHE_MAX_ENTRIES:
+                _ = self._code_objects.popitem(last=False)
+        return code_obj
+
+    def _base_builtins_for(self, tier: Tier) -> Mapping[str, Any]:
+        """Read-only builtins + curated modules shared by every namespace of a tier."""
+        base = self._base_builtins.get(tier)
+        if base is not None:
+            return base
+        with self._lock:
+            base = self._base_builtins.get(tier)
+            if base is not None:
+                return base
+            entries = {k: v for k, v in vars(builtins).items() if k not in BAD_BUILTINS}
+            # Curated names take precedence, as they did as namespace globals.
+            # os and its symbols are per server (mock os), never the real ones.
+            entries.update(
+                (k, v)
+                for k, v in get_capability_registry().namespace_entries().items()
+                if k not in _OS_NAMES
+            )
+            entries["__import__"] = _make_guarded_import(tier)
+            base = self._base_builtins[tier] = MappingProxyType(entries)
+            return base
 
-    def _create_safe_namespace(self) -> dict[str, Any]:
+    def _create_safe_namespace(self, namespace_key: UUID) -> dict[str, Any]:
         namespace: dict[str, Any] = {}
 
-        # ⚠️ You can further restrict this if needed
+        # Replaced with the tier's shared builtins in _compile_function
         namespace["__builtins__"] = {}
 
-        for module_path, symbols in CURATED_LIBRARIES.items():
-            try:
-                module = _import_module(module_path)
-
-                # Expose the module itself (e.g. json, itertools)
-                module_name = module_path.split(".")[0]
-                namespace[module_name] = module
-
-                if not symbols:
-                    # symbols=None → allow full module usage
-                    continue
-                for symbol in symbols:
-                    try:
-                        namespace[symbol] = getattr(module, symbol)
-                    except AttributeError:
-                        pass
-
-            except ImportError:
-                # Silently ignore unavailable libraries (free tier behavior)
-                continue
-
         # Shared state for cross-tool data persistence within a server session.
         # Tools that need to store and retrieve data (e.g. ingest_logs → search_logs)
         # can use this dict instead of relying on undefined global variables.
@@ -308,6 +622,20 @@ class DynamicToolLoader:
         namespace["get_state"] = get_state
         namespace["set_state"] = set_state
 
+        # Pooled HTTP client shared by the server's tools (see tool_http)
+        namespace["http_client"] = ServerHTTPClient()
+
+        async def get_db_pool(
+            env_var: str = "DATABASE_URL", driver: str | None = None
+        ) -> Any:
+            """Runtime-managed pool for the DSN in env_var (see tool_db)."""
+            dsn = namespace["os"].environ.get(env_var)
+            if not dsn:
+                raise ToolDBPoolError(f"Environment variable {env_var} is not set")
+            return await get_tool_db_pools().acquire(namespace_key, dsn, driver)
+
+        namespace["get_db_pool"] = get_db_pool
+
         return namespace
 
     def _compile_function(
@@ -332,76 +660,15 @@ class DynamicToolLoader:
             env_vars: Static environment variables from DB
             tier: Tier for determining restrictions
         """
-        real_import = __import__
-
-        bad_builtins = [
-            "eval",
-            "exec",
-            "compile",
-            "open",
-            "input",
-            "__import__",
-            "globals",
-            "locals",
-            "vars",
-            "dir",
-            "help",
-            "breakpoint",
-            "exit",
-            "quit",
-            "license",
-            "copyright",
-            "credits",
-            "delattr",
-        ]
-
-        builtins_dict = dict(__builtins__)
-        for bad in bad_builtins:
-            builtins_dict.pop(bad, None)
-
-        # Define guarded import
-        allowed_imports: list[str] = list[str](CURATED_LIBRARIES.keys())
-
-        # CPython internal modules that standard library functions need at runtime.
-        # e.g. datetime.strptime() imports _strptime; codecs/encodings handle text I/O.
-        cpython_internals = frozenset(
-            {
-                "_strptime",
-                "_codecs",
-                "encodings",
-                "encodings.utf_8",
-                "encodings.ascii",
-                "io",
-                "abc",
-                "contextvars",
-            }
-        )
-
-        def guarded_import(
-            name: str,
-            globals: dict[str, Any] | None = None,
-            locals: dict[str, Any] | None = None,
-            fromlist: tuple[str, ...] = (),
-            level: int = 0,
-        ) -> Any:
-            if tier != Tier.FREE:
-                return real_import(name, globals, locals, fromlist, level)
-            # Allow CPython internals needed by curated stdlib modules
-            if name in cpython_internals:
-                return real_import(name, globals, locals, fromlist, level)
-            if name not in allowed_imports:
-                raise ImportError(f"Import of {name} not allowed in this context.")
-            if name == "os":
-                return namespace["os"]
-            return real_import(name, globals, locals, fromlist, level)
-
-        builtins_dict["__import__"] = guarded_import
-
-        namespace["__builtins__"] = builtins_dict
-        namespace["os"] = make_mock_os(env_vars)
+        namespace["__builtins__"] = self._base_builtins_for(tier)
+        if getattr(namespace.get("os"), "_static_env", None) != env_vars:
+            mock_os = make_mock_os(env_vars)
+            namespace["os"] = mock_os
+            for symbol in CURATED_LIBRARIES.get("os") or ():
+                namespace[symbol] = getattr(mock_os, symbol)
 
         try:
-            exec(code, namespace)
+            exec(self._get_code_object(code), namespace)
             return namespace[name]
         except Exception as e:
             raise ToolCompilationError(f"Failed to compile function: {e}")
@@ -418,14 +685,14 @@ def get_tool_loader() -> DynamicToolLoader:
 
 
 async def compile_server_tools(
-    server: "MCPServer | ServerStartupData",
-    tools: "list[MCPTool] | list[MCPToolData]",
-    env_var_repo: "MCPEnvironmentVariableRepo | None" = None,
-    env_vars: "dict[str, str] | None" = None,
+    server: MCPServer | ServerStartupData,
+    tools: list[MCPTool] | list[MCPToolData],
+    env_var_repo: MCPEnvironmentVariableRepo | None = None,
+    env_vars: dict[str, str] | None = None,
     tool_loader: DynamicToolLoader | None = None,
-    tier: "Tier | None" = None,
+    tier: Tier | None = None,
     raise_on_missing_code: bool = False,
-) -> "list[FunctionTool]":
+) -> list[FunctionTool]:
     """
     Fetch env-vars and compile all tools for a server.
 
@@ -463,6 +730,37 @@ async def compile_server_tools(
             var.name: var.value for var in env_var_records if var.value is not None
         }
 
+    return compile_tools_for_server(
+        server=server,
+        tools=tools,
+        env_vars=env_vars,
+        tool_loader=resolved_loader,
+        tier=resolved_tier,
+        raise_on_missing_code=raise_on_missing_code,
+    )
+
+
+def compile_tools_for_server(
+    server: MCPServer | ServerStartupData,
+    tools: list[MCPTool] | list[MCPToolData],
+    env_vars: dict[str, str],
+    tool_loader: DynamicToolLoader | None = None,
+    tier: Tier | None = None,
+    raise_on_missing_code: bool = False,
+) -> list[FunctionTool]:
+    """
+    Synchronous compile loop behind compile_server_tools.
+
+    Does no I/O, so the startup path can run it in a worker thread with
+    env vars that were already batch-loaded. Arguments match
+    compile_server_tools.
+    """
+    resolved_tier: Tier = tier if tier is not None else Tier.FREE
+    resolved_loader: DynamicToolLoader = (
+        tool_loader if tool_loader is not None else get_tool_loader()
+    )
+
+    started = time.perf_counter()
     compiled: list[FunctionTool] = []
     for tool in tools:
         if not tool.code:
@@ -497,4 +795,7 @@ async def compile_server_tools(
                 f"Failed to compile tool '{tool.name}' for server {server.id}: {exc}"
             )
 
+    elapsed = time.perf_counter() - started
+    mcp_compile_duration_seconds.observe(elapsed)
+    mcp_server_last_compile_seconds.set(elapsed, str(server.id))
     return compiled
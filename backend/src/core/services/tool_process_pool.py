@@ -0,0 +1,298 @@
+"""
+Opt-in process-pool execution of compiled tools.
+
+With settings.MCP_TOOL_EXECUTION_BACKEND = "process", compile_tool still
+validates and execs a tool in the API process (to get its signature and
+schema), but the function FastMCP calls only ships the call to a pool of
+worker processes, so CPU-heavy tools (bs4/lxml parsing, big json or re
+work) no longer block the event loop that serves auth, wizard streaming
+and every other tenant.
+
+Each worker builds the tool with the same DynamicToolLoader namespace as
+the API process: the tier's curated builtins and a make_mock_os env layer
+with the server's static env vars. The request's X-Env-* vars are
+forwarded with every call, and the result comes back as JSON. Workers keep
+one namespace per server, so get_state/set_state is per worker process.
+
+Every call carries the limiter's deadline and the worker enforces it: a
+coroutine is cancelled at its next await and a SIGALRM timer interrupts
+code that never awaits, so a timed-out call frees its worker. A worker
+stuck in C code past the deadline plus MCP_TOOL_PROCESS_KILL_GRACE_SECONDS
+is killed and the pool replaced. Each customer may run at most
+MCP_TOOL_PROCESS_MAX_CALLS_PER_CUSTOMER calls in the pool at once (default
+half the workers), so one tenant's CPU spikes cannot take every worker.
+"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from fastmcp.exceptions import ToolError
+from loguru import logger
+
+from core.services.metrics import mcp_tool_rejections_total
+from core.services.request_context import request_env_vars
+from core.services.tier_service import Tier
+from core.services.tool_limits import get_tool_limiter
+from settings import settings
+
+# Compiled functions kept per worker before the cache is cleared
+WORKER_FUNCTION_CACHE_MAX_ENTRIES = 1024
+
+# How long after the deadline the alarm fires, so a coroutine's own
+# cancellation (which leaves the worker loop in a clean state) goes first
+WORKER_ALARM_GRACE_SECONDS = 0.5
+
+
+class ProcessToolError(Exception):
+    """A tool raised in a worker process; carries the original type and message."""
+
+
+@dataclass(frozen=True)
+class ProcessToolCall:
+    """Everything a worker needs to build and run one tool call."""
+
+    server_id: UUID
+    name: str
+    code: str
+    tier: Tier
+    env_vars: dict[str, str]
+    request_env: dict[str, str]
+    kwargs: dict[str, Any]
+    # Wall-clock (time.time()) instant the caller stops waiting
+    deadline: float
+
+    def function_key(self) -> str:
+        payload = json.dumps(
+            [
+                str(self.server_id),
+                self.name,
+                self.code,
+                self.tier.value,
+                sorted(self.env_vars.items()),
+            ]
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Worker process state
+_worker_functions: dict[str, Callable[..., Any]] = {}
+_worker_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _init_worker() -> None:
+    """Import the curated libraries once per worker, before the first call."""
+    from core.services.capabilities import get_capability_registry
+
+    _ = get_capability_registry().libraries
+
+
+def _worker_function(call: ProcessToolCall) -> Callable[..., Any]:
+    from core.services.tool_loader import get_tool_loader
+
+    key = call.function_key()
+    func = _worker_functions.get(key)
+    if func is None:
+        if len(_worker_functions) >= WORKER_FUNCTION_CACHE_MAX_ENTRIES:
+            _worker_functions.clear()
+        func = get_tool_loader().build_function(
+            call.server_id, call.name, call.code, call.env_vars, call.tier
+        )
+        _worker_functions[key] = func
+    return func
+
+
+class _WorkerDeadline(TimeoutError):
+    """Raised by the SIGALRM handler when a call outlives its deadline."""
+
+
+def _raise_deadline(signum: int, frame: Any) -> None:
+    raise _WorkerDeadline("tool call exceeded its deadline")
+
+
+def run_tool_call(call: ProcessToolCall) -> str:
+    """Worker entry point: run one call and return its result as JSON."""
+    global _worker_loop
+    if call.deadline <= time.time():
+        # The caller already gave up while the call was queued
+        raise ProcessToolError("TimeoutError: tool call expired before it started")
+
+    token = request_env_vars.set(call.request_env)
+    # Pool workers run calls on their main thread, so the alarm reaches them
+    alarm = hasattr(signal, "setitimer")
+    if alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_deadline)
+        _ = signal.setitimer(
+            signal.ITIMER_REAL,
+            call.deadline - time.time() + WORKER_ALARM_GRACE_SECONDS,
+        )
+    try:
+        result = _worker_function(call)(**call.kwargs)
+        if inspect.isawaitable(result):
+            # One loop per worker, so clients cached in shared state keep working
+            if _worker_loop is None:
+                _worker_loop = asyncio.new_event_loop()
+            result = _worker_loop.run_until_complete(
+                asyncio.wait_for(result, max(0.0, call.deadline - time.time()))
+            )
+        return json.dumps(result, default=str)
+    except _WorkerDeadline as e:
+        # The alarm may have fired inside the loop itself; start a fresh one
+        _worker_loop = None
+        raise ProcessToolError(f"TimeoutError: {e}") from e
+    except Exception as e:
+        # Only the message crosses the process boundary; __cause__ is not pickled
+        raise ProcessToolError(f"{type(e).__name__}: {e}") from e
+    finally:
+        if alarm:
+            _ = signal.setitimer(signal.ITIMER_REAL, 0)
+            _ = signal.signal(signal.SIGALRM, previous)
+        request_env_vars.reset(token)
+
+
+class ProcessToolExecutor:
+    """
+    Lazily started pool of tool worker processes.
+
+    Workers are spawned rather than forked: the API process runs threads and
+    an event loop that must not be copied into a child. A pool broken by a
+    crashed worker is replaced on the next call.
+    """
+
+    def __init__(
+        self, max_workers: int | None = None, max_customer_calls: int | None = None
+    ) -> None:
+        self.max_workers = max_workers or os.process_cpu_count() or 1
+        self.max_customer_calls = max_customer_calls or max(1, self.max_workers // 2)
+        self.kill_grace = settings.MCP_TOOL_PROCESS_KILL_GRACE_SECONDS
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._customer_calls: dict[UUID, int] = {}
+
+    def in_flight(self, customer_id: UUID) -> int:
+        return self._customer_calls.get(customer_id, 0)
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+                logger.info(f"Started tool process pool ({self.max_workers} workers)")
+            return self._pool
+
+    def wrap(
+        self,
+        func: Callable[..., Any],
+        server_id: UUID,
+        name: str,
+        code: str,
+        env_vars: dict[str, str],
+        tier: Tier,
+        customer_id: UUID,
+    ) -> Callable[..., Any]:
+        """Return an async function with func's signature that runs in the pool."""
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def in_process(*args: Any, **kwargs: Any) -> Any:
+            call = ProcessToolCall(
+                server_id=server_id,
+                name=name,
+                code=code,
+                tier=tier,
+                env_vars=env_vars,
+                request_env=dict(request_env_vars.get()),
+                kwargs=dict(signature.bind(*args, **kwargs).arguments),
+                deadline=time.time() + get_tool_limiter().timeout,
+            )
+            return json.loads(await self.submit(call, customer_id))
+
+        return in_process
+
+    async def submit(self, call: ProcessToolCall, customer_id: UUID) -> str:
+        if self.in_flight(customer_id) >= self.max_customer_calls:
+            mcp_tool_rejections_total.inc(
+                str(call.server_id), call.name, "process_customer_limit"
+            )
+            logger.warning(
+                f"Rejected tool call {call.name} on {call.server_id}: "
+                + "process_customer_limit"
+            )
+            raise ToolError(
+                "Too many concurrent CPU-bound tool calls "
+                + f"(limit {self.max_customer_calls}); retry shortly"
+            )
+
+        self._customer_calls[customer_id] = self.in_flight(customer_id) + 1
+        pool = self.pool
+        future = pool.submit(run_tool_call, call)
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            self._discard(pool)
+            logger.error(f"Tool process pool broke while running {call.name}")
+            raise
+        finally:
+            remaining = self._customer_calls.get(customer_id, 1) - 1
+            if remaining > 0:
+                self._customer_calls[customer_id] = remaining
+            else:
+                _ = self._customer_calls.pop(customer_id, None)
+            if not future.done():
+                # Cancelled caller: the worker stops itself at the deadline;
+                # kill the pool if it is stuck in code the alarm cannot reach
+                delay = max(0.0, call.deadline - time.time()) + self.kill_grace
+                _ = asyncio.get_running_loop().call_later(
+                    delay, self._kill_if_stuck, pool, future, call.name
+                )
+
+    def _kill_if_stuck(self, pool: ProcessPoolExecutor, future: Any, name: str) -> None:
+        if future.done():
+            return
+        logger.error(f"Tool {name} is stuck past its deadline; replacing the pool")
+        self._discard(pool)
+        # ProcessPoolExecutor cannot stop a running call; kill its workers
+        for process in list(getattr(pool, "_processes", {}).values()):
+            process.kill()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _discard(self, pool: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+_process_tool_executor: ProcessToolExecutor | None = None
+
+
+def get_process_tool_executor() -> ProcessToolExecutor:
+    global _process_tool_executor
+    if _process_tool_executor is None:
+        _process_tool_executor = ProcessToolExecutor(
+            settings.MCP_TOOL_PROCESS_WORKERS or None,
+            settings.MCP_TOOL_PROCESS_MAX_CALLS_PER_CUSTOMER or None,
+        )
+    return _process_tool_executor
@@ -3,12 +3,13 @@ import secrets
 import time
 from collections.abc import AsyncGenerator
 from contextlib import AsyncExitStack
-from pathlib import Path
 from typing import Any, Literal, cast
 from uuid import UUID
 
-import yaml
-from entrypoints.mcp.shared_runtime import register_new_customer_app
+from entrypoints.mcp.shared_runtime import (
+    publish_runtime_event,
+    register_new_customer_app,
+)
 from fastapi import FastAPI
 from infrastructure.models.deployment import DeploymentStatus, DeploymentTarget
 from infrastructure.models.mcp_server import MCPServer, MCPServerSetupStatus, MCPTool
@@ -25,9 +26,11 @@ from openai.types.chat import ChatCompletion, ChatCompletionMessageParam
 from pydantic import BaseModel, Field, field_validator
 from settings import settings
 
+from core.services.capabilities import get_capability_registry
+from core.services.prompt_registry import prompt_registry
+from core.services.runtime_events import RuntimeEventKind
 from core.services.tier_service import (
     BLOCKED_MODULES,
-    CURATED_LIBRARIES,
     FREE_TIER_MAX_TOOLS,
     CodeValidator,
     Tier,
@@ -39,7 +42,29 @@ openai_client = AsyncOpenAI(
     api_key=settings.OPENROUTER_API_KEY,
 )
 
-PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
+CODE_GENERATION_PROMPT = "step_4_code_generation.yaml"
+# Keyword arguments _generate_tool_code formats the code generation prompt with
+CODE_GENERATION_PLACEHOLDERS = frozenset(
+    {
+        "AVAILABLE_LIBRARIES",
+        "FORBIDDEN_LIBRARIES",
+        "ENVIRONMENT_VARIABLES",
+        "TECHNICAL_DETAILS",
+        "FUNCTION_NAME",
+        "TOOL_NAME",
+        "TOOL_DESCRIPTION",
+        "MCP_SERVER_DESCRIPTION",
+        "ARGUMENTS_DOCSTRING",
+        "TOOL_ARGUMENTS",
+        "SERVER_TOOLS",
+        "SHARED_STATE_KEYS",
+    }
+)
+
+prompt_registry.preload()
+prompt_registry.require_placeholders(
+    CODE_GENERATION_PROMPT, CODE_GENERATION_PLACEHOLDERS
+)
 
 
 class ToolParameter(BaseModel):
@@ -108,18 +133,6 @@ def _validate_tool_schemas(tools: list[Tool]) -> list[str]:
     return errors
 
 
-def load_prompt(filename: str, as_string: bool = True) -> str | dict[str, object]:
-    try:
-        with open(PROMPTS_DIR / filename, "r") as file:
-            if as_string:
-                return file.read()
-            raw = cast(object, yaml.full_load(file))
-            return cast(dict[str, object], raw) if isinstance(raw, dict) else {}
-    except (FileNotFoundError, yaml.YAMLError) as e:
-        print(f"Error loading prompt file {filename}: {e}")
-        return "" if as_string else {}
-
-
 class WizardStepsService:
     """
     Class encapsulating steps of MCPServer creation.
@@ -139,7 +152,7 @@ class WizardStepsService:
     async def start_wizard_session(self, customer_id: UUID) -> MCPServer:
         """
         Create a new MCPServer in gathering_requirements status.
-        Initialises empty chat history in meta.
+        The chat history starts empty (see wizard_chat_messages).
         """
         from infrastructure.repositories.mcp_server import MCPServerCreate
 
@@ -147,7 +160,7 @@ class WizardStepsService:
             MCPServerCreate(
                 name="New MCP Server",
                 customer_id=customer_id,
-                meta={"step_zero_chat_history": []},
+                meta={},
             )
         )
         _ = await Provider.mcp_server_repo().update_setup_status(
@@ -155,17 +168,34 @@ class WizardStepsService:
         )
         return server
 
-    async def _save_chat_history(
-        self, server_id: UUID, history: list[dict[str, str]]
+    async def _append_chat_message(
+        self,
+        server_id: UUID,
+        message: dict[str, str],
+        meta_patch: dict[str, Any] | None = None,
+        meta_append: dict[str, list[Any]] | None = None,
+        description: str | None = None,
     ) -> None:
-        """Persist the chat history list into server.meta."""
-        server: MCPServer | None = await Provider.mcp_server_repo().get(server_id)  # type: ignore[arg-type]
-        updated_meta: dict[Any, Any] = (
-            dict(server.meta) if server and server.meta else {}
+        """Append one message to the chat history (one transaction)."""
+        _ = await Provider.mcp_server_repo().append_chat_messages(
+            server_id,
+            [message],
+            meta_patch=meta_patch,
+            meta_append=meta_append,
+            description=description,
+        )
+
+    async def _load_chat_context(self, server_id: UUID) -> list[dict[str, str]]:
+        """Newest chat messages, oldest first, capped for the LLM context."""
+        messages = await Provider.mcp_server_repo().get_chat_messages(
+            server_id, limit=settings.WIZARD_CHAT_CONTEXT_MESSAGES
         )
-        updated_meta["step_zero_chat_history"] = history
-        _ = await Provider.mcp_server_repo().update(
-            server_id, MCPServerUpdate(meta=updated_meta)
+        return [m.to_message() for m in messages]
+
+    async def is_spec_ready(self, server_id: UUID) -> bool:
+        """Check whether an assistant message has carried the ready markers."""
+        return await Provider.mcp_server_repo().has_chat_message_containing(
+            server_id, "assistant", self.READY_TO_START_MARKER, self.END_READY_MARKER
         )
 
     def _extract_ready_description(self, text: str) -> str | None:
@@ -197,38 +227,27 @@ class WizardStepsService:
         history: list[dict[str, str]],
     ) -> None:
         """
-        After an assistant response is fully accumulated:
-        – save it to chat history
-        – extract technical details and description if ready
+        After an assistant response is fully accumulated, in one transaction:
+        – append it to chat history
+        – add its technical details and, if ready, store the description
         """
-        history.append({"role": "assistant", "content": assistant_text})
-        await self._save_chat_history(server_id, history)
-
-        # Extract and merge technical details from all assistant messages
-        all_technical_details: list[str] = []
-        for msg in history:
-            if msg["role"] == "assistant":
-                details = self._extract_technical_details(msg["content"])
-                if details:
-                    all_technical_details.append(details)
-
-        if all_technical_details:
-            server: MCPServer | None = await Provider.mcp_server_repo().get(server_id)  # type: ignore[arg-type]
-            updated_meta: dict[Any, Any] = (
-                dict(server.meta) if server and server.meta else {}
-            )
-            updated_meta["technical_details"] = all_technical_details
-            _ = await Provider.mcp_server_repo().update(
-                server_id, MCPServerUpdate(meta=updated_meta)
-            )
+        assistant_message = {"role": "assistant", "content": assistant_text}
+        history.append(assistant_message)
+
+        # Earlier turns' details are already in meta; only this one's are added
+        details = self._extract_technical_details(assistant_text)
 
         # If ready, extract description too
+        description: str | None = None
         if self.is_ready_to_start(assistant_text):
             description = self._extract_ready_description(assistant_text)
-            if description:
-                _ = await Provider.mcp_server_repo().update(
-                    server_id, MCPServerUpdate(description=description)
-                )
+
+        await self._append_chat_message(
+            server_id,
+            assistant_message,
+            meta_append={"technical_details": [details]} if details else None,
+            description=description,
+        )
 
     async def process_wizard_chat_message_stream(
         self,
@@ -244,16 +263,15 @@ class WizardStepsService:
         if server is None:
             raise ValueError(f"Server {mcp_server_id} not found")
 
-        # Load existing history
-        history: list[dict[str, str]] = list(
-            (server.meta or {}).get("step_zero_chat_history", [])
-        )
-        history.append({"role": "user", "content": message})
+        # Load the tail of the history the LLM gets as context
+        history = await self._load_chat_context(mcp_server_id)
+        user_message = {"role": "user", "content": message}
+        history.append(user_message)
         # Persist user message immediately
-        await self._save_chat_history(mcp_server_id, history)
+        await self._append_chat_message(mcp_server_id, user_message)
 
         # Build LLM messages
-        system_prompt = load_prompt("step_0_wizard_chat.yaml")
+        system_prompt = prompt_registry.get("step_0_wizard_chat.yaml").source
         llm_messages: list[ChatCompletionMessageParam] = cast(
             list[ChatCompletionMessageParam],
             [
@@ -294,16 +312,15 @@ class WizardStepsService:
         if server is None:
             raise ValueError(f"Server {mcp_server_id} not found")
 
-        # Load existing history
-        history: list[dict[str, str]] = list(
-            (server.meta or {}).get("step_zero_chat_history", [])
-        )
-        history.append({"role": "user", "content": message})
+        # Load the tail of the history the LLM gets as context
+        history = await self._load_chat_context(mcp_server_id)
+        user_message = {"role": "user", "content": message}
+        history.append(user_message)
         # Persist user message immediately
-        await self._save_chat_history(mcp_server_id, history)
+        await self._append_chat_message(mcp_server_id, user_message)
 
         # Build LLM messages
-        system_prompt = load_prompt("step_0_wizard_chat.yaml")
+        system_prompt = prompt_registry.get("step_0_wizard_chat.yaml").source
         llm_messages: list[ChatCompletionMessageParam] = cast(
             list[ChatCompletionMessageParam],
             [
@@ -342,7 +359,7 @@ class WizardStepsService:
         )
 
         try:
-            system_prompt = load_prompt(prompt_file)
+            system_prompt = prompt_registry.get(prompt_file).source
 
             # Get server to access meta for technical details
             server = await Provider.mcp_server_repo().get(mcp_server_id)  # type: ignore[arg-type]
@@ -457,7 +474,7 @@ class WizardStepsService:
                 f"- {tool.name}: {tool.description}" for tool in server_tools
             )
 
-            system_prompt: str | dict[str, object] = load_prompt(prompt_file)
+            system_prompt = prompt_registry.get(prompt_file).source
 
             # Include technical details from meta if available
             technical_details: list[str] = cast(
@@ -544,12 +561,8 @@ class WizardStepsService:
                         existing_technical_details.add(new_detail.strip())
 
                 # Update server meta with merged technical details
-                updated_meta = dict(server.meta) if server.meta else {}
-                updated_meta["technical_details"] = merged_technical_details
-
-                _ = await Provider.mcp_server_repo().update(
-                    mcp_server_id,
-                    MCPServerUpdate(meta=updated_meta),
+                _ = await Provider.mcp_server_repo().merge_meta(
+                    mcp_server_id, {"technical_details": merged_technical_details}
                 )
 
             _ = await Provider.mcp_tool_repo().delete_tools_for_server(mcp_server_id)
@@ -607,7 +620,7 @@ class WizardStepsService:
         server = await Provider.mcp_server_repo().get(mcp_server_id)
 
         try:
-            system_prompt = load_prompt(prompt_file)
+            system_prompt = prompt_registry.get(prompt_file).source
             server_desc = server.description if server else ""
 
             server_tools = await Provider.mcp_tool_repo().get_tools_for_server(
@@ -693,7 +706,7 @@ class WizardStepsService:
                 f"- {var.name}: {var.description}" for var in env_vars
             )
 
-            system_prompt = load_prompt(prompt_file)
+            system_prompt = prompt_registry.get(prompt_file).source
             server_desc = server.description if server else ""
 
             server_tools = await Provider.mcp_tool_repo().get_tools_for_server(
@@ -921,22 +934,10 @@ class WizardStepsService:
         # Only advertise libraries that are actually importable in the runtime.
         # This prevents the LLM from generating code that imports a package
         # (e.g. dateutil, psycopg) that isn't installed.
-        import importlib
-
-        available_libraries: list[str] = []
-        for package, imports in CURATED_LIBRARIES.items():
-            base = package.split(".")[0]
-            try:
-                importlib.import_module(base)
-            except ImportError:
-                continue  # Skip packages not installed in the runtime
-            available_libraries.append(
-                f"- {package}: "
-                + ("all exports" if imports is None else ", ".join(imports))
-            )
+        capabilities = get_capability_registry()
 
         prompt = prompt_template.format(
-            AVAILABLE_LIBRARIES="\n".join(available_libraries),
+            AVAILABLE_LIBRARIES=capabilities.prompt_listing(),
             FORBIDDEN_LIBRARIES="\n".join(f"- {lib}" for lib in BLOCKED_MODULES),
             ENVIRONMENT_VARIABLES="\n".join(
                 f"- {var.name}: {var.description}"
@@ -968,7 +969,7 @@ class WizardStepsService:
             list[ChatCompletionMessageParam],
             [{"role": "user", "content": prompt}],
         )
-        code_validator = CodeValidator(tier)
+        code_validator = CodeValidator(tier, capabilities)
 
         # Build expected parameter set and type map from the tool schema so we can catch
         # cases where the LLM renames, drops, adds parameters, or uses wrong types.
@@ -1068,10 +1069,7 @@ class WizardStepsService:
         # tier = Tier(customer.tier)
         tier = Tier.FREE
 
-        system_prompt_data = load_prompt("step_4_code_generation.yaml", as_string=False)
-        assert isinstance(system_prompt_data, dict)
-        prompt_template = system_prompt_data.get("prompt", "")
-        assert isinstance(prompt_template, str)
+        prompt_template = prompt_registry.get(CODE_GENERATION_PROMPT).field("prompt")
 
         async def generate_code_for_tool(
             pt: str, tool: MCPTool, enable_logging: bool = False
@@ -1127,11 +1125,8 @@ class WizardStepsService:
             )
         except Exception as e:
             logger.exception(f"[{mcp_server_id}] Code generation failed: {e}")
-            _ = await Provider.mcp_server_repo().update(
-                mcp_server_id,
-                MCPServerUpdate(
-                    meta={**(server.meta or {}), "processing_error": str(e)},
-                ),
+            _ = await Provider.mcp_server_repo().merge_meta(
+                mcp_server_id, {"processing_error": str(e)}
             )
             _ = await Provider.mcp_server_repo().update_setup_status(
                 mcp_server_id, MCPServerSetupStatus.deployment_selection
@@ -1160,10 +1155,9 @@ class WizardStepsService:
             )
 
         tier = Tier.FREE
-        system_prompt_data = load_prompt("step_4_code_generation.yaml", as_string=False)
-        assert isinstance(system_prompt_data, dict)
-        prompt_template_val = system_prompt_data.get("prompt", "")
-        assert isinstance(prompt_template_val, str)
+        prompt_template_val = prompt_registry.get(CODE_GENERATION_PROMPT).field(
+            "prompt"
+        )
 
         code = await self._generate_tool_code(
             server=server,
@@ -1280,6 +1274,7 @@ class WizardStepsService:
         _ = await server_repo.update_setup_status(
             mcp_server_id, MCPServerSetupStatus.ready
         )
+        await publish_runtime_event(app, mcp_server_id, RuntimeEventKind.MOUNTED)
 
         logger.success(f"Server {mcp_server_id} deployed to shared runtime")
         return endpoint_url, token
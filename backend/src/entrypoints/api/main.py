@@ -2,6 +2,10 @@ from contextlib import AsyncExitStack, asynccontextmanager
 from typing import Any, override
 
 import logfire
+from core.services.capabilities import get_capability_registry
+from core.services.oauth_service import oauth_service
+from core.services.tool_db import get_tool_db_pools
+from core.services.tool_process_pool import get_process_tool_executor
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from infrastructure.repositories.repo_provider import Provider
@@ -9,8 +13,13 @@ from loguru import logger
 from opentelemetry.sdk.trace.sampling import ALWAYS_OFF, ALWAYS_ON, ParentBased, Sampler
 from settings import settings
 
-from entrypoints.api.middleware import MCPAccessMiddleware, MCPEnvMiddleware
-from entrypoints.api.routes import api_router
+from entrypoints.api.middleware import (
+    MCPAccessMiddleware,
+    MCPEnvMiddleware,
+    MetaAuthGuardMiddleware,
+    close_shard_proxy_client,
+)
+from entrypoints.api.routes import api_router, metrics_router
 from entrypoints.api.routes.oauth import mcp_oauth_router, well_known_router
 
 
@@ -40,8 +49,21 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Failed to initialize Meta MCP Server lifespan: {e}")
 
+        # Import the curated libraries off the event loop before compiling tools
+        await get_capability_registry().warm()
+
         # On startup: load all active MCP servers from DB
-        from entrypoints.mcp.shared_runtime import load_and_register_all_mcp_servers
+        from entrypoints.mcp.shared_runtime import (
+            load_and_register_all_mcp_servers,
+            start_runtime_sync,
+        )
+
+        # Follow mount changes made by other workers; subscribed before the
+        # load so nothing published meanwhile is missed
+        try:
+            _ = await start_runtime_sync(app, stack)
+        except Exception as e:
+            logger.error(f"Failed to start runtime event sync: {e}")
 
         try:
             # Pass the stack to the loader
@@ -89,6 +111,13 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Failed to initialize Meta MCP Server records: {e}")
 
+        # Write org API key last_used_at in batches instead of per request
+        api_key_repo = Provider.org_api_key_repo()
+        api_key_repo.start_last_used_flusher()
+
+        # Keep revoked access token jtis in memory instead of a DB check per call
+        oauth_service.revocation_index.start()
+
         # Yield control back to FastAPI.
         # The 'stack' keeps all MCP lifespans active while the app runs.
         yield
@@ -97,7 +126,14 @@ async def lifespan(app: FastAPI):
         # 1. The 'async with stack' block ends automatically here,
         #    gracefully shutting down all MCP servers in reverse order.
 
-        # 2. Then disconnect DB
+        # 2. Stop background DB work and tool worker processes, close tool DB
+        #    pools and shard proxy connections, flush buffered API key usage,
+        #    disconnect DB
+        await oauth_service.revocation_index.aclose()
+        await close_shard_proxy_client()
+        get_process_tool_executor().shutdown()
+        await get_tool_db_pools().close_all()
+        await api_key_repo.aclose()
         await Provider.disconnect()
 
 
@@ -171,6 +207,7 @@ class Application:
         self.app.add_middleware(MCPEnvMiddleware)
 
         self.app.include_router(api_router)
+        self.app.include_router(metrics_router)
 
         # Meta MCP server OAuth routes at /mcp/meta/oauth/* MUST be included
         # before the dynamic {server_id} routes to prevent 422 conflicts.
@@ -191,43 +228,17 @@ class Application:
         # Defense-in-depth: reject any request that reaches meta app without customer context
         # (parent MCPAccessMiddleware should have set this; this guards against scope/state bugs)
         # OAuth paths (/oauth/*) are excluded – they handle their own auth
-        from starlette.middleware.base import BaseHTTPMiddleware
-
-        class MetaAuthGuardMiddleware(BaseHTTPMiddleware):
-            async def dispatch(self, request, call_next):
-                path = request.scope.get("path", "")
-                if path.startswith("/oauth"):
-                    logger.info(
-                        "MCP_AUTH: meta guard – oauth path, pass path={path}",
-                        path=path,
-                    )
-                    return await call_next(request)
-                customer_id = getattr(request.state, "mcp_customer_id", None)
-                if not customer_id:
-                    logger.warning(
-                        "MCP_AUTH: meta guard REJECT – missing mcp_customer_id path={path}",
-                        path=path,
-                    )
-                    from starlette.responses import JSONResponse
-
-                    return JSONResponse(
-                        status_code=403,
-                        content={
-                            "detail": "Not authenticated – missing customer context"
-                        },
-                    )
-                logger.info(
-                    "MCP_AUTH: meta guard ALLOW path={path} customer_id={cid}",
-                    path=path,
-                    cid=str(customer_id),
-                )
-                return await call_next(request)
-
         meta_app.add_middleware(MetaAuthGuardMiddleware)
         self.app.mount("/mcp/meta", meta_app)
 
         # Note: The lifespan for the meta_mcp app MUST be started in the lifespan event below.
 
+        # Single dispatcher for all customer servers at /mcp/{server_id}.
+        # Mounted after /mcp/meta and the OAuth routers so those match first.
+        from entrypoints.mcp.shared_runtime import get_mcp_dispatcher
+
+        _ = get_mcp_dispatcher(self.app)
+
     def create_database_pool(self) -> None:
         _ = Provider.get_db(
             connect_args={
@@ -1,15 +1,37 @@
 """Middleware for MCP server authentication and request processing."""
 
-from typing import Any, override
+import random
+from collections import Counter
+from collections.abc import AsyncIterator
 from uuid import UUID
 
+import httpx
 from core.services.request_context import request_customer_id, request_env_vars
+from core.services.sharding import ShardAssignment, get_shard_assignment
 from loguru import logger
 from settings import settings
 from starlette import status
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Set on requests a node forwards to the shard owner; such a request is
+# never forwarded again
+SHARD_FORWARDED_HEADER = "x-mcp-shard-forwarded"
+
+# Connection-scoped headers that must not cross the proxy hop
+_HOP_BY_HOP_HEADERS = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+        "host",
+    }
+)
 
 
 def _mask_token(token: str) -> str:
@@ -48,7 +70,169 @@ def _forbidden_response(detail: str) -> JSONResponse:
     )
 
 
-class MCPAccessMiddleware(BaseHTTPMiddleware):
+_shard_proxy_client: httpx.AsyncClient | None = None
+
+
+def get_shard_proxy_client() -> httpx.AsyncClient:
+    """Pooled client used to forward requests to their shard owner."""
+    global _shard_proxy_client
+    if _shard_proxy_client is None:
+        _shard_proxy_client = httpx.AsyncClient(
+            # Streamable-HTTP/SSE responses stay open; only connecting is bounded
+            timeout=httpx.Timeout(
+                None, connect=settings.MCP_SHARD_PROXY_CONNECT_TIMEOUT_SECONDS
+            ),
+            follow_redirects=False,
+        )
+    return _shard_proxy_client
+
+
+async def close_shard_proxy_client() -> None:
+    global _shard_proxy_client
+    if _shard_proxy_client is not None:
+        await _shard_proxy_client.aclose()
+        _shard_proxy_client = None
+
+
+async def _proxy_to_owner(
+    scope: Scope, receive: Receive, send: Send, owner: str
+) -> None:
+    """
+    Forward a request to the same path on its owning node and stream back
+    the response. Authorization and every other end-to-end header are kept
+    (a cross-origin redirect would make clients drop Authorization).
+    """
+    url = owner + scope["path"]
+    if scope.get("query_string"):
+        url += "?" + scope["query_string"].decode("latin-1")
+    headers = [
+        (key, value)
+        for key, value in scope["headers"]
+        if key.decode("latin-1") not in _HOP_BY_HOP_HEADERS
+    ]
+    headers.append((SHARD_FORWARDED_HEADER.encode(), b"1"))
+
+    async def body() -> AsyncIterator[bytes]:
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            yield message.get("body", b"")
+            if not message.get("more_body", False):
+                return
+
+    client = get_shard_proxy_client()
+    request = client.build_request(
+        scope["method"], url, headers=headers, content=body()
+    )
+    try:
+        upstream = await client.send(request, stream=True)
+    except httpx.RequestError as e:
+        logger.warning(f"Shard owner {owner} unreachable for {scope['path']}: {e}")
+        response = JSONResponse(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            content={"detail": "Shard owner unreachable"},
+        )
+        await response(scope, receive, send)
+        return
+
+    try:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": upstream.status_code,
+                "headers": [
+                    (key, value)
+                    for key, value in upstream.headers.raw
+                    if key.decode("latin-1").lower() not in _HOP_BY_HOP_HEADERS
+                ],
+            }
+        )
+        async for chunk in upstream.aiter_raw():
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+    finally:
+        await upstream.aclose()
+
+
+def _get_header(scope: Scope, name: bytes) -> str:
+    """Return the first value of a (lowercase) request header, or ""."""
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return ""
+
+
+def _get_state(scope: Scope) -> dict:
+    """Return the per-request state dict that backs ``request.state``."""
+    return scope.setdefault("state", {})
+
+
+class AuthDecisionCounters:
+    """
+    Counts MCP auth decisions by (decision, reason).
+
+    Decisions are "allow" or "reject"; reasons are short snake_case labels
+    such as "oauth", "admin_key" or "missing_authorization". Kept for every
+    request regardless of log sampling.
+    """
+
+    def __init__(self) -> None:
+        self._counts: Counter[tuple[str, str]] = Counter()
+
+    def record(self, decision: str, reason: str) -> None:
+        self._counts[(decision, reason)] += 1
+
+    def snapshot(self) -> dict[tuple[str, str], int]:
+        return dict(self._counts)
+
+    def reset(self) -> None:
+        self._counts.clear()
+
+
+auth_decisions = AuthDecisionCounters()
+
+
+def _auth_log_sampled() -> bool:
+    """Decide once per request whether its auth trace is logged."""
+    rate = settings.MCP_AUTH_LOG_SAMPLE_RATE
+    if rate >= 1.0:
+        return True
+    if rate <= 0.0:
+        return False
+    return random.random() < rate
+
+
+def _allow(reason: str, sampled: bool, path: str, server_id: object) -> None:
+    auth_decisions.record("allow", reason)
+    if sampled:
+        logger.opt(lazy=True).debug(
+            "MCP_AUTH: ALLOW reason={reason} path={path} server_id={sid}",
+            reason=lambda: reason,
+            path=lambda: path,
+            sid=lambda: str(server_id),
+        )
+
+
+def _reject(reason: str, path: str, server_id: object, auth_raw: str = "") -> None:
+    """Count a rejection and log it (rejections are never sampled out)."""
+    auth_decisions.record("reject", reason)
+    logger.opt(lazy=True).warning(
+        "MCP_AUTH: REJECT reason={reason} path={path} server_id={sid} auth={auth}",
+        reason=lambda: reason,
+        path=lambda: path,
+        sid=lambda: str(server_id),
+        auth=lambda: _mask_auth_header(auth_raw),
+    )
+
+
+def _mask_auth_header(auth_raw: str) -> str:
+    if auth_raw.startswith("Bearer "):
+        return _mask_token(auth_raw[7:])
+    return "<none>" if not auth_raw else "<non-bearer>"
+
+
+class MCPAccessMiddleware:
     """
     Middleware for MCP endpoint authentication.
 
@@ -57,144 +241,164 @@ class MCPAccessMiddleware(BaseHTTPMiddleware):
 
     On authentication failure, returns 401 with WWW-Authenticate header
     pointing to the OAuth protected resource metadata.
+
+    Pure ASGI: the request runs on the caller's task and the response is
+    forwarded untouched, so streamable-HTTP/SSE bodies are not buffered.
+
+    On a sharded runtime, requests for servers owned by another node are
+    proxied there before authentication; the owner authenticates them. A
+    request that was already forwarded once (SHARD_FORWARDED_HEADER) is
+    never forwarded again, so nodes that disagree on the shard layout get
+    a 421 instead of bouncing it between them.
+
+    Every decision is counted in ``auth_decisions``. Rejections are logged
+    as warnings; the trace of allowed requests is logged at DEBUG for a
+    settings.MCP_AUTH_LOG_SAMPLE_RATE fraction of requests. Log arguments
+    are formatted only when a record is actually emitted.
     """
 
-    @override
-    async def dispatch(self, request: Request, call_next: Any):
-        path = request.url.path
-        method = request.method
-        auth_raw = request.headers.get("Authorization", "")
-        auth_masked = (
-            _mask_token(auth_raw[7:])
-            if auth_raw.startswith("Bearer ")
-            else ("<none>" if not auth_raw else "<non-bearer>")
-        )
+    def __init__(self, app: ASGIApp, shards: ShardAssignment | None = None) -> None:
+        self.app = app
+        # Defaults to the node's configured assignment (MCP_SHARD_NODES)
+        self.shards = shards
 
-        if not path.startswith("/mcp"):
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        logger.info(
-            "MCP_AUTH: request path={path} method={method} auth={auth}",
-            path=path,
-            method=method,
-            auth=auth_masked,
-        )
+        path: str = scope["path"]
+        if not path.startswith("/mcp"):
+            await self.app(scope, receive, send)
+            return
+
+        auth_raw = _get_header(scope, b"authorization")
+        sampled = _auth_log_sampled()
+        if sampled:
+            logger.opt(lazy=True).debug(
+                "MCP_AUTH: request path={path} method={method} auth={auth}",
+                path=lambda: path,
+                method=lambda: scope["method"],
+                auth=lambda: _mask_auth_header(auth_raw),
+            )
 
         # Handle /mcp/meta paths – authenticated via org API keys
         if path.startswith("/mcp/meta"):
-            return await self._handle_meta_auth(
-                request, call_next, path, auth_raw, auth_masked
-            )
+            await self._handle_meta_auth(scope, receive, send, path, auth_raw, sampled)
+            return
 
         # Path is like "/mcp/b28b6193-7c5d-4af0-82e3-4e9b08817dfa/mcp"
         # Extract server_id from path segments
         path_segments = path.strip("/").split("/")
         if len(path_segments) < 2:
-            return JSONResponse(
+            _reject("invalid_path", path, None)
+            response = JSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content={"detail": "Invalid MCP path"},
             )
+            await response(scope, receive, send)
+            return
 
         try:
             server_id = UUID(path_segments[1])
         except ValueError:
-            return JSONResponse(
+            _reject("invalid_server_id", path, None)
+            response = JSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content={"detail": "Invalid server ID format"},
             )
+            await response(scope, receive, send)
+            return
 
         # allow /oauth endpoints, for example /mcp/13ddb0a7-9049-49a8-961b-5804440cf709/oauth/register
         if path.startswith("/mcp/" + str(server_id) + "/oauth"):
-            return await call_next(request)
+            _allow("oauth_endpoint", sampled, path, server_id)
+            await self.app(scope, receive, send)
+            return
+
+        # Sharded runtime: the owning node authenticates and serves the request
+        shards = self.shards or get_shard_assignment()
+        if shards is not None and not shards.owns(server_id):
+            if _get_header(scope, SHARD_FORWARDED_HEADER.encode()):
+                _reject("shard_misrouted", path, server_id)
+                response = JSONResponse(
+                    status_code=status.HTTP_421_MISDIRECTED_REQUEST,
+                    content={"detail": "Server is not owned by this shard node"},
+                )
+                await response(scope, receive, send)
+                return
+            _allow("shard_proxy", sampled, path, server_id)
+            await _proxy_to_owner(scope, receive, send, shards.owner(server_id))
+            return
 
         # Extract token from Authorization header
         if not auth_raw:
-            logger.warning(
-                "MCP_AUTH: per-server reject – missing Authorization path={path} server_id={sid}",
-                path=path,
-                sid=str(server_id),
-            )
-            return _unauthorized_response("Missing Authorization header", server_id)
+            _reject("missing_authorization", path, server_id)
+            response = _unauthorized_response("Missing Authorization header", server_id)
+            await response(scope, receive, send)
+            return
 
         if not auth_raw.startswith("Bearer "):
-            logger.warning(
-                "MCP_AUTH: per-server reject – invalid format path={path} auth={auth}",
-                path=path,
-                auth=auth_masked,
-            )
-            return _unauthorized_response(
+            _reject("invalid_authorization_format", path, server_id, auth_raw)
+            response = _unauthorized_response(
                 "Invalid Authorization header format", server_id
             )
+            await response(scope, receive, send)
+            return
 
         token = auth_raw[7:]  # Strip "Bearer " prefix
 
         # Allow internal calls from the Next.js server using the admin API key
         if token == settings.ADMIN_ROUTES_API_KEY:
-            logger.info(
-                "MCP_AUTH: per-server ALLOW – internal admin key path={path} server_id={sid}",
-                path=path,
-                sid=str(server_id),
-            )
-            response = await call_next(request)
-            logger.info(
-                "MCP_LIB: per-server response status={status} path={path} server_id={sid}",
-                status=response.status_code,
-                path=path,
-                sid=str(server_id),
-            )
-            return response
-
-        logger.info(
-            "MCP_AUTH: per-server validating path={path} server_id={sid} token={token} dots={dots}",
-            path=path,
-            sid=str(server_id),
-            token=auth_masked,
-            dots=token.count("."),
-        )
+            _allow("admin_key", sampled, path, server_id)
+            await self.app(scope, receive, self._send(send, sampled, path, server_id))
+            return
 
         # OAuth JWT only (token must look like a JWT)
         if token.count(".") != 2:
-            logger.warning(
-                "MCP_AUTH: per-server reject – token not a JWT path={path} server_id={sid} token={token}",
-                path=path,
-                sid=str(server_id),
-                token=auth_masked,
-            )
-            return _forbidden_response("Invalid token format – OAuth JWT required")
+            _reject("not_a_jwt", path, server_id, auth_raw)
+            response = _forbidden_response("Invalid token format – OAuth JWT required")
+            await response(scope, receive, send)
+            return
 
-        payload = await self._validate_oauth_token(token, server_id)
+        payload = await self._validate_oauth_token(token, server_id, sampled)
         if payload is not None:
-            logger.info(
-                "MCP_AUTH: per-server ALLOW – OAuth JWT valid path={path} server_id={sid}",
-                path=path,
-                sid=str(server_id),
-            )
-            response = await call_next(request)
-            logger.info(
-                "MCP_LIB: per-server response status={status} path={path} server_id={sid}",
-                status=response.status_code,
-                path=path,
-                sid=str(server_id),
-            )
-            return response
+            _allow("oauth", sampled, path, server_id)
+            await self.app(scope, receive, self._send(send, sampled, path, server_id))
+            return
 
         # OAuth validation failed
-        logger.warning(
-            "MCP_AUTH: per-server reject – OAuth JWT invalid path={path} server_id={sid} token={token}",
-            path=path,
-            sid=str(server_id),
-            token=auth_masked,
-        )
-        return _forbidden_response("Invalid or expired token")
+        _reject("invalid_token", path, server_id, auth_raw)
+        response = _forbidden_response("Invalid or expired token")
+        await response(scope, receive, send)
+
+    @staticmethod
+    def _send(send: Send, sampled: bool, path: str, server_id: UUID) -> Send:
+        """Wrap send to log the response status of sampled requests."""
+        if not sampled:
+            return send
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                logger.debug(
+                    "MCP_LIB: per-server response status={status} path={path} server_id={sid}",
+                    status=message["status"],
+                    path=path,
+                    sid=server_id,
+                )
+            await send(message)
+
+        return send_wrapper
 
     async def _handle_meta_auth(
         self,
-        request: Request,
-        call_next: Any,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
         path: str,
         auth_header: str,
-        auth_masked: str,
-    ):
+        sampled: bool,
+    ) -> None:
         """Authenticate /mcp/meta requests via OAuth JWT only.
 
         OAuth endpoints at /mcp/meta/oauth/* are passed through without auth
@@ -204,123 +408,94 @@ class MCPAccessMiddleware(BaseHTTPMiddleware):
 
         # Allow OAuth endpoints through (they handle their own auth)
         if path.startswith("/mcp/meta/oauth"):
-            logger.info(
-                "MCP_AUTH: meta oauth path – passing through (no Bearer auth required) path={path} auth={auth}",
-                path=path,
-                auth=auth_masked,
-            )
-            return await call_next(request)
+            _allow("meta_oauth_endpoint", sampled, path, META_SERVER_ID)
+            await self.app(scope, receive, send)
+            return
 
         # Require auth for all other /mcp/meta paths
         if not auth_header:
-            logger.warning(
-                "MCP_AUTH: meta reject – missing Authorization header path={path}",
-                path=path,
-            )
-            return _unauthorized_response(
+            _reject("missing_authorization", path, META_SERVER_ID)
+            response = _unauthorized_response(
                 "Missing Authorization header", META_SERVER_ID
             )
+            await response(scope, receive, send)
+            return
 
         if not auth_header.startswith("Bearer "):
-            logger.warning(
-                "MCP_AUTH: meta reject – invalid Authorization format (not Bearer) path={path} auth={auth}",
-                path=path,
-                auth=auth_masked,
-            )
-            return _unauthorized_response(
+            _reject("invalid_authorization_format", path, META_SERVER_ID, auth_header)
+            response = _unauthorized_response(
                 "Invalid Authorization header format", META_SERVER_ID
             )
+            await response(scope, receive, send)
+            return
 
+        # OAuth JWT only for meta
         token = auth_header[7:]
-        token_dot_count = token.count(".")
-        logger.info(
-            "MCP_AUTH: meta validating token path={path} token={token} dots={dots} looks_like_jwt={jwt}",
-            path=path,
-            token=auth_masked,
-            dots=token_dot_count,
-            jwt=token_dot_count == 2,
-        )
+        if token.count(".") != 2:
+            _reject("not_a_jwt", path, META_SERVER_ID, auth_header)
+            response = _forbidden_response("Invalid token format – OAuth JWT required")
+            await response(scope, receive, send)
+            return
 
-        # OAuth JWT only for meta
-        if token_dot_count != 2:
-            logger.warning(
-                "MCP_AUTH: meta reject – token not a JWT path={path} token={token}",
-                path=path,
-                token=auth_masked,
-            )
-            return _forbidden_response("Invalid token format – OAuth JWT required")
-
-        payload = await self._validate_oauth_token(token, META_SERVER_ID)
-        logger.info(
-            "MCP_AUTH: meta OAuth JWT result path={path} token={token} valid={valid} sub={sub}",
-            path=path,
-            token=auth_masked,
-            valid=payload is not None,
-            sub=payload.get("sub") if payload else None,
-        )
+        payload = await self._validate_oauth_token(token, META_SERVER_ID, sampled)
         if payload is None:
-            logger.warning(
-                "MCP_AUTH: meta reject – OAuth JWT invalid path={path} token={token}",
-                path=path,
-                token=auth_masked,
-            )
-            return _forbidden_response("Invalid or expired token")
+            _reject("invalid_token", path, META_SERVER_ID, auth_header)
+            response = _forbidden_response("Invalid or expired token")
+            await response(scope, receive, send)
+            return
 
         # For meta server, sub is the customer_id (org_id) passed by frontend
         customer_id = payload.get("sub")
         if not customer_id:
-            logger.warning(
-                "MCP_AUTH: meta reject – OAuth valid but no sub path={path}",
-                path=path,
-            )
-            return _forbidden_response("Invalid or expired token")
+            _reject("missing_sub", path, META_SERVER_ID)
+            response = _forbidden_response("Invalid or expired token")
+            await response(scope, receive, send)
+            return
 
         try:
             org_uuid = UUID(str(customer_id))
-        except (ValueError, TypeError) as e:
-            logger.warning(
-                "MCP_AUTH: meta reject – OAuth sub not valid UUID path={path} sub={sub} err={err}",
-                path=path,
-                sub=customer_id,
-                err=str(e),
-            )
-            return _forbidden_response("Invalid or expired token")
+        except (ValueError, TypeError):
+            _reject("invalid_sub", path, META_SERVER_ID)
+            response = _forbidden_response("Invalid or expired token")
+            await response(scope, receive, send)
+            return
 
         ctx_token = request_customer_id.set(org_uuid)
-        request.state.mcp_customer_id = org_uuid
-        logger.info(
-            "MCP_AUTH: meta ALLOW – OAuth JWT valid path={path} customer_id={cid}",
-            path=path,
-            cid=str(org_uuid),
-        )
+        _get_state(scope)["mcp_customer_id"] = org_uuid
+        _allow("meta_oauth", sampled, path, META_SERVER_ID)
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send)
         finally:
             request_customer_id.reset(ctx_token)
 
-    async def _validate_oauth_token(self, token: str, server_id: UUID) -> dict | None:
+    async def _validate_oauth_token(
+        self, token: str, server_id: UUID, sampled: bool = False
+    ) -> dict | None:
         """Validate an OAuth JWT access token. Returns payload if valid, None otherwise."""
         try:
             from core.services.oauth_service import oauth_service
 
             payload = await oauth_service.validate_access_token(token, server_id)
-            logger.info(
-                "MCP_AUTH: OAuth validate_access_token SUCCESS server_id={sid} sub={sub}",
-                sid=str(server_id),
-                sub=payload.get("sub"),
-            )
+            if sampled:
+                logger.opt(lazy=True).debug(
+                    "MCP_AUTH: OAuth validate_access_token SUCCESS server_id={sid} sub={sub}",
+                    sid=lambda: str(server_id),
+                    sub=lambda: payload.get("sub"),
+                )
             return payload
 
         except Exception as e:
-            logger.info(
+            # Bind before the lambda: the except target is cleared on exit
+            err = str(e)
+            logger.opt(lazy=True).info(
                 "MCP_AUTH: OAuth validate_access_token FAILED server_id={sid} error={err}",
-                sid=str(server_id),
-                err=str(e),
+                sid=lambda: str(server_id),
+                err=lambda: err,
             )
             return None
 
 
-class MCPEnvMiddleware(BaseHTTPMiddleware):
+class MCPEnvMiddleware:
     """
     Middleware to extract ephemeral environment variables from request headers.
 
@@ -332,24 +507,64 @@ class MCPEnvMiddleware(BaseHTTPMiddleware):
         in the tool's os.environ lookup.
     """
 
-    @override
-    async def dispatch(self, request: Request, call_next: Any):
-        path = request.url.path
-        if not path.startswith("/mcp/"):
-            return await call_next(request)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith("/mcp/"):
+            await self.app(scope, receive, send)
+            return
 
-        # Extract X-Env-* headers
+        # Extract X-Env-* headers (ASGI header names are already lowercase)
         ephemeral_env: dict[str, str] = {}
-        for header, value in request.headers.items():
-            first_six_chars = header.lower()[:6]
-            if first_six_chars.replace("-", "_") == "x_env_":
+        for raw_header, raw_value in scope["headers"]:
+            if raw_header[:6].replace(b"-", b"_") == b"x_env_":
+                header = raw_header.decode("latin-1")
                 # X-Env-FOO-BAR -> FOO_BAR (uppercase, hyphens to underscores)
-                ephemeral_env[header[6:].upper().replace("-", "_")] = value
-                logger.debug(f"EPHEMERAL_HEADER: {header}")
+                ephemeral_env[header[6:].upper().replace("-", "_")] = raw_value.decode(
+                    "latin-1"
+                )
+                logger.debug("EPHEMERAL_HEADER: {}", header)
 
         # Set contextvar for this request
         token = request_env_vars.set(ephemeral_env)
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send)
         finally:
             request_env_vars.reset(token)
+
+
+class MetaAuthGuardMiddleware:
+    """
+    Defense-in-depth for the meta MCP app.
+
+    Rejects any request that reaches the meta app without customer context
+    (the parent MCPAccessMiddleware should have set it; this guards against
+    scope/state bugs). OAuth paths (/oauth/*) are excluded – they handle
+    their own auth.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope.get("path", "")
+        if path.startswith("/oauth"):
+            await self.app(scope, receive, send)
+            return
+
+        customer_id = scope.get("state", {}).get("mcp_customer_id")
+        if not customer_id:
+            _reject("meta_guard_missing_customer", path, None)
+            response = JSONResponse(
+                status_code=403,
+                content={"detail": "Not authenticated – missing customer context"},
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
@@ -6,6 +6,7 @@ from starlette import status
 
 from entrypoints.api.routes.api_keys import router as api_keys_router
 from entrypoints.api.routes.customers import router as customers_router
+from entrypoints.api.routes.metrics import router as metrics_routes
 from entrypoints.api.routes.servers import router as servers_router
 from entrypoints.api.routes.wizard import router as wizard_router
 
@@ -98,3 +99,12 @@ api_router.include_router(
 )
 api_router.include_router(servers_router, prefix="/servers", tags=["servers"])
 api_router.include_router(customers_router, prefix="/customers", tags=["customers"])
+
+# Prometheus scrape endpoint at /metrics (outside /api); admin key only
+metrics_router = APIRouter(
+    dependencies=[]
+    if settings.DEBUG
+    else [Depends(verify_api_key), Depends(require_admin)],
+    include_in_schema=False,
+)
+metrics_router.include_router(metrics_routes)
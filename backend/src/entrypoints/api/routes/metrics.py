@@ -0,0 +1,113 @@
+"""Prometheus scrape endpoint."""
+
+from fastapi import APIRouter, Request, Response
+
+from core.services.metrics import CONTENT_TYPE, format_family, metrics
+from core.services.oauth_service import oauth_service
+from core.services.tool_loader import get_tool_loader
+from entrypoints.api.middleware import auth_decisions
+from infrastructure.repositories.repo_provider import Provider
+
+router = APIRouter()
+
+
+def _auth_families() -> list[str]:
+    token_cache = oauth_service.token_cache.stats
+    return [
+        format_family(
+            "mcp_auth_decisions_total",
+            "MCP auth decisions by outcome and reason",
+            "counter",
+            (
+                ({"decision": decision, "reason": reason}, count)
+                for (decision, reason), count in sorted(
+                    auth_decisions.snapshot().items()
+                )
+            ),
+        ),
+        format_family(
+            "oauth_token_cache_requests_total",
+            "Access token cache lookups by result",
+            "counter",
+            [
+                ({"result": "hit"}, token_cache.hits),
+                ({"result": "miss"}, token_cache.misses),
+            ],
+        ),
+        format_family(
+            "oauth_token_cache_entries",
+            "Validated access tokens currently cached",
+            "gauge",
+            [({}, token_cache.entries)],
+        ),
+    ]
+
+
+def _compile_cache_families() -> list[str]:
+    stats = get_tool_loader().cache_stats
+    return [
+        format_family(
+            "mcp_compile_cache_requests_total",
+            "Compiled-tool cache lookups by cache and result",
+            "counter",
+            [
+                ({"cache": "tool", "result": "hit"}, stats.hits),
+                ({"cache": "tool", "result": "miss"}, stats.misses),
+                ({"cache": "code", "result": "hit"}, stats.code_hits),
+                ({"cache": "code", "result": "miss"}, stats.code_misses),
+            ],
+        ),
+    ]
+
+
+def _runtime_families(request: Request) -> list[str]:
+    dispatcher = getattr(request.app.state, "mcp_dispatcher", None)
+    if dispatcher is None:
+        return []
+    samples = [({"state": "live_lifespans"}, dispatcher.live_lifespans)]
+    if dispatcher.lazy_pool is not None:
+        samples.append(({"state": "resident"}, dispatcher.lazy_pool.resident_count))
+        samples.append(({"state": "routable"}, dispatcher.lazy_pool.routable_count))
+    else:
+        samples.append(({"state": "resident"}, len(dispatcher)))
+    return [
+        format_family(
+            "mcp_shared_servers",
+            "Shared MCP servers by state",
+            "gauge",
+            samples,
+        )
+    ]
+
+
+def _db_pool_families() -> list[str]:
+    if Provider._db is None:
+        return []
+    pool = Provider._db._engine.pool
+    samples = []
+    for state in ("size", "checkedin", "checkedout", "overflow"):
+        reader = getattr(pool, state, None)
+        if reader is not None:
+            samples.append(({"state": state}, reader()))
+    if not samples:
+        return []
+    return [
+        format_family(
+            "db_pool_connections",
+            "SQLAlchemy connection pool state",
+            "gauge",
+            samples,
+        )
+    ]
+
+
+@router.get("/metrics")
+async def get_metrics(request: Request) -> Response:
+    families = [
+        metrics.render(),
+        *_auth_families(),
+        *_compile_cache_families(),
+        *_runtime_families(request),
+        *_db_pool_families(),
+    ]
+    return Response(content="\n".join(families) + "\n", media_type=CONTENT_TYPE)
@@ -19,6 +19,8 @@ oauth_router = APIRouter(prefix="/oauth", tags=["oauth"])
 # Router for per-MCP-server OAuth endpoints (mounted at /mcp/{server_id})
 mcp_oauth_router = APIRouter(tags=["mcp-oauth"])
 
+JWKS_PATH = "/.well-known/jwks.json"
+
 
 # ============================================================================
 # Request/Response Models
@@ -46,6 +48,7 @@ class AuthorizationServerMetadata(BaseModel):
     grant_types_supported: list[str]
     code_challenge_methods_supported: list[str]
     token_endpoint_auth_methods_supported: list[str]
+    jwks_uri: str | None = None
 
 
 class ClientRegistrationRequest(BaseModel):
@@ -149,9 +152,16 @@ async def get_authorization_server_metadata() -> AuthorizationServerMetadata:
         grant_types_supported=["authorization_code", "refresh_token"],
         code_challenge_methods_supported=["S256"],
         token_endpoint_auth_methods_supported=["none", "client_secret_post"],
+        jwks_uri=f"{settings.OAUTH_ISSUER}{JWKS_PATH}",
     )
 
 
+@well_known_router.get(JWKS_PATH)
+async def get_jwks() -> dict[str, list[dict[str, Any]]]:
+    """RFC 7517 JWK Set with the public keys that verify access tokens."""
+    return oauth_service.keyring.jwks()
+
+
 # ============================================================================
 # OAuth Token Endpoint
 # ============================================================================
@@ -422,6 +432,7 @@ async def meta_get_authorization_server_metadata() -> AuthorizationServerMetadat
         grant_types_supported=["authorization_code", "refresh_token"],
         code_challenge_methods_supported=["S256"],
         token_endpoint_auth_methods_supported=["none", "client_secret_post"],
+        jwks_uri=f"{settings.OAUTH_ISSUER}{JWKS_PATH}",
     )
 
 
@@ -478,6 +489,7 @@ async def mcp_get_authorization_server_metadata(
         grant_types_supported=["authorization_code", "refresh_token"],
         code_challenge_methods_supported=["S256"],
         token_endpoint_auth_methods_supported=["none", "client_secret_post"],
+        jwks_uri=f"{settings.OAUTH_ISSUER}{JWKS_PATH}",
     )
 
 
@@ -842,4 +854,3 @@ async def meta_revoke_token(
         client_id=client_id,
     )
     return {}
-
@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import Any
 from uuid import UUID
 
+from core.services.runtime_events import RuntimeEventKind
 from core.services.tier_service import (
     CURATED_LIBRARIES,
     FREE_TIER_MAX_TOOLS,
@@ -25,6 +26,7 @@ from entrypoints.api.deps import (
     resolve_customer_id,
 )
 from entrypoints.mcp.shared_runtime import (
+    publish_runtime_event,
     register_new_customer_app,
     remount_mcp_server,
     unregister_mcp_app,
@@ -198,6 +200,9 @@ async def activate_server(server_id: UUID, request: Request) -> ActivateResponse
     # Update server setup status to READY
     _ = await server_repo.update_setup_status(server_id, MCPServerSetupStatus.ready)
 
+    # Mount it on the other runtime processes too, now the deployment is active
+    await publish_runtime_event(app, server_id, RuntimeEventKind.MOUNTED)
+
     return ActivateResponse(
         server_id=server_id,
         status="active",
@@ -415,6 +420,8 @@ async def delete_server(server_id: UUID, request: Request) -> dict[str, Any]:
         _ = unregister_mcp_app(request.app, server_id)
 
     _ = await server_repo.delete_cascade(server_id)
+    if server.deployment and server.deployment.status == DeploymentStatus.ACTIVE.value:
+        await publish_runtime_event(request.app, server_id, RuntimeEventKind.UNMOUNTED)
     logger.info(f"Deleted server {server_id}")
     return {
         "status": "deleted",
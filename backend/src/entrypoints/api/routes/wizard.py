@@ -6,7 +6,7 @@ from uuid import UUID
 
 from core.services.tier_service import FREE_TIER_MAX_TOOLS
 from core.services.wizard_steps_services import WizardStepsService, openai_client
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from infrastructure.models.mcp_server import MCPServerSetupStatus
 from infrastructure.repositories.mcp_server import MCPServerCreate, MCPServerUpdate
@@ -170,6 +170,18 @@ class WizardChatResponse(BaseModel):
     is_ready: bool = False
 
 
+class WizardChatMessageResponse(BaseModel):
+    seq: int
+    role: str
+    content: str
+    created_at: str
+
+
+class WizardChatHistoryResponse(BaseModel):
+    messages: list[WizardChatMessageResponse]
+    has_more: bool
+
+
 @router.post("/sessions", response_model=CreateSessionResponse)
 async def create_session(
     request: CreateSessionRequest,
@@ -244,6 +256,41 @@ async def wizard_chat(
             raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/{server_id}/chat", response_model=WizardChatHistoryResponse)
+async def get_wizard_chat_history(
+    server_id: UUID,
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    before_seq: int | None = Query(
+        None, description="Return messages older than this seq (next page)"
+    ),
+) -> WizardChatHistoryResponse:
+    """
+    Step 0: Page through the wizard chat history, newest page first.
+
+    Messages within a page are oldest first. Pass the first message's seq
+    as before_seq to fetch the previous page.
+    """
+    await require_org_access_to_server(server_id, request)
+
+    messages = await Provider.mcp_server_repo().get_chat_messages(
+        server_id, limit=limit + 1, before_seq=before_seq
+    )
+    has_more = len(messages) > limit
+    return WizardChatHistoryResponse(
+        messages=[
+            WizardChatMessageResponse(
+                seq=m.seq,
+                role=m.role,
+                content=m.content,
+                created_at=m.created_at.isoformat() if m.created_at else "",
+            )
+            for m in messages[-limit:]
+        ],
+        has_more=has_more,
+    )
+
+
 @router.post("/start", response_model=StartWizardResponse)
 async def start_wizard(
     request: StartWizardRequest,
@@ -275,15 +322,7 @@ async def start_wizard(
         if server:
             # ── Existing server (created via POST /sessions) ──
             # Enforce readiness gate: check that chat history contains READY_TO_START
-            chat_history: list[dict[str, str]] = (server.meta or {}).get(
-                "step_zero_chat_history", []
-            )
-            has_ready_marker = any(
-                service.is_ready_to_start(msg.get("content", ""))
-                for msg in chat_history
-                if msg.get("role") == "assistant"
-            )
-            if not has_ready_marker:
+            if not await service.is_spec_ready(server.id):
                 raise HTTPException(
                     status_code=400,
                     detail="The specification is not ready to proceed. Continue the conversation until the AI indicates readiness.",
@@ -293,17 +332,13 @@ async def start_wizard(
             description: str = request.description or server.description or ""
 
             # Update server with final description and technical details
-            update_payload: dict[str, Any] = {}
             if request.description:
-                update_payload["description"] = request.description
-            if request.technical_details:
-                updated_meta: dict[str, Any] = dict(server.meta or {})
-                updated_meta["technical_details"] = request.technical_details
-                update_payload["meta"] = updated_meta
-
-            if update_payload:
                 _ = await Provider.mcp_server_repo().update(
-                    server.id, MCPServerUpdate(**update_payload)
+                    server.id, MCPServerUpdate(description=request.description)
+                )
+            if request.technical_details:
+                _ = await Provider.mcp_server_repo().merge_meta(
+                    server.id, {"technical_details": request.technical_details}
                 )
 
             # Generate a descriptive name using LLM
@@ -0,0 +1,120 @@
+"""
+Benchmark access token sign/verify throughput per JWT algorithm.
+
+Generates a throwaway key per algorithm and signs/verifies a payload shaped
+like the tokens OAuthService issues. "keyring" rows use JWTKeyring with
+keys parsed once; the "pem" row reproduces the previous RS256 path that
+passed PEM strings to jwt.encode/jwt.decode on every call.
+
+Usage:
+    uv run python -m entrypoints.benchmarks.jwt_signing --iterations 500
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from typing import Any
+from uuid import uuid4
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from core.services.jwt_keyring import JWTKeyring, load_key
+
+
+def _pem_pair(private_key: Any) -> tuple[str, str]:
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+    return private_pem, public_pem
+
+
+def _generate(algorithm: str) -> tuple[str, str]:
+    if algorithm == "RS256":
+        return _pem_pair(rsa.generate_private_key(public_exponent=65537, key_size=2048))
+    if algorithm == "ES256":
+        return _pem_pair(ec.generate_private_key(ec.SECP256R1()))
+    return _pem_pair(ed25519.Ed25519PrivateKey.generate())
+
+
+def _payload(audience: str) -> dict[str, Any]:
+    now = int(time.time())
+    return {
+        "iss": "http://bench",
+        "sub": str(uuid4()),
+        "aud": audience,
+        "exp": now + 3600,
+        "iat": now,
+        "jti": uuid4().hex,
+        "client_id": "bench-client",
+        "scope": "mcp:access",
+    }
+
+
+def _rate(fn: Callable[[], Any], iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - started)
+
+
+def main(iterations: int) -> None:
+    audience = str(uuid4())
+    require = ["exp", "iat", "sub", "jti"]
+
+    print(f"{iterations} iterations")
+    print(f"{'algorithm':<16} {'sign/s':>10} {'verify/s':>10} {'token bytes':>12}")
+
+    private_pem, public_pem = _generate("RS256")
+    token = jwt.encode(_payload(audience), private_pem, algorithm="RS256")
+    sign_rate = _rate(
+        lambda: jwt.encode(_payload(audience), private_pem, algorithm="RS256"),
+        iterations,
+    )
+    verify_rate = _rate(
+        lambda: jwt.decode(
+            token,
+            public_pem,
+            algorithms=["RS256"],
+            audience=audience,
+            options={"require": require},
+        ),
+        iterations,
+    )
+    print(
+        f"{'RS256 (pem)':<16} {sign_rate:>10.0f} {verify_rate:>10.0f} {len(token):>12}"
+    )
+
+    for algorithm in ("RS256", "ES256", "EdDSA"):
+        private_pem, public_pem = _generate(algorithm)
+        keyring = JWTKeyring(load_key(algorithm, public_pem, private_pem), [])
+        token = keyring.sign(_payload(audience))
+        sign_rate = _rate(
+            lambda keyring=keyring: keyring.sign(_payload(audience)), iterations
+        )
+        verify_rate = _rate(
+            lambda keyring=keyring, token=token: keyring.decode(
+                token, audience=audience, require=require
+            ),
+            iterations,
+        )
+        label = f"{algorithm} (keyring)"
+        print(f"{label:<16} {sign_rate:>10.0f} {verify_rate:>10.0f} {len(token):>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    _ = parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    main(args.iterations)
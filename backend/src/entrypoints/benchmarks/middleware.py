@@ -0,0 +1,212 @@
+"""
+Benchmark the MCP middleware stack: BaseHTTPMiddleware vs pure ASGI.
+
+Drives both stacks in-process (no sockets) with the admin-key path of
+MCPAccessMiddleware, so no database is needed, and reports requests/sec
+for a small JSON response and time-to-first-byte for an SSE-style stream.
+The "base_http" stack reproduces the previous BaseHTTPMiddleware
+implementation of the same three layers.
+
+Usage:
+    uv run python -m entrypoints.benchmarks.middleware --requests 5000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any
+from uuid import UUID, uuid4
+
+from loguru import logger
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Mount, Route
+from starlette.types import ASGIApp, Message
+
+from core.services.request_context import request_customer_id, request_env_vars
+from entrypoints.api.middleware import (
+    MCPAccessMiddleware,
+    MCPEnvMiddleware,
+    MetaAuthGuardMiddleware,
+)
+from settings import settings
+
+
+class _BaseHTTPAccessMiddleware(BaseHTTPMiddleware):
+    """Admin-key path of the previous BaseHTTPMiddleware MCPAccessMiddleware."""
+
+    async def dispatch(self, request: Request, call_next: Any):
+        path = request.url.path
+        if not path.startswith("/mcp"):
+            return await call_next(request)
+        auth_raw = request.headers.get("Authorization", "")
+        server_id = UUID(path.strip("/").split("/")[1])
+        if auth_raw[7:] != settings.ADMIN_ROUTES_API_KEY:
+            return JSONResponse(status_code=403, content={"detail": str(server_id)})
+        return await call_next(request)
+
+
+class _BaseHTTPEnvMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware MCPEnvMiddleware."""
+
+    async def dispatch(self, request: Request, call_next: Any):
+        if not request.url.path.startswith("/mcp/"):
+            return await call_next(request)
+        ephemeral_env: dict[str, str] = {}
+        for header, value in request.headers.items():
+            if header.lower()[:6].replace("-", "_") == "x_env_":
+                ephemeral_env[header[6:].upper().replace("-", "_")] = value
+        token = request_env_vars.set(ephemeral_env)
+        try:
+            return await call_next(request)
+        finally:
+            request_env_vars.reset(token)
+
+
+class _BaseHTTPMetaGuardMiddleware(BaseHTTPMiddleware):
+    """The previous inline MetaAuthGuardMiddleware."""
+
+    async def dispatch(self, request: Request, call_next: Any):
+        if not getattr(request.state, "mcp_customer_id", None):
+            return JSONResponse(status_code=403, content={"detail": "no customer"})
+        return await call_next(request)
+
+
+async def _json_endpoint(request: Request) -> JSONResponse:
+    return JSONResponse({"env": request_env_vars.get(), "ok": True})
+
+
+async def _stream_endpoint(request: Request) -> StreamingResponse:
+    async def events():
+        for i in range(5):
+            yield f"event: message\ndata: {i}\n\n"
+            await asyncio.sleep(0.001)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+async def _meta_endpoint(request: Request) -> JSONResponse:
+    return JSONResponse({"customer_id": str(request_customer_id.get())})
+
+
+def build_app(stack: str) -> ASGIApp:
+    """Build a minimal app wrapped in the "asgi" or "base_http" stack."""
+    meta_app = Starlette(routes=[Route("/mcp", _meta_endpoint, methods=["POST"])])
+    app = Starlette(
+        routes=[
+            Mount("/mcp/meta", meta_app),
+            Route("/mcp/{server_id}/mcp", _json_endpoint, methods=["POST"]),
+            Route("/mcp/{server_id}/sse", _stream_endpoint),
+        ]
+    )
+    if stack == "asgi":
+        meta_app.add_middleware(MetaAuthGuardMiddleware)
+        app.add_middleware(MCPAccessMiddleware)
+        app.add_middleware(MCPEnvMiddleware)
+    else:
+        meta_app.add_middleware(_BaseHTTPMetaGuardMiddleware)
+        app.add_middleware(_BaseHTTPAccessMiddleware)
+        app.add_middleware(_BaseHTTPEnvMiddleware)
+    return app
+
+
+async def _request(app: ASGIApp, method: str, path: str) -> tuple[float, float]:
+    """Send one request; return (time to first body byte, total) in seconds."""
+    headers = [
+        (b"host", b"bench"),
+        (b"authorization", f"Bearer {settings.ADMIN_ROUTES_API_KEY}".encode()),
+        (b"accept", b"application/json, text/event-stream"),
+        (b"x-env-api-key", b"secret"),
+    ]
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+        "server": ("bench", 80),
+        "client": ("bench", 1234),
+    }
+    body_sent = False
+    response_done = asyncio.Event()
+
+    async def receive() -> Message:
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": b"{}", "more_body": False}
+        _ = await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    started = time.perf_counter()
+    first_byte: float | None = None
+
+    async def send(message: Message) -> None:
+        nonlocal first_byte
+        if message["type"] == "http.response.body":
+            if first_byte is None and message.get("body"):
+                first_byte = time.perf_counter()
+            if not message.get("more_body", False):
+                response_done.set()
+
+    await app(scope, receive, send)
+    finished = time.perf_counter()
+    return (first_byte or finished) - started, finished - started
+
+
+async def _run(
+    app: ASGIApp, method: str, path: str, requests: int, concurrency: int
+) -> tuple[float, list[float]]:
+    """Return (requests/sec, per-request TTFB samples)."""
+    ttfbs: list[float] = []
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            ttfb, _ = await _request(app, method, path)
+            ttfbs.append(ttfb)
+
+    started = time.perf_counter()
+    _ = await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return requests / elapsed, ttfbs
+
+
+async def main(requests: int, concurrency: int) -> None:
+    # Measure middleware overhead, not log sinks
+    logger.remove()
+    server_id = uuid4()
+
+    print(f"{requests} requests, concurrency {concurrency}")
+    print(f"{'stack':<10} {'json req/s':>12} {'sse req/s':>12} {'sse ttfb p50':>14}")
+    for stack in ("base_http", "asgi"):
+        app = build_app(stack)
+        # Warm up route compilation and middleware stack construction
+        _ = await _run(app, "POST", f"/mcp/{server_id}/mcp", 50, 1)
+
+        json_rps, _ = await _run(
+            app, "POST", f"/mcp/{server_id}/mcp", requests, concurrency
+        )
+        sse_rps, ttfbs = await _run(
+            app, "GET", f"/mcp/{server_id}/sse", requests // 5, concurrency
+        )
+        p50_us = statistics.median(ttfbs) * 1_000_000
+        print(f"{stack:<10} {json_rps:>12.0f} {sse_rps:>12.0f} {p50_us:>12.0f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    _ = parser.add_argument("--requests", type=int, default=5000)
+    _ = parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
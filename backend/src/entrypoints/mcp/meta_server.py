@@ -155,15 +155,7 @@ async def wizard_start(
     service = _get_wizard_service()
 
     # Enforce readiness gate
-    chat_history: list[dict[str, str]] = (server.meta or {}).get(
-        "step_zero_chat_history", []
-    )
-    has_ready_marker = any(
-        service.is_ready_to_start(msg.get("content", ""))
-        for msg in chat_history
-        if msg.get("role") == "assistant"
-    )
-    if not has_ready_marker:
+    if not await service.is_spec_ready(sid):
         raise ValueError(
             "The specification is not ready to proceed. Continue the conversation until the AI indicates readiness."
         )
@@ -171,16 +163,13 @@ async def wizard_start(
     final_description: str = description or server.description or ""
 
     # Apply any overrides
-    update_payload: dict[str, Any] = {}
     if description:
-        update_payload["description"] = description
-    if technical_details:
-        updated_meta: dict[str, Any] = dict(server.meta or {})
-        updated_meta["technical_details"] = technical_details
-        update_payload["meta"] = updated_meta
-    if update_payload:
         _ = await Provider.mcp_server_repo().update(
-            server.id, MCPServerUpdate(**update_payload)
+            server.id, MCPServerUpdate(description=description)
+        )
+    if technical_details:
+        _ = await Provider.mcp_server_repo().merge_meta(
+            server.id, {"technical_details": technical_details}
         )
 
     # Generate a descriptive name using LLM
@@ -2,29 +2,474 @@
 Shared MCP Runtime for Free Tier Users.
 
 Uses the simple register_new_customer_app pattern to mount
-customer MCP servers dynamically.
+customer MCP servers dynamically. All servers are served through one
+MCPServerDispatcher mounted at /mcp/{server_id}. With
+settings.MCP_LAZY_ACTIVATION, servers are started on first request and
+stopped when idle by a LazyServerPool.
+
+Mount changes made by one runtime process are published as RuntimeEvents
+and applied by every other process subscribed through start_runtime_sync,
+so all workers serve the same set of servers. With sharding enabled
+(core.services.sharding) a node only mounts the servers it owns.
 """
 
+import asyncio
+import time
 from collections.abc import Sequence
 from contextlib import AsyncExitStack
-from uuid import UUID
-
-from core.services.tool_loader import compile_server_tools
+from dataclasses import dataclass, field
+from uuid import UUID, uuid4
+
+import mcp.types as mt
+from core.services.metrics import (
+    mcp_server_last_compile_seconds,
+    mcp_server_requests_total,
+    mcp_tool_call_duration_seconds,
+    mcp_tool_calls_total,
+)
+from core.services.runtime_events import (
+    RuntimeEvent,
+    RuntimeEventBus,
+    RuntimeEventKind,
+    get_runtime_event_bus,
+)
+from core.services.sharding import owns_server
+from core.services.tool_db import get_tool_db_pools
+from core.services.tool_loader import (
+    compile_server_tools,
+    compile_tools_for_server,
+    get_tool_loader,
+)
 from fastapi import FastAPI
 from fastmcp import FastMCP
-from fastmcp.tools.tool import FunctionTool, Tool
+from fastmcp.server.http import StarletteWithLifespan
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from fastmcp.tools.tool import FunctionTool, Tool, ToolResult
 from infrastructure.models.deployment import DeploymentStatus, DeploymentTarget
+from infrastructure.repositories.mcp_server import ServerStartupData
 from infrastructure.repositories.repo_provider import Provider
 from loguru import logger
+from settings import settings
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+MCP_MOUNT_PATH = "/mcp/{server_id}"
+
+
+@dataclass(eq=False)
+class MCPServerHandle:
+    """
+    Lifecycle handle for one running sub-app.
+
+    The sub-app's lifespan is entered and exited by a dedicated host task:
+    anyio cancel scopes must be exited by the task that entered them, and a
+    server may be replaced or stopped from any request task. Retiring a
+    handle lets its in-flight requests drain before the lifespan closes.
+    """
+
+    server_id: UUID
+    sub_app: StarletteWithLifespan
+    task: "asyncio.Task[None] | None" = None
+    in_flight: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    retiring: asyncio.Event = field(default_factory=asyncio.Event)
+    drained: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class MCPServerDispatcher:
+    """
+    Single ASGI app that routes /mcp/{server_id}/* to per-server sub-apps.
+
+    Mounted once at MCP_MOUNT_PATH instead of one Starlette Mount per server,
+    so routing is a dict lookup by server UUID and a remount is an atomic
+    swap of the dict entry. Starlette's Mount has already parsed server_id
+    into path_params and moved the prefix into root_path, so the sub-app
+    sees exactly the scope it would get from a dedicated mount.
+
+    The dispatcher also owns each sub-app's lifespan through an
+    MCPServerHandle. A replaced or removed handle is retired: its lifespan
+    closes once in-flight requests finish, or after drain_timeout seconds
+    for long-lived streams. When a server's last lifespan closes, its tools'
+    pooled http_client and database pools are closed and its compiled tools
+    and namespace are dropped from the tool loader. live_lifespans
+    counts lifespans still open, including retired ones that are draining.
+    """
+
+    def __init__(self, drain_timeout: float | None = None) -> None:
+        self._handles: dict[UUID, MCPServerHandle] = {}
+        self._live: set[MCPServerHandle] = set()
+        self._stack: AsyncExitStack | None = None
+        self.drain_timeout = (
+            drain_timeout
+            if drain_timeout is not None
+            else settings.MCP_DRAIN_TIMEOUT_SECONDS
+        )
+        # Set in lazy mode; unknown servers are then started on first request.
+        self.lazy_pool: LazyServerPool | None = None
+
+    def __contains__(self, server_id: object) -> bool:
+        return server_id in self._handles
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+    @property
+    def live_lifespans(self) -> int:
+        """Gauge of sub-app lifespans currently open (serving or draining)."""
+        return len(self._live)
+
+    def get(self, server_id: UUID) -> ASGIApp | None:
+        handle = self._handles.get(server_id)
+        return handle.sub_app if handle is not None else None
+
+    def get_handle(self, server_id: UUID) -> MCPServerHandle | None:
+        return self._handles.get(server_id)
+
+    def handles(self) -> list[MCPServerHandle]:
+        return list(self._handles.values())
+
+    async def start(
+        self, app: FastAPI, server_id: UUID, sub_app: StarletteWithLifespan
+    ) -> MCPServerHandle:
+        """
+        Start a sub-app's lifespan and publish it for server_id.
+
+        Any previous handle for the server is swapped out atomically once the
+        new lifespan is running, then retired.
+        """
+        handle = MCPServerHandle(server_id=server_id, sub_app=sub_app)
+        ready: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._live.add(handle)
+        handle.task = asyncio.create_task(self._host(app, handle, ready))
+        await ready
+
+        previous = self._handles.get(server_id)
+        self._handles[server_id] = handle
+        if previous is not None:
+            self.retire(previous)
+        return handle
+
+    def remove(self, server_id: UUID) -> MCPServerHandle | None:
+        """Stop routing to a server and retire its handle, if any."""
+        handle = self._handles.pop(server_id, None)
+        if handle is not None:
+            self.retire(handle)
+        return handle
+
+    def retire(self, handle: MCPServerHandle, force: bool = False) -> None:
+        """Close a handle's lifespan once its in-flight requests drain."""
+        if self._handles.get(handle.server_id) is handle:
+            del self._handles[handle.server_id]
+        if handle.in_flight == 0 or force:
+            handle.drained.set()
+        if not handle.retiring.is_set():
+            handle.retiring.set()
+            logger.info(
+                f"Retiring MCP app for /mcp/{handle.server_id} "
+                + f"(in_flight={handle.in_flight}, "
+                + f"live_lifespans={len(self._live)})"
+            )
+
+    def close_with(self, stack: AsyncExitStack) -> None:
+        """Close every lifespan when the given (app lifespan) stack exits."""
+        if stack is not self._stack:
+            self._stack = stack
+            _ = stack.push_async_callback(self.aclose)
+
+    async def aclose(self) -> None:
+        """Retire every handle without waiting for drains and await shutdown."""
+        if self.lazy_pool is not None:
+            await self.lazy_pool.aclose()
+        for handle in list(self._live):
+            self.retire(handle, force=True)
+        tasks = [h.task for h in list(self._live) if h.task is not None]
+        if tasks:
+            _ = await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        raw_server_id = scope.get("path_params", {}).get("server_id")
+        try:
+            server_id = UUID(str(raw_server_id))
+        except ValueError:
+            await self._not_found(scope, receive, send)
+            return
+
+        handle = self._handles.get(server_id)
+        if handle is None and self.lazy_pool is not None:
+            handle = await self.lazy_pool.activate(server_id)
+        if handle is None:
+            await self._not_found(scope, receive, send)
+            return
+
+        mcp_server_requests_total.inc(str(server_id))
+        handle.in_flight += 1
+        handle.last_used = time.monotonic()
+        try:
+            await handle.sub_app(scope, receive, send)
+        finally:
+            handle.in_flight -= 1
+            handle.last_used = time.monotonic()
+            if handle.in_flight == 0 and handle.retiring.is_set():
+                handle.drained.set()
+
+    async def _host(
+        self,
+        app: FastAPI,
+        handle: MCPServerHandle,
+        ready: "asyncio.Future[None]",
+    ) -> None:
+        try:
+            async with handle.sub_app.lifespan(app):
+                ready.set_result(None)
+                _ = await handle.retiring.wait()
+                try:
+                    _ = await asyncio.wait_for(
+                        handle.drained.wait(), self.drain_timeout
+                    )
+                except TimeoutError:
+                    logger.warning(
+                        f"MCP app for /mcp/{handle.server_id} still had "
+                        + f"{handle.in_flight} requests after "
+                        + f"{self.drain_timeout:.0f}s - closing anyway"
+                    )
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+                return
+            logger.error(f"MCP app for /mcp/{handle.server_id} lifespan failed: {e}")
+        finally:
+            self._live.discard(handle)
+            if self._handles.get(handle.server_id) is handle:
+                del self._handles[handle.server_id]
+            logger.debug(
+                f"Closed MCP app lifespan for /mcp/{handle.server_id} "
+                + f"(live_lifespans={len(self._live)})"
+            )
+            # Last lifespan of the server (unmounted, evicted or shut down,
+            # not replaced by a remount): drop its pooled HTTP and DB
+            # connections, then its compiled tools and namespace, so memory
+            # follows resident servers rather than every server ever started
+            if not any(h.server_id == handle.server_id for h in self._live):
+                loader = get_tool_loader()
+                await loader.close_http_client(handle.server_id)
+                await get_tool_db_pools().close_server(handle.server_id)
+                loader.invalidate_server_tools(handle.server_id)
+
+    @staticmethod
+    async def _not_found(scope: Scope, receive: Receive, send: Send) -> None:
+        response = JSONResponse(status_code=404, content={"detail": "Not Found"})
+        await response(scope, receive, send)
+
+
+def get_mcp_dispatcher(app: FastAPI) -> MCPServerDispatcher:
+    """Return the app's MCP dispatcher, mounting it on first use."""
+    dispatcher: MCPServerDispatcher | None = getattr(app.state, "mcp_dispatcher", None)
+    if dispatcher is None:
+        dispatcher = MCPServerDispatcher()
+        app.mount(MCP_MOUNT_PATH, dispatcher)
+        app.state.mcp_dispatcher = dispatcher
+    return dispatcher
+
+
+class ToolCallMetricsMiddleware(Middleware):
+    """Record per-tool call counts and latency for one shared server."""
+
+    def __init__(self, server_id: UUID) -> None:
+        self.server_id = str(server_id)
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[mt.CallToolRequestParams],
+        call_next: CallNext[mt.CallToolRequestParams, ToolResult],
+    ) -> ToolResult:
+        tool = context.message.name
+        started = time.perf_counter()
+        status = "error"
+        try:
+            result = await call_next(context)
+            status = "ok"
+            return result
+        finally:
+            mcp_tool_call_duration_seconds.observe(
+                time.perf_counter() - started, self.server_id, tool
+            )
+            mcp_tool_calls_total.inc(self.server_id, tool, status)
 
 
 def build_mcp_server(server_id: UUID, tools: Sequence[Tool | FunctionTool]) -> FastMCP:
     return FastMCP(
         f"MCPServer({server_id})",
         tools=tools,
+        middleware=[ToolCallMetricsMiddleware(server_id)],
     )
 
 
+class LazyServerPool:
+    """
+    On-demand activation of shared MCP servers.
+
+    Holds the routing table of active shared deployments and compiles and
+    starts a server the first time a request for it arrives; the running
+    sub-apps themselves are MCPServerHandles owned by the dispatcher.
+
+    Servers idle for ``idle_ttl`` seconds are stopped by a background reaper,
+    and at most ``max_resident`` run at once; when the cap is exceeded the
+    least recently used idle servers are stopped first. A server with
+    requests in flight (including open SSE streams) is never evicted.
+    """
+
+    def __init__(
+        self,
+        app: FastAPI,
+        dispatcher: MCPServerDispatcher,
+        server_ids: Sequence[UUID],
+        idle_ttl: float,
+        max_resident: int,
+    ) -> None:
+        self._app = app
+        self._dispatcher = dispatcher
+        self._routable: set[UUID] = set(server_ids)
+        self._locks: dict[UUID, asyncio.Lock] = {}
+        self._reaper: asyncio.Task[None] | None = None
+        self.idle_ttl = idle_ttl
+        self.max_resident = max(1, max_resident)
+
+    def __contains__(self, server_id: object) -> bool:
+        return server_id in self._routable
+
+    @property
+    def routable_count(self) -> int:
+        return len(self._routable)
+
+    @property
+    def resident_count(self) -> int:
+        return len(self._dispatcher)
+
+    def is_resident(self, server_id: UUID) -> bool:
+        return server_id in self._dispatcher
+
+    def add_route(self, server_id: UUID) -> None:
+        """Make a server routable; it is started on its next request."""
+        self._routable.add(server_id)
+
+    def forget(self, server_id: UUID) -> bool:
+        """Remove a server from the routing table and stop it if running."""
+        known = server_id in self._routable
+        self._routable.discard(server_id)
+        _ = self._locks.pop(server_id, None)
+        return self._dispatcher.remove(server_id) is not None or known
+
+    def started(self, server_id: UUID) -> None:
+        """Record a server started outside activate() (deploy or remount)."""
+        self._routable.add(server_id)
+        self._enforce_cap(keep=server_id)
+
+    async def activate(self, server_id: UUID) -> MCPServerHandle | None:
+        """Compile and start a routable server, or return it if already running."""
+        if server_id not in self._routable:
+            return None
+
+        lock = self._locks.setdefault(server_id, asyncio.Lock())
+        async with lock:
+            handle = self._dispatcher.get_handle(server_id)
+            if handle is not None:
+                return handle
+
+            started_at = time.perf_counter()
+            deployment_repo = Provider.deployment_repo()
+            server_data = await deployment_repo.get_active_shared_server(server_id)
+            if server_data is None:
+                logger.warning(f"Server {server_id} is no longer deployed - unrouting")
+                self._routable.discard(server_id)
+                return None
+
+            env_vars = {
+                var.name: var.value
+                for var in server_data.environment_variables
+                if var.value is not None
+            }
+            try:
+                compiled_tools = await asyncio.to_thread(
+                    compile_tools_for_server,
+                    server=server_data,
+                    tools=server_data.tools,
+                    env_vars=env_vars,
+                )
+                if not compiled_tools:
+                    logger.warning(f"Server {server_id} has no valid tools, skipping")
+                    return None
+                mcp = build_mcp_server(server_id, compiled_tools)
+                handle = await self._dispatcher.start(
+                    self._app, server_id, mcp.http_app()
+                )
+            except Exception as e:
+                logger.error(f"Failed to activate server {server_id}: {e}")
+                return None
+
+            self._enforce_cap(keep=server_id)
+            logger.info(
+                f"Activated MCP server {server_id} on demand with "
+                + f"{len(compiled_tools)} tools in "
+                + f"{(time.perf_counter() - started_at) * 1000:.0f}ms "
+                + f"(resident={len(self._dispatcher)})"
+            )
+            return handle
+
+    def evict_idle(self, now: float | None = None) -> list[UUID]:
+        """Stop every resident server idle for at least idle_ttl seconds."""
+        now = time.monotonic() if now is None else now
+        expired = [
+            handle.server_id
+            for handle in self._dispatcher.handles()
+            if handle.in_flight == 0 and now - handle.last_used >= self.idle_ttl
+        ]
+        for server_id in expired:
+            self._evict(server_id, reason="idle")
+        return expired
+
+    def start_reaper(self) -> None:
+        if self._reaper is None:
+            self._reaper = asyncio.create_task(self._reap_idle())
+
+    async def aclose(self) -> None:
+        """Stop the reaper; resident servers are closed by the dispatcher."""
+        if self._reaper is not None:
+            _ = self._reaper.cancel()
+            _ = await asyncio.gather(self._reaper, return_exceptions=True)
+            self._reaper = None
+
+    async def _reap_idle(self) -> None:
+        interval = max(1.0, min(self.idle_ttl / 2, 60.0))
+        while True:
+            await asyncio.sleep(interval)
+            _ = self.evict_idle()
+
+    def _enforce_cap(self, keep: UUID) -> None:
+        overflow = len(self._dispatcher) - self.max_resident
+        if overflow <= 0:
+            return
+        idle = sorted(
+            (
+                h
+                for h in self._dispatcher.handles()
+                if h.server_id != keep and h.in_flight == 0
+            ),
+            key=lambda h: h.last_used,
+        )
+        for handle in idle[:overflow]:
+            self._evict(handle.server_id, reason="lru")
+        if overflow > len(idle):
+            logger.warning(
+                f"{len(self._dispatcher)} MCP servers resident (cap "
+                + f"{self.max_resident}); all others have requests in flight"
+            )
+
+    def _evict(self, server_id: UUID, reason: str) -> None:
+        if self._dispatcher.remove(server_id) is not None:
+            logger.info(f"Stopped MCP server {server_id} ({reason})")
+
+
 async def register_new_customer_app(
     app: FastAPI,
     server_id: UUID,
@@ -33,37 +478,46 @@ async def register_new_customer_app(
 ) -> FastMCP:
     """
     Register a new customer MCP app and activate its lifespan immediately.
+
+    If the server is already registered, the new sub-app replaces it
+    atomically once its lifespan is running; requests in between keep
+    going to the old one, whose lifespan closes after they drain.
+    All lifespans are closed when ``stack`` exits.
+
+    On a sharded runtime a server owned by another node is built but not
+    mounted; its requests are proxied to the owner, which mounts it from
+    the runtime event published by the caller.
     """
     mcp = build_mcp_server(server_id, tools)
+    if not owns_server(server_id):
+        logger.debug(f"Server {server_id} belongs to another shard - not mounting")
+        return mcp
 
     # 1. Create the sub-app instance ONCE
     mcp_sub_app = mcp.http_app()
 
-    # 2. Mount it
-    app.mount(
-        f"/mcp/{server_id}",
-        mcp_sub_app,
+    # 2. Start its lifespan (FastMCP TaskGroup/SessionManager) in a host task
+    # and publish it in the dispatcher. Per-server OAuth routes are served by
+    # the single mcp_oauth_router included at /mcp/{server_id} in main.py.
+    dispatcher = get_mcp_dispatcher(app)
+    dispatcher.close_with(stack)
+    _ = await dispatcher.start(app, server_id, mcp_sub_app)
+    if dispatcher.lazy_pool is not None:
+        dispatcher.lazy_pool.started(server_id)
+
+    logger.info(
+        f"Registered and started MCP app at /mcp/{server_id} "
+        + f"(live_lifespans={dispatcher.live_lifespans})"
     )
-
-    # 2. Mount oauth routes (lazy import to avoid circular import)
-    from entrypoints.api.routes.oauth import mcp_oauth_router
-
-    app.include_router(mcp_oauth_router, prefix=f"/mcp/{server_id}")
-
-    # 3. Manually trigger its lifespan using the stack
-    # This initializes the FastMCP TaskGroup/SessionManager
-    _ = await stack.enter_async_context(mcp_sub_app.lifespan(app))
-
-    logger.info(f"Registered and started MCP app at /mcp/{server_id}")
     return mcp
 
 
 def unregister_mcp_app(app: FastAPI, server_id: UUID) -> bool:
     """
-    Unregister/unmount an MCP app from FastAPI.
+    Unregister an MCP app so /mcp/{server_id} stops being served.
 
-    Note: This only removes the route from FastAPI. The lifespan context
-    will be cleaned up when the app shuts down via the AsyncExitStack.
+    Routing stops immediately; the sub-app's lifespan is closed once its
+    in-flight requests drain (see MCPServerDispatcher.retire).
 
     Args:
         app: FastAPI application instance
@@ -72,19 +526,26 @@ def unregister_mcp_app(app: FastAPI, server_id: UUID) -> bool:
     Returns:
         True if the app was found and unmounted, False otherwise
     """
-    mount_path = f"/mcp/{server_id}"
+    if _unmount(app, server_id):
+        return True
 
-    # Find and remove the mounted route
-    for i, route in enumerate(app.routes):
-        if hasattr(route, "path") and getattr(route, "path", None) == mount_path:
-            _ = app.routes.pop(i)
-            logger.info(f"Unmounted MCP app from {mount_path}")
-            return True
-
-    logger.warning(f"No MCP app found at {mount_path} to unmount")
+    logger.warning(f"No MCP app found at /mcp/{server_id} to unmount")
     return False
 
 
+def _unmount(app: FastAPI, server_id: UUID) -> bool:
+    dispatcher = get_mcp_dispatcher(app)
+    if dispatcher.lazy_pool is not None:
+        found = dispatcher.lazy_pool.forget(server_id)
+    else:
+        found = dispatcher.remove(server_id) is not None
+
+    if found:
+        mcp_server_last_compile_seconds.remove(str(server_id))
+        logger.info(f"Unmounted MCP app from /mcp/{server_id}")
+    return found
+
+
 async def remount_mcp_server(
     app: FastAPI,
     server_id: UUID,
@@ -96,9 +557,28 @@ async def remount_mcp_server(
     Called after tool descriptions or server metadata are updated so that
     the live runtime immediately reflects the changes.
 
+    Other runtime processes are told to remount it as well. On a sharded
+    runtime only the owning node rebuilds it.
+
     Returns:
-        True if the server was remounted, False if it is not deployed.
+        True if the server was remounted (or handed to its owning node),
+        False if it is not deployed.
     """
+    if not owns_server(server_id):
+        await publish_runtime_event(app, server_id, RuntimeEventKind.REMOUNTED)
+        return True
+
+    remounted = await _remount_from_db(app, server_id, stack)
+    if remounted:
+        await publish_runtime_event(app, server_id, RuntimeEventKind.REMOUNTED)
+    return remounted
+
+
+async def _remount_from_db(
+    app: FastAPI,
+    server_id: UUID,
+    stack: AsyncExitStack,
+) -> bool:
 
     server_repo = Provider.mcp_server_repo()
     tool_repo = Provider.mcp_tool_repo()
@@ -115,6 +595,14 @@ async def remount_mcp_server(
         logger.debug(f"Server {server_id} is on dedicated target - skipping remount")
         return False
 
+    # A lazy server that is not running picks up the changes on its next
+    # request; compiling it now would only start it early.
+    pool = get_mcp_dispatcher(app).lazy_pool
+    if pool is not None and not pool.is_resident(server_id):
+        pool.add_route(server_id)
+        logger.info(f"Server {server_id} is not resident - reloads on next request")
+        return True
+
     # Fetch server and its updated tools from DB
     server = await server_repo.get_by_uuid(server_id)
     if not server:
@@ -134,63 +622,248 @@ async def remount_mcp_server(
         )
         return False
 
-    # Unmount the current app and register a fresh one with updated tools
-    _ = unregister_mcp_app(app, server_id)
+    # Register a fresh app with updated tools; it replaces the current one
+    # in the dispatcher without a window where the server returns 404.
     _ = await register_new_customer_app(app, server_id, compiled_tools, stack=stack)
 
     logger.info(f"Remounted MCP server {server_id} with {len(compiled_tools)} tools")
     return True
 
 
+async def publish_runtime_event(
+    app: FastAPI, server_id: UUID, kind: RuntimeEventKind
+) -> None:
+    """
+    Tell the other runtime processes about a mount change made here.
+
+    Call it after the change is committed to the DB, since the receivers
+    rebuild the server from there. Best-effort: a failure is logged, and
+    the other processes pick the change up on their next restart.
+    """
+    bus: RuntimeEventBus | None = getattr(app.state, "runtime_events", None)
+    if bus is None:
+        return
+    try:
+        _ = await bus.publish(RuntimeEvent(server_id, kind, app.state.runtime_origin))
+    except Exception as e:
+        logger.error(
+            f"Failed to publish {kind.value} event for server {server_id}: {e}"
+        )
+
+
+async def apply_runtime_event(
+    app: FastAPI, stack: AsyncExitStack, event: RuntimeEvent
+) -> None:
+    """Apply a mount change published by another runtime process."""
+    if event.kind == RuntimeEventKind.UNMOUNTED:
+        _ = _unmount(app, event.server_id)
+        return
+    if not owns_server(event.server_id):
+        return
+    if await _remount_from_db(app, event.server_id, stack):
+        logger.info(
+            f"Applied {event.kind.value} event #{event.seq} for server {event.server_id}"
+        )
+
+
+async def start_runtime_sync(
+    app: FastAPI,
+    stack: AsyncExitStack,
+    bus: RuntimeEventBus | None = None,
+) -> RuntimeEventBus:
+    """
+    Subscribe this app to mount changes made by other runtime processes.
+
+    Call it before loading servers at startup: the bus records its position
+    first, so changes made while the servers load are replayed afterwards.
+    The subscription stops when the stack exits, before any server closes.
+    """
+    bus = bus if bus is not None else get_runtime_event_bus()
+    origin = uuid4().hex
+    app.state.runtime_events = bus
+    app.state.runtime_origin = origin
+
+    async def _apply(event: RuntimeEvent) -> None:
+        if event.origin != origin:
+            await apply_runtime_event(app, stack, event)
+
+    bus.subscribe(_apply)
+    get_mcp_dispatcher(app).close_with(stack)
+    _ = stack.push_async_callback(bus.aclose)
+    try:
+        _ = await bus.catch_up()
+    except Exception as e:
+        # The listener records its position once the DB is reachable
+        logger.error(f"Failed to read the runtime event position: {e}")
+    bus.start()
+    return bus
+
+
+@dataclass
+class ServerStartupTiming:
+    """Per-server timings collected by load_and_register_all_mcp_servers."""
+
+    server_id: UUID
+    tools: int = 0
+    compile_ms: float = 0.0
+    register_ms: float = 0.0
+    registered: bool = False
+    error: str | None = None
+
+
 async def load_and_register_all_mcp_servers(
     app: FastAPI,
     stack: AsyncExitStack,
+    concurrency: int | None = None,
 ) -> dict[UUID, FastMCP]:
     """
     Load all active shared deployments from DB and register them.
 
     Called during FastAPI startup to restore all previously activated servers.
 
+    Tool compilation (AST validation + exec) is CPU-bound and runs in worker
+    threads, at most ``concurrency`` servers at a time. Registration stays on
+    the calling task because each sub-app lifespan binds an anyio cancel scope
+    to the task that enters it, and the stack exits them on this task at
+    shutdown. Servers are registered as soon as their compile finishes, so
+    registration of early servers overlaps compilation of the rest.
+
+    Per-server timings are logged and stored on ``app.state.mcp_startup_report``.
+
+    With settings.MCP_LAZY_ACTIVATION nothing is compiled here: only the
+    routing table is loaded (see load_lazy_routing_table) and an empty dict
+    is returned.
+
     Args:
         app: FastAPI application instance
+        stack: Exit stack that owns sub-app lifespans
+        concurrency: Max servers compiled at once; defaults to
+            settings.MCP_STARTUP_CONCURRENCY
 
     Returns:
         Dictionary mapping server_id to registered FastMCP instances
     """
+    if settings.MCP_LAZY_ACTIVATION:
+        _ = await load_lazy_routing_table(app, stack)
+        return {}
+
     deployment_repo = Provider.deployment_repo()
+    limit = max(1, concurrency or settings.MCP_STARTUP_CONCURRENCY)
+    started_at = time.perf_counter()
 
     # Single batch load: deployments → servers → tools + env_vars (4 queries total)
     servers = await deployment_repo.get_active_shared_servers()
+    owned = [s for s in servers if owns_server(s.id)]
+    if len(owned) != len(servers):
+        logger.info(f"Shard owns {len(owned)} of {len(servers)} shared servers")
+        servers = owned
     registered_servers: dict[UUID, FastMCP] = {}
-
-    for server_data in servers:
+    report: list[ServerStartupTiming] = []
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _compile(
+        server_data: ServerStartupData,
+    ) -> tuple[ServerStartupTiming, list[FunctionTool]]:
+        timing = ServerStartupTiming(server_id=server_data.id)
+        env_vars = {
+            var.name: var.value
+            for var in server_data.environment_variables
+            if var.value is not None
+        }
+        async with semaphore:
+            compile_started = time.perf_counter()
+            try:
+                compiled_tools = await asyncio.to_thread(
+                    compile_tools_for_server,
+                    server=server_data,
+                    tools=server_data.tools,
+                    env_vars=env_vars,
+                )
+            except Exception as e:
+                timing.error = str(e)
+                compiled_tools = []
+            timing.compile_ms = (time.perf_counter() - compile_started) * 1000
+        timing.tools = len(compiled_tools)
+        return timing, compiled_tools
+
+    for next_done in asyncio.as_completed([_compile(s) for s in servers]):
+        timing, compiled_tools = await next_done
+        report.append(timing)
+        if timing.error is not None:
+            logger.error(f"Failed to compile server {timing.server_id}: {timing.error}")
+            continue
+        if not compiled_tools:
+            logger.warning(f"Server {timing.server_id} has no valid tools, skipping")
+            continue
+
+        register_started = time.perf_counter()
         try:
-            env_vars = {
-                var.name: var.value
-                for var in server_data.environment_variables
-                if var.value is not None
-            }
-            compiled_tools = await compile_server_tools(
-                server=server_data,
-                tools=server_data.tools,
-                env_vars=env_vars,
+            mcp = await register_new_customer_app(
+                app,
+                timing.server_id,
+                compiled_tools,
+                stack,
             )
+            registered_servers[timing.server_id] = mcp
+            timing.registered = True
+        except Exception as e:
+            timing.error = str(e)
+            logger.error(f"Failed to register server {timing.server_id}: {e}")
+        timing.register_ms = (time.perf_counter() - register_started) * 1000
+
+    app.state.mcp_startup_report = report
+    for timing in sorted(report, key=lambda t: t.compile_ms, reverse=True):
+        logger.info(
+            "MCP_STARTUP: server={sid} tools={tools} compile_ms={c:.1f} "
+            + "register_ms={r:.1f} registered={ok}",
+            sid=str(timing.server_id),
+            tools=timing.tools,
+            c=timing.compile_ms,
+            r=timing.register_ms,
+            ok=timing.registered,
+        )
+    logger.info(
+        f"Startup complete: registered {len(registered_servers)} MCP servers "
+        + f"in {(time.perf_counter() - started_at) * 1000:.0f}ms "
+        + f"(concurrency={limit})"
+    )
+    return registered_servers
 
-            if compiled_tools:
-                mcp = await register_new_customer_app(
-                    app,
-                    server_data.id,
-                    compiled_tools,
-                    stack,
-                )
-                registered_servers[server_data.id] = mcp
-            else:
-                logger.warning(
-                    f"Server {server_data.id} has no valid tools, skipping"
-                )
 
-        except Exception as e:
-            logger.error(f"Failed to register server {server_data.id}: {e}")
+async def load_lazy_routing_table(
+    app: FastAPI,
+    stack: AsyncExitStack,
+    idle_ttl: float | None = None,
+    max_resident: int | None = None,
+) -> LazyServerPool:
+    """
+    Install a LazyServerPool holding only the ids of active shared deployments.
 
-    logger.info(f"Startup complete: registered {len(registered_servers)} MCP servers")
-    return registered_servers
+    Servers are compiled and started on their first request. The pool's
+    reaper and every running server are stopped when the stack exits.
+    """
+    started_at = time.perf_counter()
+    server_ids = [
+        server_id
+        for server_id in await Provider.deployment_repo().get_active_shared_server_ids()
+        if owns_server(server_id)
+    ]
+
+    dispatcher = get_mcp_dispatcher(app)
+    pool = LazyServerPool(
+        app,
+        dispatcher,
+        server_ids,
+        idle_ttl=idle_ttl if idle_ttl is not None else settings.MCP_IDLE_TTL_SECONDS,
+        max_resident=max_resident or settings.MCP_MAX_RESIDENT_SERVERS,
+    )
+    dispatcher.lazy_pool = pool
+    dispatcher.close_with(stack)
+    pool.start_reaper()
+
+    logger.info(
+        f"Startup complete: {len(server_ids)} MCP servers routable on demand "
+        + f"in {(time.perf_counter() - started_at) * 1000:.0f}ms "
+        + f"(idle_ttl={pool.idle_ttl:.0f}s, max_resident={pool.max_resident})"
+    )
+    return pool
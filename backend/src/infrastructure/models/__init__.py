@@ -2,11 +2,13 @@ from infrastructure.models.customer import Customer as Customer
 from infrastructure.models.customer import StaticAPIKey as StaticAPIKey
 from infrastructure.models.deployment import Deployment as Deployment
 from infrastructure.models.deployment import DeploymentArtifact as DeploymentArtifact
+from infrastructure.models.deployment import DeploymentEvent as DeploymentEvent
 from infrastructure.models.deployment import DeploymentStatus as DeploymentStatus
 from infrastructure.models.deployment import DeploymentTarget as DeploymentTarget
 from infrastructure.models.mcp_server import MCPPrompt as MCPPrompt
 from infrastructure.models.mcp_server import MCPServer as MCPServer
 from infrastructure.models.mcp_server import MCPTool as MCPTool
+from infrastructure.models.mcp_server import WizardChatMessage as WizardChatMessage
 from infrastructure.models.oauth import OAuthAccessToken as OAuthAccessToken
 from infrastructure.models.oauth import OAuthAuthorizationCode as OAuthAuthorizationCode
 from infrastructure.models.oauth import OAuthClient as OAuthClient
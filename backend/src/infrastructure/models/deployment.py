@@ -5,7 +5,7 @@ from enum import Enum
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Identity, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -100,3 +100,26 @@ class DeploymentArtifact(CustomBase):
 
     # Relationship
     deployment: Mapped["Deployment"] = relationship(back_populates="artifact")
+
+
+class DeploymentEvent(CustomBase):
+    """
+    Append-only log of shared runtime mount changes (mounted/remounted/unmounted).
+
+    Every runtime process applies the events after the last seq it saw, so
+    a process that missed notifications while disconnected catches up from
+    here. server_id has no foreign key: unmount events outlive the server.
+    """
+
+    __tablename__ = "deployment_events"
+
+    seq: Mapped[int] = mapped_column(
+        BigInteger, Identity(), nullable=False, unique=True, index=True
+    )
+
+    server_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)
+
+    # Process that published the event; it has already applied the change
+    origin: Mapped[str] = mapped_column(String(64), nullable=False)
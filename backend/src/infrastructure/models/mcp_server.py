@@ -4,7 +4,7 @@ from uuid import UUID
 
 from pydantic import ConfigDict
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -165,3 +165,26 @@ class MCPEnvironmentVariable(CustomBase):
     server: Mapped["MCPServer"] = relationship(back_populates="environment_variables")
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class WizardChatMessage(CustomBase):
+    """One Step 0 wizard chat message. Rows are append-only, ordered by seq."""
+
+    __tablename__ = "wizard_chat_messages"
+    __table_args__ = (
+        Index("ix_wizard_chat_messages_server_id_seq", "server_id", "seq", unique=True),
+    )
+
+    server_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("mcp_servers.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    seq: Mapped[int] = mapped_column(Integer, nullable=False)
+    role: Mapped[str] = mapped_column(String(20), nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+
+    def to_message(self) -> dict[str, str]:
+        return {"role": self.role, "content": self.content}
+
+    model_config = ConfigDict(from_attributes=True)
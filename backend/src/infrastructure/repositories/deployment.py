@@ -5,22 +5,29 @@ from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import delete, func, insert, select
 from sqlalchemy.orm import selectinload
 
 from infrastructure.db import Database
 from infrastructure.models.deployment import (
     Deployment,
     DeploymentArtifact,
+    DeploymentEvent,
     DeploymentStatus,
     DeploymentTarget,
 )
-from infrastructure.repositories.base import BaseCRUDRepo
+from infrastructure.repositories.base import BaseCRUDRepo, BaseRepo
 
 if TYPE_CHECKING:
     from infrastructure.repositories.mcp_server import ServerStartupData
 
 
+# NOTIFY channel carrying the seq of each new deployment_events row
+DEPLOYMENT_EVENTS_CHANNEL = "deployment_events"
+# pg_advisory_xact_lock key serializing appends to deployment_events
+_DEPLOYMENT_EVENTS_LOCK_ID = 0x6D63_7065
+
+
 class DeploymentCreate(BaseModel):
     server_id: UUID
     target: str
@@ -84,6 +91,16 @@ class DeploymentRepo(BaseCRUDRepo[Deployment, DeploymentCreate, DeploymentUpdate
             )
             return list(result.scalars().all())
 
+    async def get_active_shared_server_ids(self) -> list[UUID]:
+        """Get server ids of all active SHARED deployments (routing table only)."""
+        async with self.db.session() as session:
+            result = await session.execute(
+                select(self.model.server_id)
+                .where(self.model.target == DeploymentTarget.SHARED.value)
+                .where(self.model.status == DeploymentStatus.ACTIVE.value)
+            )
+            return list(result.scalars().all())
+
     async def get_active_shared_servers(self) -> "list[ServerStartupData]":
         """Get all active shared servers with tools and env vars pre-loaded.
 
@@ -91,26 +108,50 @@ class DeploymentRepo(BaseCRUDRepo[Deployment, DeploymentCreate, DeploymentUpdate
         deployment.  Uses nested selectinload so the full load is 4 queries
         regardless of the number of servers (no N+1).
         """
-        from infrastructure.models.mcp_server import MCPServer
         from infrastructure.repositories.mcp_server import ServerStartupData
 
         async with self.db.session() as session:
-            result = await session.execute(
-                select(self.model)
-                .where(self.model.target == DeploymentTarget.SHARED.value)
-                .where(self.model.status == DeploymentStatus.ACTIVE.value)
-                .options(
-                    selectinload(self.model.server).selectinload(MCPServer.tools),
-                    selectinload(self.model.server).selectinload(
-                        MCPServer.environment_variables
-                    ),
-                )
-            )
+            result = await session.execute(self._active_shared_servers_query())
             return [
                 ServerStartupData.model_validate(d.server)
                 for d in result.scalars().all()
             ]
 
+    async def get_active_shared_server(
+        self, server_id: UUID
+    ) -> ServerStartupData | None:
+        """Get one active shared server with tools and env vars pre-loaded.
+
+        Used by lazy activation to load a server on its first request.
+        """
+        from infrastructure.repositories.mcp_server import ServerStartupData
+
+        async with self.db.session() as session:
+            result = await session.execute(
+                self._active_shared_servers_query().where(
+                    self.model.server_id == server_id
+                )
+            )
+            deployment = result.scalars().first()
+            if deployment is None:
+                return None
+            return ServerStartupData.model_validate(deployment.server)
+
+    def _active_shared_servers_query(self):
+        from infrastructure.models.mcp_server import MCPServer
+
+        return (
+            select(self.model)
+            .where(self.model.target == DeploymentTarget.SHARED.value)
+            .where(self.model.status == DeploymentStatus.ACTIVE.value)
+            .options(
+                selectinload(self.model.server).selectinload(MCPServer.tools),
+                selectinload(self.model.server).selectinload(
+                    MCPServer.environment_variables
+                ),
+            )
+        )
+
     async def get_with_server_and_tools(self, deployment_id: UUID) -> Deployment | None:
         """Get deployment with eager-loaded server and tools."""
         async with self.db.session() as session:
@@ -184,3 +225,54 @@ class DeploymentArtifactRepo(
                 select(self.model).where(self.model.deployment_id == deployment_id)
             )
             return result.scalars().first()
+
+
+class DeploymentEventRepo(BaseRepo):
+    async def append(self, server_id: UUID, kind: str, origin: str) -> int:
+        """
+        Record a runtime change and NOTIFY listeners when it commits.
+
+        Appends are serialized by an advisory lock, so seq order is commit
+        order and a reader that has seen seq N never misses a row below it.
+        Returns the new seq.
+        """
+        async with self.db.session() as session:
+            _ = await session.execute(
+                select(func.pg_advisory_xact_lock(_DEPLOYMENT_EVENTS_LOCK_ID))
+            )
+            result = await session.execute(
+                insert(DeploymentEvent)
+                .values(server_id=server_id, kind=kind, origin=origin)
+                .returning(DeploymentEvent.seq)
+            )
+            seq = result.scalar_one()
+            _ = await session.execute(
+                select(func.pg_notify(DEPLOYMENT_EVENTS_CHANNEL, str(seq)))
+            )
+            return seq
+
+    async def get_since(self, seq: int, limit: int = 500) -> list[DeploymentEvent]:
+        """Events after seq, oldest first."""
+        async with self.db.session() as session:
+            result = await session.execute(
+                select(DeploymentEvent)
+                .where(DeploymentEvent.seq > seq)
+                .order_by(DeploymentEvent.seq)
+                .limit(limit)
+            )
+            return list(result.scalars().all())
+
+    async def latest_seq(self) -> int:
+        async with self.db.session() as session:
+            result = await session.execute(
+                select(func.coalesce(func.max(DeploymentEvent.seq), 0))
+            )
+            return int(result.scalar_one())
+
+    async def delete_before(self, cutoff: datetime) -> int:
+        """Prune events created before cutoff. Returns the number deleted."""
+        async with self.db.session() as session:
+            result = await session.execute(
+                delete(DeploymentEvent).where(DeploymentEvent.created_at < cutoff)
+            )
+            return result.rowcount or 0  # type: ignore[union-attr]
@@ -2,7 +2,8 @@ from typing import Any
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import select
+from sqlalchemy import Text, cast, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import selectinload
 
 from infrastructure.db import Database
@@ -11,8 +12,9 @@ from infrastructure.models.mcp_server import (
     MCPServer,
     MCPServerSetupStatus,
     MCPTool,
+    WizardChatMessage,
 )
-from infrastructure.repositories.base import BaseCRUDRepo
+from infrastructure.repositories.base import BaseCRUDRepo, _utc_now
 
 
 class MCPServerCreate(BaseModel):
@@ -142,6 +144,130 @@ class MCPServerRepo(BaseCRUDRepo[MCPServer, MCPServerCreate, MCPServerUpdate]):
                 return True
             return False
 
+    async def merge_meta(self, server_id: UUID, patch: dict[str, Any]) -> bool:
+        """Shallow-merge keys into meta server-side (meta || patch)."""
+        async with self.db.session() as session:
+            result = await session.execute(
+                update(self.model)
+                .where(self.model.id == server_id)
+                .values(
+                    meta=self.model.meta.op("||", return_type=JSONB)(
+                        literal(patch, JSONB)
+                    ),
+                    updated_at=_utc_now(),
+                )
+            )
+            await session.commit()
+            return (result.rowcount or 0) > 0  # type: ignore[union-attr]
+
+    async def append_chat_messages(
+        self,
+        server_id: UUID,
+        messages: list[dict[str, str]],
+        meta_patch: dict[str, Any] | None = None,
+        meta_append: dict[str, list[Any]] | None = None,
+        description: str | None = None,
+    ) -> bool:
+        """
+        Append wizard chat messages to wizard_chat_messages in one transaction.
+
+        The server row is updated first (updated_at, meta, description), which
+        locks it, so concurrent turns for one server get consecutive seq
+        numbers instead of colliding on the (server_id, seq) index.
+        meta_patch is merged into meta; meta_append values are concatenated
+        onto the list stored under each key. Returns False if the server does
+        not exist.
+        """
+        meta = self.model.meta
+        for key, items in (meta_append or {}).items():
+            json_key = cast(literal(key), Text)
+            current = func.coalesce(
+                self.model.meta.op("->", return_type=JSONB)(json_key),
+                literal([], JSONB),
+            )
+            meta = meta.op("||", return_type=JSONB)(
+                func.jsonb_build_object(
+                    json_key,
+                    current.op("||", return_type=JSONB)(literal(items, JSONB)),
+                )
+            )
+        if meta_patch:
+            meta = meta.op("||", return_type=JSONB)(literal(meta_patch, JSONB))
+        now = _utc_now()
+        values: dict[str, Any] = {"updated_at": now}
+        if meta_patch or meta_append:
+            values["meta"] = meta
+        if description is not None:
+            values["description"] = description
+
+        async with self.db.session() as session:
+            result = await session.execute(
+                update(self.model).where(self.model.id == server_id).values(**values)
+            )
+            if not result.rowcount:  # type: ignore[union-attr]
+                await session.rollback()
+                return False
+            last_seq: int = await session.scalar(
+                select(func.coalesce(func.max(WizardChatMessage.seq), 0)).where(
+                    WizardChatMessage.server_id == server_id
+                )
+            )
+            if messages:
+                _ = await session.execute(
+                    insert(WizardChatMessage),
+                    [
+                        {
+                            "server_id": server_id,
+                            "seq": last_seq + i,
+                            "role": message["role"],
+                            "content": message["content"],
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                        for i, message in enumerate(messages, start=1)
+                    ],
+                )
+            await session.commit()
+            return True
+
+    async def get_chat_messages(
+        self,
+        server_id: UUID,
+        limit: int | None = None,
+        before_seq: int | None = None,
+    ) -> list[WizardChatMessage]:
+        """
+        Get a server's wizard chat messages, oldest first.
+
+        With limit, only the newest `limit` messages (before before_seq, if
+        given) are read, walking the (server_id, seq) index backwards.
+        """
+        query = select(WizardChatMessage).where(
+            WizardChatMessage.server_id == server_id
+        )
+        if before_seq is not None:
+            query = query.where(WizardChatMessage.seq < before_seq)
+        query = query.order_by(WizardChatMessage.seq.desc()).limit(limit)
+        async with self.db.session() as session:
+            result = await session.execute(query)
+            return list(reversed(result.scalars().all()))
+
+    async def has_chat_message_containing(
+        self, server_id: UUID, role: str, *fragments: str
+    ) -> bool:
+        """Check whether any `role` message contains all of the given fragments."""
+        query = select(WizardChatMessage.id).where(
+            WizardChatMessage.server_id == server_id,
+            WizardChatMessage.role == role,
+            *(
+                WizardChatMessage.content.contains(f, autoescape=True)
+                for f in fragments
+            ),
+        )
+        async with self.db.session() as session:
+            result = await session.execute(query.limit(1))
+            return result.first() is not None
+
     async def get_with_full_details(self, server_id: UUID) -> MCPServer | None:
         """Get server with all related data (tools, prompts, deployment)."""
         async with self.db.session() as session:
@@ -185,6 +185,14 @@ class OAuthAccessTokenUpdate(BaseModel):
     is_revoked: bool | None = None
 
 
+class RevokedAccessToken(BaseModel):
+    """A revoked, not yet expired access token (for the revocation index)."""
+
+    jti: str
+    expires_at: datetime
+    updated_at: datetime | None = None
+
+
 class OAuthAccessTokenRepo(
     BaseCRUDRepo[OAuthAccessToken, OAuthAccessTokenCreate, OAuthAccessTokenUpdate]
 ):
@@ -218,17 +226,16 @@ class OAuthAccessTokenRepo(
             await session.commit()
             return (result.rowcount or 0) > 0  # type: ignore[union-attr]
 
-    async def revoke_all_for_user(self, user_id: str, server_id: UUID) -> int:
-        """Revoke all access tokens for a user on a server."""
+    async def revoke_all_for_user(
+        self, user_id: str, server_id: UUID | None = None
+    ) -> int:
+        """Revoke all access tokens for a user on a server (or on every server)."""
+        conditions = [self.model.user_id == user_id, self.model.is_revoked.is_(False)]
+        if server_id is not None:
+            conditions.append(self.model.server_id == server_id)
         async with self.db.session() as session:
             result = await session.execute(
-                update(self.model)
-                .where(
-                    self.model.user_id == user_id,
-                    self.model.server_id == server_id,
-                    self.model.is_revoked.is_(False),
-                )
-                .values(is_revoked=True)
+                update(self.model).where(*conditions).values(is_revoked=True)
             )
             await session.commit()
             return result.rowcount or 0  # type: ignore[union-attr]
@@ -246,6 +253,29 @@ class OAuthAccessTokenRepo(
             )
             return result.scalars().first() is not None
 
+    async def get_revoked_since(
+        self, since: datetime | None = None
+    ) -> list[RevokedAccessToken]:
+        """Revoked, unexpired tokens whose row changed at or after `since`."""
+        query = select(
+            self.model.jti, self.model.expires_at, self.model.updated_at
+        ).where(
+            self.model.is_revoked.is_(True),
+            self.model.expires_at > datetime.now(timezone.utc).replace(tzinfo=None),
+        )
+        if since is not None:
+            query = query.where(self.model.updated_at >= since)
+        async with self.db.session() as session:
+            result = await session.execute(query)
+            return [
+                RevokedAccessToken(
+                    jti=row.jti,
+                    expires_at=row.expires_at,
+                    updated_at=row.updated_at,
+                )
+                for row in result.all()
+            ]
+
 
 # ============================================================================
 # OAuth Refresh Token Schemas and Repository
@@ -312,17 +342,16 @@ class OAuthRefreshTokenRepo(
             await session.commit()
             return (result.rowcount or 0) > 0  # type: ignore[union-attr]
 
-    async def revoke_all_for_user(self, user_id: str, server_id: UUID) -> int:
-        """Revoke all refresh tokens for a user on a server."""
+    async def revoke_all_for_user(
+        self, user_id: str, server_id: UUID | None = None
+    ) -> int:
+        """Revoke all refresh tokens for a user on a server (or on every server)."""
+        conditions = [self.model.user_id == user_id, self.model.is_revoked.is_(False)]
+        if server_id is not None:
+            conditions.append(self.model.server_id == server_id)
         async with self.db.session() as session:
             result = await session.execute(
-                update(self.model)
-                .where(
-                    self.model.user_id == user_id,
-                    self.model.server_id == server_id,
-                    self.model.is_revoked.is_(False),
-                )
-                .values(is_revoked=True)
+                update(self.model).where(*conditions).values(is_revoked=True)
             )
             await session.commit()
             return result.rowcount or 0  # type: ignore[union-attr]
@@ -1,13 +1,16 @@
 """Repository for organization API keys."""
 
+import asyncio
 import hashlib
 import secrets
+import time
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from uuid import UUID
 
 from loguru import logger
 from pydantic import BaseModel
-from sqlalchemy import select, update
+from sqlalchemy import bindparam, or_, select, update
 
 from infrastructure.db import Database
 from infrastructure.models.org_api_key import OrgApiKey
@@ -38,11 +41,37 @@ class OrgApiKeyUpdate(BaseModel):
     expires_at: datetime | None = None
 
 
+@dataclass(frozen=True)
+class _VerifiedKey:
+    key_id: UUID
+    organization_id: UUID
+    expires_at: datetime | None
+    cached_until: float
+
+
 class OrgApiKeyRepo(BaseRepo):
-    """Repository for organization API keys."""
+    """
+    Repository for organization API keys.
 
-    def __init__(self, db: Database):
+    verify() keeps successful lookups in a short-TTL cache keyed by key hash
+    and does not write: last_used_at timestamps are coalesced per key in
+    memory and written in one bulk UPDATE by flush_last_used(), which the
+    app runs on an interval and at shutdown. A key deleted or changed on
+    another worker stays usable there for at most verify_cache_ttl seconds.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        verify_cache_ttl: float = 30.0,
+        flush_interval: float = 60.0,
+    ):
         super().__init__(db)
+        self.verify_cache_ttl = verify_cache_ttl
+        self.flush_interval = flush_interval
+        self._verified: dict[str, _VerifiedKey] = {}
+        self._pending_last_used: dict[UUID, datetime] = {}
+        self._flusher: asyncio.Task[None] | None = None
 
     async def create(
         self,
@@ -117,6 +146,7 @@ class OrgApiKeyRepo(BaseRepo):
             if expires_at is not None:
                 record.expires_at = expires_at
             await session.commit()
+        self._forget_verified(key_id)
         return True
 
     async def delete(self, key_id: UUID, organization_id: UUID) -> bool:
@@ -133,6 +163,8 @@ class OrgApiKeyRepo(BaseRepo):
                 return False
             await session.delete(record)
             await session.commit()
+        self._forget_verified(key_id)
+        _ = self._pending_last_used.pop(key_id, None)
         return True
 
     async def verify(self, plain_key: str) -> UUID | None:
@@ -143,35 +175,109 @@ class OrgApiKeyRepo(BaseRepo):
             else f"<len={len(plain_key)}>"
         )
         hashed = _hash_api_key(plain_key)
-        async with self.db.session() as session:
-            result = await session.execute(
-                select(OrgApiKey).where(OrgApiKey.hashed_key == hashed)
-            )
-            record = result.scalars().first()
-            if not record:
-                logger.info(
-                    "MCP_AUTH: org_api_key verify NOT FOUND key_masked={key}",
-                    key=key_masked,
-                )
-                return None
-            now = datetime.now(timezone.utc)
-            if record.expires_at and record.expires_at < now:
+        now = datetime.now(timezone.utc)
+
+        cached = self._verified.get(hashed)
+        if cached is not None and cached.cached_until > time.monotonic():
+            if cached.expires_at and cached.expires_at < now:
+                del self._verified[hashed]
                 logger.info(
                     "MCP_AUTH: org_api_key verify EXPIRED key_masked={key} org_id={oid}",
                     key=key_masked,
-                    oid=str(record.organization_id),
+                    oid=str(cached.organization_id),
                 )
                 return None
-            # Update last_used_at
-            await session.execute(
-                update(OrgApiKey)
-                .where(OrgApiKey.id == record.id)
-                .values(last_used_at=now)
+            self._pending_last_used[cached.key_id] = now
+            return cached.organization_id
+
+        async with self.db.session() as session:
+            result = await session.execute(
+                select(OrgApiKey).where(OrgApiKey.hashed_key == hashed)
             )
-            await session.commit()
+            record = result.scalars().first()
+        if not record:
+            _ = self._verified.pop(hashed, None)
             logger.info(
-                "MCP_AUTH: org_api_key verify SUCCESS key_masked={key} org_id={oid}",
+                "MCP_AUTH: org_api_key verify NOT FOUND key_masked={key}",
+                key=key_masked,
+            )
+            return None
+        if record.expires_at and record.expires_at < now:
+            _ = self._verified.pop(hashed, None)
+            logger.info(
+                "MCP_AUTH: org_api_key verify EXPIRED key_masked={key} org_id={oid}",
                 key=key_masked,
                 oid=str(record.organization_id),
             )
-            return record.organization_id
+            return None
+        self._verified[hashed] = _VerifiedKey(
+            key_id=record.id,
+            organization_id=record.organization_id,
+            expires_at=record.expires_at,
+            cached_until=time.monotonic() + self.verify_cache_ttl,
+        )
+        self._pending_last_used[record.id] = now
+        logger.info(
+            "MCP_AUTH: org_api_key verify SUCCESS key_masked={key} org_id={oid}",
+            key=key_masked,
+            oid=str(record.organization_id),
+        )
+        return record.organization_id
+
+    async def flush_last_used(self) -> int:
+        """Write buffered last_used_at timestamps in one bulk UPDATE."""
+        if not self._pending_last_used:
+            return 0
+        pending, self._pending_last_used = self._pending_last_used, {}
+        table = OrgApiKey.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("b_key_id"))
+            .where(
+                or_(
+                    table.c.last_used_at.is_(None),
+                    table.c.last_used_at < bindparam("b_last_used_at"),
+                )
+            )
+            .values(last_used_at=bindparam("b_last_used_at"))
+        )
+        try:
+            async with self.db.session() as session:
+                _ = await session.execute(
+                    statement,
+                    [
+                        {"b_key_id": key_id, "b_last_used_at": used_at}
+                        for key_id, used_at in pending.items()
+                    ],
+                )
+                await session.commit()
+        except Exception as e:
+            # Keep the timestamps for the next flush unless newer ones arrived
+            for key_id, used_at in pending.items():
+                newer = self._pending_last_used.get(key_id)
+                if newer is None or newer < used_at:
+                    self._pending_last_used[key_id] = used_at
+            logger.error(f"Failed to flush api key last_used_at: {e}")
+            return 0
+        return len(pending)
+
+    def start_last_used_flusher(self) -> None:
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def aclose(self) -> None:
+        """Stop the flusher and write any buffered timestamps."""
+        if self._flusher is not None:
+            _ = self._flusher.cancel()
+            _ = await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        _ = await self.flush_last_used()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            _ = await self.flush_last_used()
+
+    def _forget_verified(self, key_id: UUID) -> None:
+        for hashed in [h for h, v in self._verified.items() if v.key_id == key_id]:
+            del self._verified[hashed]
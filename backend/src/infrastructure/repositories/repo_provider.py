@@ -4,6 +4,7 @@ from infrastructure.db import Database, create_database
 from infrastructure.repositories.customer import CustomerRepo, StaticAPIKeyRepo
 from infrastructure.repositories.deployment import (
     DeploymentArtifactRepo,
+    DeploymentEventRepo,
     DeploymentRepo,
 )
 from infrastructure.repositories.mcp_server import (
@@ -18,6 +19,7 @@ from infrastructure.repositories.oauth import (
     OAuthRefreshTokenRepo,
 )
 from infrastructure.repositories.org_api_key import OrgApiKeyRepo
+from settings import settings
 
 
 class Provider:
@@ -27,6 +29,7 @@ class Provider:
     _customer_repo: None | CustomerRepo = None
     _deployment_repo: None | DeploymentRepo = None
     _deployment_artifact_repo: None | DeploymentArtifactRepo = None
+    _deployment_event_repo: None | DeploymentEventRepo = None
     _environment_variable_repo: None | MCPEnvironmentVariableRepo = None
     _static_api_key_repo: None | StaticAPIKeyRepo = None
     _org_api_key_repo: None | OrgApiKeyRepo = None
@@ -77,6 +80,12 @@ class Provider:
             cls._deployment_artifact_repo = DeploymentArtifactRepo(cls.get_db())
         return cls._deployment_artifact_repo
 
+    @classmethod
+    def deployment_event_repo(cls) -> DeploymentEventRepo:
+        if cls._deployment_event_repo is None:
+            cls._deployment_event_repo = DeploymentEventRepo(cls.get_db())
+        return cls._deployment_event_repo
+
     @classmethod
     def environment_variable_repo(cls) -> MCPEnvironmentVariableRepo:
         if cls._environment_variable_repo is None:
@@ -92,7 +101,11 @@ class Provider:
     @classmethod
     def org_api_key_repo(cls) -> OrgApiKeyRepo:
         if cls._org_api_key_repo is None:
-            cls._org_api_key_repo = OrgApiKeyRepo(cls.get_db())
+            cls._org_api_key_repo = OrgApiKeyRepo(
+                cls.get_db(),
+                verify_cache_ttl=settings.ORG_API_KEY_VERIFY_CACHE_TTL,
+                flush_interval=settings.ORG_API_KEY_LAST_USED_FLUSH_SECONDS,
+            )
         return cls._org_api_key_repo
 
     @classmethod
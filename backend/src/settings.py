@@ -12,6 +12,10 @@ class AppSettings(BaseSettings):
     DEBUG: bool = True
     PORT: int = 8000
     ADMIN_ROUTES_API_KEY: str = "API_KEY_SECURITY"
+    # Org API keys: how long a verified key is trusted without a DB lookup,
+    # and how often buffered last_used_at timestamps are written back
+    ORG_API_KEY_VERIFY_CACHE_TTL: float = 30.0
+    ORG_API_KEY_LAST_USED_FLUSH_SECONDS: float = 60.0
 
 
 class OAuthSettings(BaseSettings):
@@ -47,12 +51,78 @@ LQjaqB3pQK+mKEX6rD12rvnbXaHLDuO0bEuUW74xikJqOY4pDecpBtLdwhW5rDDT
 1S5ips2oseJ4xy0lAgMBAAE=
 -----END PUBLIC KEY-----
 """  # RSA public key for RS256 verification (PEM format)
-    JWT_ALGORITHM: str = "RS256"
+    JWT_ALGORITHM: str = "RS256"  # RS256, ES256 or EdDSA (matching the keys above)
+    JWT_KEY_ID: str = ""  # kid of the active key; derived from the public key if empty
+    # Extra public keys accepted for verification during key rotation, as a JSON
+    # list of {"kid": ..., "alg": ..., "public_key": "<PEM>"}
+    JWT_VERIFICATION_KEYS: str = ""
     OAUTH_SCOPES: str = "mcp:access"  # Space-separated scopes
+    OAUTH_TOKEN_CACHE_MAX_ENTRIES: int = 10000  # Validated access tokens kept
+    # Upper bound on how long a validation is reused (entries also expire at exp,
+    # and never outlive OAUTH_REVOCATION_REFRESH_SECONDS)
+    OAUTH_TOKEN_CACHE_MAX_TTL: int = 300
+    # How often revoked jtis are pulled from the DB into the in-memory index;
+    # bounds how long a revocation on another worker takes to apply here
+    OAUTH_REVOCATION_REFRESH_SECONDS: float = 10.0
+
+
+class SharedRuntimeSettings(BaseSettings):
+    """Shared MCP runtime (free tier) tuning."""
+
+    MCP_STARTUP_CONCURRENCY: int = 8  # Servers compiled in parallel at startup
+    # Lazy mode: only the routing table is loaded at boot; servers are compiled
+    # and started on first request and stopped again once idle.
+    MCP_LAZY_ACTIVATION: bool = False
+    MCP_IDLE_TTL_SECONDS: float = 900.0  # Idle time before a lazy server is stopped
+    MCP_MAX_RESIDENT_SERVERS: int = 256  # LRU cap on running lazy servers
+    # Max wait for in-flight requests before a replaced server's lifespan closes
+    MCP_DRAIN_TIMEOUT_SECONDS: float = 30.0
+    # Per-call bounds on compiled tools so one tenant cannot starve the loop
+    MCP_TOOL_TIMEOUT_SECONDS: float = 30.0
+    MCP_SERVER_MAX_CONCURRENT_CALLS: int = 16  # Calls running per server
+    MCP_SERVER_QUEUE_TIMEOUT_SECONDS: float = 5.0  # Wait for a server slot
+    MCP_CUSTOMER_MAX_IN_FLIGHT_CALLS: int = 32  # Calls across a customer's servers
+    # Comma-separated host env vars tool code may read through os.environ;
+    # everything else in the process environment is hidden from tools
+    MCP_TOOL_HOST_ENV_ALLOWLIST: str = ""
+    # Where compiled tools run: "inline" on the event loop, or "process" in a
+    # pool of worker processes (for CPU-heavy tools; shared state is then
+    # per worker process)
+    MCP_TOOL_EXECUTION_BACKEND: str = "inline"
+    MCP_TOOL_PROCESS_WORKERS: int = 0  # Pool size; 0 = usable CPU cores
+    # Calls one customer may run in the pool at once; 0 = half the workers
+    MCP_TOOL_PROCESS_MAX_CALLS_PER_CUSTOMER: int = 0
+    # A worker still running this long past a call's deadline is killed
+    MCP_TOOL_PROCESS_KILL_GRACE_SECONDS: float = 5.0
+    # Pooled http_client injected into every server's tool namespace
+    MCP_TOOL_HTTP_TIMEOUT_SECONDS: float = 30.0
+    MCP_TOOL_HTTP_MAX_CONNECTIONS: int = 20  # Per server
+    MCP_TOOL_HTTP_MAX_KEEPALIVE: int = 10  # Idle connections kept per server
+    # Database pools handed to tool code by get_db_pool()
+    MCP_TOOL_DB_MAX_POOLS: int = 4  # Distinct DSNs per server
+    MCP_TOOL_DB_POOL_MAX_SIZE: int = 5  # Connections per pool
+    MCP_TOOL_DB_POOL_IDLE_SECONDS: float = 300.0  # Unused pools are closed after
+    MCP_TOOL_DB_CLOSE_TIMEOUT_SECONDS: float = 10.0
+    # How mount changes reach the other runtime processes: "postgres"
+    # (deployment_events table + LISTEN/NOTIFY) or "local" (single process)
+    MCP_RUNTIME_EVENTS_BACKEND: str = "postgres"
+    # Fallback poll of deployment_events in case a notification is lost
+    MCP_RUNTIME_EVENTS_POLL_SECONDS: float = 30.0
+    # Sharding: comma-separated base URLs of every runtime node (empty = each
+    # node serves every server) and this node's own URL among them. Requests
+    # for servers owned by another node are reverse-proxied there, so the
+    # nodes must reach each other at these URLs.
+    MCP_SHARD_NODES: str = ""
+    MCP_SHARD_SELF: str = ""
+    MCP_SHARD_VNODES: int = 128  # Points per node on the consistent-hash ring
+    MCP_SHARD_PROXY_CONNECT_TIMEOUT_SECONDS: float = 5.0
 
 
 class MonitoringSettings(BaseSettings):
     LOGFIRE_TOKEN: str = ""
+    # Fraction of MCP requests whose auth trace is logged (at DEBUG). Rejections
+    # are always logged; per-decision counters are kept regardless.
+    MCP_AUTH_LOG_SAMPLE_RATE: float = 0.01
 
 
 class LLMSettings(BaseSettings):
@@ -63,6 +133,10 @@ class LLMSettings(BaseSettings):
     ENV_VARS_GENERATION_MODEL: str = "google/gemini-2.5-flash"
     CODE_GENERATION_MODEL: str = "google/gemini-2.5-flash"
     WIZARD_CHAT_MODEL: str = "google/gemini-3.1-flash-lite-preview"
+    # Newest wizard chat messages sent to the LLM with each turn.
+    WIZARD_CHAT_CONTEXT_MESSAGES: int = 100
+    # Re-read prompt files from core/prompts when their mtime changes
+    PROMPTS_HOT_RELOAD: bool = False
 
 
 class PostgresSettings(BaseSettings):
@@ -112,6 +186,7 @@ class PostgresSettings(BaseSettings):
 class Settings(  # type: ignore[reportUnsafeMultipleInheritance]
     AppSettings,
     OAuthSettings,
+    SharedRuntimeSettings,
     MonitoringSettings,
     LLMSettings,
     PostgresSettings,
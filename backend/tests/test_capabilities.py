@@ -0,0 +1,48 @@
+"""Tests for the curated library capability registry."""
+
+import json
+import pathlib
+
+from core.services.capabilities import CapabilityRegistry
+from core.services.tier_service import CodeValidator, Tier
+
+
+def _registry() -> CapabilityRegistry:
+    return CapabilityRegistry(
+        {
+            "json": None,
+            "pathlib": ["Path", "NoSuchSymbol"],
+            "no_such_module_for_tests": None,
+        }
+    )
+
+
+def test_probe_records_availability_and_existing_symbols() -> None:
+    registry = _registry()
+
+    libraries = registry.libraries
+
+    assert registry.libraries is libraries
+    assert libraries["json"].module is json
+    assert libraries["pathlib"].symbols == ("Path",)
+    assert not libraries["no_such_module_for_tests"].available
+    assert [c.name for c in registry.available()] == ["json", "pathlib"]
+
+
+def test_prompt_listing_and_namespace_only_cover_installed_modules() -> None:
+    registry = _registry()
+
+    assert registry.prompt_listing() == "- json: all exports\n- pathlib: Path"
+    entries = registry.namespace_entries()
+    assert entries == {"json": json, "pathlib": pathlib, "Path": pathlib.Path}
+    entries["json"] = None
+    assert registry.namespace_entries()["json"] is json
+
+
+def test_validator_with_capabilities_rejects_uninstalled_curated_imports() -> None:
+    code = "async def f():\n    import httpx\n    return 1\n"
+
+    assert CodeValidator(Tier.FREE).validate(code) == []
+    errors = CodeValidator(Tier.FREE, _registry()).validate(code)
+    assert len(errors) == 1
+    assert "not installed" in errors[0]
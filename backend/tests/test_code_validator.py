@@ -0,0 +1,52 @@
+"""Tests for single-pass, cached code validation."""
+
+import ast
+
+import pytest
+
+from core.services.tier_service import CodeValidator, Tier, validation_cache
+
+CODE = """
+import json
+from os import path
+
+
+async def get_weather(city: dict, days: int = 1) -> str:
+    return eval(city)
+"""
+
+
+def test_one_pass_reports_imports_calls_and_signature() -> None:
+    errors = CodeValidator(Tier.FREE).validate(
+        CODE,
+        expected_params={"city", "units"},
+        expected_name="get_weather",
+        expected_types={"city": "string"},
+    )
+
+    assert any("'path' from 'os'" in e for e in errors)
+    assert any("'eval' is not allowed" in e for e in errors)
+    assert any("Missing parameters" in e and "units" in e for e in errors)
+    assert any("Extra parameters" in e and "days" in e for e in errors)
+    assert any("Type mismatch: parameter 'city'" in e for e in errors)
+
+    paid = CodeValidator(Tier.PAID).validate(CODE, expected_name="get_weather")
+    assert paid == []
+
+
+def test_unchanged_code_is_not_parsed_again(monkeypatch: pytest.MonkeyPatch) -> None:
+    code = CODE.replace("get_weather", "get_forecast")
+    first = CodeValidator(Tier.FREE).validate(code, expected_params={"city", "days"})
+
+    def fail_parse(*args: object, **kwargs: object) -> ast.Module:
+        raise AssertionError("validation result should have been cached")
+
+    monkeypatch.setattr(ast, "parse", fail_parse)
+    hits = validation_cache.hits
+
+    second = CodeValidator(Tier.FREE).validate(code, expected_params={"days", "city"})
+    assert second == first
+    assert validation_cache.hits == hits + 1
+
+    with pytest.raises(AssertionError):
+        _ = CodeValidator(Tier.FREE).validate(code, expected_params={"city"})
@@ -0,0 +1,94 @@
+"""Tests for the access token signing keyring."""
+
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+from core.services.jwt_keyring import JWTKeyring, load_key
+from core.services.oauth_service import oauth_service
+
+
+def _pems(private_key) -> tuple[str, str]:
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+    return private_pem, public_pem
+
+
+def _claims(aud: str = "srv-1") -> dict[str, object]:
+    now = int(time.time())
+    return {"sub": "user-1", "aud": aud, "jti": "j1", "iat": now, "exp": now + 60}
+
+
+@pytest.mark.parametrize(
+    ("algorithm", "private_key"),
+    [
+        ("ES256", ec.generate_private_key(ec.SECP256R1())),
+        ("EdDSA", ed25519.Ed25519PrivateKey.generate()),
+    ],
+)
+def test_sign_and_decode_round_trip(algorithm: str, private_key) -> None:
+    private_pem, public_pem = _pems(private_key)
+    keyring = JWTKeyring(load_key(algorithm, public_pem, private_pem), [])
+
+    token = keyring.sign(_claims())
+
+    assert jwt.get_unverified_header(token)["kid"] == keyring.active.kid
+    assert keyring.decode(token, audience="srv-1")["sub"] == "user-1"
+    with pytest.raises(jwt.InvalidAudienceError):
+        _ = keyring.decode(token, audience="srv-2")
+
+
+def test_rotation_keeps_tokens_of_the_previous_key_valid() -> None:
+    old_private, old_public = _pems(ec.generate_private_key(ec.SECP256R1()))
+    new_private, new_public = _pems(ed25519.Ed25519PrivateKey.generate())
+    old = JWTKeyring(load_key("ES256", old_public, old_private), [])
+    old_token = old.sign(_claims())
+
+    rotated = JWTKeyring(
+        load_key("EdDSA", new_public, new_private),
+        [load_key("ES256", old_public)],
+    )
+
+    assert rotated.decode(old_token, audience="srv-1")["jti"] == "j1"
+    assert rotated.decode(rotated.sign(_claims()), audience="srv-1")["jti"] == "j1"
+    assert {k["kid"] for k in rotated.jwks()["keys"]} == {
+        old.active.kid,
+        rotated.active.kid,
+    }
+
+
+def test_unknown_kid_is_rejected() -> None:
+    private_pem, public_pem = _pems(ec.generate_private_key(ec.SECP256R1()))
+    other_private, other_public = _pems(ec.generate_private_key(ec.SECP256R1()))
+    keyring = JWTKeyring(
+        load_key("ES256", public_pem, private_pem),
+        [load_key("ES256", other_public)],
+    )
+    stranger = JWTKeyring(load_key("ES256", "", other_private, kid="nope"), [])
+
+    with pytest.raises(jwt.InvalidTokenError, match="Unknown signing key"):
+        _ = keyring.decode(stranger.sign(_claims()), audience="srv-1")
+
+
+def test_jwks_publishes_only_public_material() -> None:
+    jwks = oauth_service.keyring.jwks()
+
+    assert len(jwks["keys"]) == 1
+    key = jwks["keys"][0]
+    assert key["kid"] == oauth_service.keyring.active.kid
+    assert key["alg"] == "RS256"
+    assert "d" not in key
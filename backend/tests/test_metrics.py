@@ -0,0 +1,81 @@
+"""Tests for the Prometheus metrics registry and /metrics endpoint."""
+
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+from httpx import ASGITransport, AsyncClient
+
+from core.services.metrics import MetricsRegistry, mcp_tool_calls_total
+from core.services.tool_loader import get_tool_loader
+from entrypoints.api.routes import metrics_router
+from entrypoints.mcp.shared_runtime import build_mcp_server
+from settings import settings
+
+pytestmark = pytest.mark.anyio
+
+
+def test_counter_and_histogram_render_text_format() -> None:
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls", ["tool"])
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+
+    calls.inc('say "hi"')
+    calls.inc('say "hi"', amount=2)
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5.0)
+
+    assert registry.render().splitlines() == [
+        "# HELP calls_total Calls",
+        "# TYPE calls_total counter",
+        'calls_total{tool="say \\"hi\\""} 3',
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 5.55",
+        "latency_seconds_count 3",
+    ]
+
+
+async def test_tool_calls_are_counted_per_server_and_tool() -> None:
+    server_id = uuid4()
+    tool = get_tool_loader().compile_tool(
+        tool_id=str(uuid4()),
+        name="metered_tool",
+        description="Metered",
+        parameters=[],
+        code='async def metered_tool():\n    return "metered"\n',
+        customer_id=uuid4(),
+        server_id=server_id,
+    )
+    mcp = build_mcp_server(server_id, [tool])
+
+    async with Client(mcp) as client:
+        _ = await client.call_tool("metered_tool", {})
+        with pytest.raises(ToolError):
+            _ = await client.call_tool("missing_tool", {})
+
+    assert mcp_tool_calls_total.value(str(server_id), "metered_tool", "ok") == 1
+    assert mcp_tool_calls_total.value(str(server_id), "missing_tool", "error") == 1
+
+
+async def test_metrics_endpoint_renders_prometheus_text() -> None:
+    app = FastAPI()
+    app.include_router(metrics_router)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(
+            "/metrics",
+            headers={"Authorization": f"Bearer {settings.ADMIN_ROUTES_API_KEY}"},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE mcp_tool_call_duration_seconds histogram" in response.text
+    assert "# TYPE mcp_auth_decisions_total counter" in response.text
+    assert 'oauth_token_cache_requests_total{result="hit"}' in response.text
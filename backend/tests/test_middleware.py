@@ -0,0 +1,197 @@
+"""Tests for the MCP auth/env ASGI middlewares."""
+
+import time
+from uuid import uuid4
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from loguru import logger
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Mount, Route
+
+from core.services.oauth_service import oauth_service
+from core.services.request_context import request_customer_id, request_env_vars
+from entrypoints.api.middleware import (
+    MCPAccessMiddleware,
+    MCPEnvMiddleware,
+    MetaAuthGuardMiddleware,
+    auth_decisions,
+)
+from entrypoints.api.routes.oauth import META_SERVER_ID
+from settings import settings
+
+pytestmark = pytest.mark.anyio
+
+
+async def _echo(request: Request) -> JSONResponse:
+    customer_id = request_customer_id.get()
+    return JSONResponse(
+        {
+            "env": request_env_vars.get(),
+            "customer_id": str(customer_id) if customer_id else None,
+            "state_customer_id": str(
+                getattr(request.state, "mcp_customer_id", None) or ""
+            ),
+        }
+    )
+
+
+async def _stream(request: Request) -> StreamingResponse:
+    async def chunks():
+        for i in range(3):
+            yield f"data: {i}\n\n"
+
+    return StreamingResponse(chunks(), media_type="text/event-stream")
+
+
+def _build_app() -> Starlette:
+    meta_app = Starlette(routes=[Route("/mcp", _echo, methods=["POST"])])
+    meta_app.add_middleware(MetaAuthGuardMiddleware)
+
+    app = Starlette(
+        routes=[
+            Mount("/mcp/meta", meta_app),
+            Route("/mcp/{server_id}/mcp", _echo, methods=["POST"]),
+            Route("/mcp/{server_id}/stream", _stream),
+            Route("/mcp/{server_id}/oauth/register", _echo, methods=["POST"]),
+            Route("/api/health", _echo),
+        ]
+    )
+    # Same order as Application.register_urls
+    app.add_middleware(MCPAccessMiddleware)
+    app.add_middleware(MCPEnvMiddleware)
+    return app
+
+
+@pytest.fixture
+async def client():
+    transport = ASGITransport(app=_build_app())
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+def _admin_headers(**extra: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {settings.ADMIN_ROUTES_API_KEY}", **extra}
+
+
+async def test_non_mcp_paths_pass_through(client: AsyncClient):
+    response = await client.get("/api/health")
+    assert response.status_code == 200
+
+
+async def test_missing_authorization_returns_401_with_resource_metadata(
+    client: AsyncClient,
+):
+    server_id = uuid4()
+    response = await client.post(f"/mcp/{server_id}/mcp")
+
+    assert response.status_code == 401
+    assert f"/mcp/{server_id}/mcp" in response.headers["WWW-Authenticate"]
+
+
+async def test_invalid_tokens_are_rejected(client: AsyncClient):
+    server_id = uuid4()
+
+    response = await client.post(
+        f"/mcp/{server_id}/mcp", headers={"Authorization": "Basic abc"}
+    )
+    assert response.status_code == 401
+
+    response = await client.post(
+        f"/mcp/{server_id}/mcp", headers={"Authorization": "Bearer not-a-jwt"}
+    )
+    assert response.status_code == 403
+
+    response = await client.post(
+        "/mcp/not-a-uuid/mcp", headers={"Authorization": "Bearer x"}
+    )
+    assert response.status_code == 400
+
+
+async def test_oauth_paths_skip_auth(client: AsyncClient):
+    response = await client.post(f"/mcp/{uuid4()}/oauth/register")
+    assert response.status_code == 200
+
+
+async def test_env_headers_reach_the_handler(client: AsyncClient):
+    response = await client.post(
+        f"/mcp/{uuid4()}/mcp",
+        headers=_admin_headers(**{"X-Env-API-KEY": "secret", "X-Other": "no"}),
+    )
+
+    assert response.status_code == 200
+    assert response.json()["env"] == {"API_KEY": "secret"}
+
+
+async def test_streaming_response_is_forwarded(client: AsyncClient):
+    response = await client.get(f"/mcp/{uuid4()}/stream", headers=_admin_headers())
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text == "data: 0\n\ndata: 1\n\ndata: 2\n\n"
+
+
+async def test_meta_sets_customer_context_for_guard(client: AsyncClient):
+    customer_id = uuid4()
+    token = "header.payload.signature"
+    claims = {"sub": str(customer_id), "jti": "j1", "exp": time.time() + 60}
+    oauth_service.token_cache.put(token, str(META_SERVER_ID), claims)
+    try:
+        response = await client.post(
+            "/mcp/meta/mcp", headers={"Authorization": f"Bearer {token}"}
+        )
+    finally:
+        oauth_service.token_cache.clear()
+
+    assert response.status_code == 200
+    assert response.json()["customer_id"] == str(customer_id)
+    assert response.json()["state_customer_id"] == str(customer_id)
+
+
+async def test_meta_guard_rejects_without_customer_context():
+    meta_app = Starlette(routes=[Route("/mcp", _echo, methods=["POST"])])
+    meta_app.add_middleware(MetaAuthGuardMiddleware)
+
+    transport = ASGITransport(app=meta_app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        response = await c.post("/mcp")
+
+    assert response.status_code == 403
+
+
+async def test_decisions_are_counted_by_reason(client: AsyncClient):
+    auth_decisions.reset()
+    server_id = uuid4()
+
+    _ = await client.post(f"/mcp/{server_id}/mcp")
+    _ = await client.post(f"/mcp/{server_id}/mcp")
+    _ = await client.post(
+        f"/mcp/{server_id}/mcp", headers={"Authorization": "Bearer not-a-jwt"}
+    )
+    _ = await client.post(f"/mcp/{server_id}/mcp", headers=_admin_headers())
+
+    assert auth_decisions.snapshot() == {
+        ("reject", "missing_authorization"): 2,
+        ("reject", "not_a_jwt"): 1,
+        ("allow", "admin_key"): 1,
+    }
+
+
+async def test_allow_trace_is_sampled_but_rejections_always_logged(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(settings, "MCP_AUTH_LOG_SAMPLE_RATE", 0.0)
+    records: list[str] = []
+    sink_id = logger.add(lambda m: records.append(m.record["message"]), level="DEBUG")
+    try:
+        server_id = uuid4()
+        _ = await client.post(f"/mcp/{server_id}/mcp", headers=_admin_headers())
+        _ = await client.post(f"/mcp/{server_id}/mcp")
+    finally:
+        logger.remove(sink_id)
+
+    auth_records = [r for r in records if r.startswith("MCP_")]
+    assert len(auth_records) == 1
+    assert "REJECT reason=missing_authorization" in auth_records[0]
@@ -0,0 +1,43 @@
+"""Tests for org API key verification caching and write-behind last_used_at."""
+
+import pytest
+
+from infrastructure.models import Customer
+from infrastructure.repositories.repo_provider import Provider
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_verify_buffers_last_used_until_flush(
+    provider: type[Provider], customer: Customer
+):
+    repo = Provider.org_api_key_repo()
+    _ = await repo.flush_last_used()
+    record, plain_key = await repo.create(customer.id, "ci key")
+
+    assert await repo.verify(plain_key) == customer.id
+    assert await repo.verify(plain_key) == customer.id
+
+    stored = await repo.get_by_id(record.id)
+    assert stored is not None
+    assert stored.last_used_at is None
+
+    assert await repo.flush_last_used() == 1
+    assert await repo.flush_last_used() == 0
+
+    stored = await repo.get_by_id(record.id)
+    assert stored is not None
+    assert stored.last_used_at is not None
+
+
+async def test_delete_drops_cached_verification(
+    provider: type[Provider], customer: Customer
+):
+    repo = Provider.org_api_key_repo()
+    record, plain_key = await repo.create(customer.id, "short lived")
+
+    assert await repo.verify(plain_key) == customer.id
+    assert await repo.delete(record.id, customer.id)
+
+    assert await repo.verify(plain_key) is None
+    assert await repo.flush_last_used() == 0
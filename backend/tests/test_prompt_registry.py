@@ -0,0 +1,60 @@
+"""Tests for the cached prompt registry."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from core.services.prompt_registry import PromptRegistry
+from core.services.wizard_steps_services import (
+    CODE_GENERATION_PLACEHOLDERS,
+    CODE_GENERATION_PROMPT,
+)
+
+
+def _write(path: Path, prompt: str, mtime_ns: int) -> None:
+    _ = path.write_text(f"prompt: |\n  {prompt}\n")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_templates_are_parsed_once_without_hot_reload(tmp_path: Path) -> None:
+    path = tmp_path / "p.yaml"
+    _write(path, "first", 1_000_000_000)
+    registry = PromptRegistry(tmp_path)
+    registry.preload()
+
+    _write(path, "second", 2_000_000_000)
+
+    assert registry.get("p.yaml").field() == "first\n"
+    assert registry.get("p.yaml").source.startswith("prompt: |")
+
+
+def test_hot_reload_follows_mtime_and_keeps_last_good_version(
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "p.yaml"
+    _write(path, "Hello {NAME}", 1_000_000_000)
+    registry = PromptRegistry(tmp_path, hot_reload=True)
+    registry.require_placeholders("p.yaml", {"NAME"})
+
+    _write(path, "Hi {NAME}", 2_000_000_000)
+    assert registry.get("p.yaml").field() == "Hi {NAME}\n"
+
+    _write(path, "Hi {NAME} from {SENDER}", 3_000_000_000)
+    assert registry.get("p.yaml").field() == "Hi {NAME}\n"
+
+
+def test_unknown_placeholders_are_rejected_up_front(tmp_path: Path) -> None:
+    _write(tmp_path / "p.yaml", "Hello {NAME} {TYPO}", 1_000_000_000)
+    registry = PromptRegistry(tmp_path)
+
+    with pytest.raises(ValueError, match="TYPO"):
+        registry.require_placeholders("p.yaml", {"NAME"})
+
+
+def test_code_generation_prompt_formats_with_declared_placeholders() -> None:
+    template = PromptRegistry().get(CODE_GENERATION_PROMPT).field()
+
+    prompt = template.format(**{name: "" for name in CODE_GENERATION_PLACEHOLDERS})
+
+    assert prompt.startswith("Respond only with")
@@ -0,0 +1,54 @@
+"""Tests for the layered per-request environment mapping."""
+
+import pytest
+
+from core.services.request_context import DynamicEnvDict, request_env_vars
+
+
+def test_request_values_shadow_static_ones() -> None:
+    env = DynamicEnvDict({"A": "static", "B": "b"})
+    token = request_env_vars.set({"A": "request", "C": "c"})
+    try:
+        assert env["A"] == "request"
+        assert env.get("B") == "b"
+        assert "C" in env and "D" not in env
+        assert list(env) == ["A", "C", "B"]
+        assert len(env) == 3
+        assert dict(env.items()) == {"A": "request", "B": "b", "C": "c"}
+    finally:
+        request_env_vars.reset(token)
+
+    assert env["A"] == "static"
+    assert len(env) == 2
+
+
+def test_host_env_is_hidden_unless_allowlisted(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("HOST_ONLY_SECRET", "s3cret")
+    monkeypatch.setenv("HOST_ALLOWED", "ok")
+
+    env = DynamicEnvDict({"HOST_ALLOWED": "db"}, host_allowlist=["HOST_ALLOWED"])
+    assert "HOST_ONLY_SECRET" not in env
+    assert env["HOST_ALLOWED"] == "db"
+
+    env = DynamicEnvDict({}, host_allowlist=["HOST_ALLOWED", "MISSING"])
+    assert dict(env) == {"HOST_ALLOWED": "ok"}
+
+
+def test_snapshot_is_frozen_and_reused_within_a_request() -> None:
+    env = DynamicEnvDict({"A": "static"})
+    token = request_env_vars.set({"B": "request"})
+    try:
+        snapshot = env.snapshot()
+        assert dict(snapshot) == {"A": "static", "B": "request"}
+        assert env.snapshot() is snapshot
+        with pytest.raises(TypeError):
+            snapshot["A"] = "x"  # type: ignore[index]
+
+        env["A"] = "changed"
+        assert env.snapshot()["A"] == "changed"
+    finally:
+        request_env_vars.reset(token)
+
+    assert dict(env.snapshot()) == {"A": "changed"}
@@ -0,0 +1,77 @@
+"""Tests for cross-worker runtime events."""
+
+from contextlib import AsyncExitStack
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+
+from core.services.runtime_events import (
+    LocalRuntimeEventBus,
+    PostgresRuntimeEventBus,
+    RuntimeEvent,
+    RuntimeEventKind,
+)
+from core.services.tool_loader import get_tool_loader
+from entrypoints.mcp.shared_runtime import (
+    publish_runtime_event,
+    register_new_customer_app,
+    start_runtime_sync,
+)
+from infrastructure.repositories.repo_provider import Provider
+from settings import settings
+
+pytestmark = pytest.mark.anyio
+
+
+def _compile(server_id):
+    return get_tool_loader().compile_tool(
+        tool_id=str(uuid4()),
+        name="sync_tool",
+        description="Runtime sync test tool",
+        parameters=[],
+        code="async def sync_tool():\n    return 'ok'\n",
+        customer_id=uuid4(),
+        server_id=server_id,
+    )
+
+
+async def test_unmount_reaches_every_worker_but_the_publisher():
+    bus = LocalRuntimeEventBus()
+    worker_a, worker_b = FastAPI(), FastAPI()
+    server_id = uuid4()
+
+    async with AsyncExitStack() as stack:
+        for app in (worker_a, worker_b):
+            _ = await start_runtime_sync(app, stack, bus)
+            _ = await register_new_customer_app(
+                app, server_id, [_compile(server_id)], stack
+            )
+
+        await publish_runtime_event(worker_a, server_id, RuntimeEventKind.UNMOUNTED)
+
+        assert server_id in worker_a.state.mcp_dispatcher
+        assert server_id not in worker_b.state.mcp_dispatcher
+
+
+async def test_postgres_bus_replays_missed_events_in_order(provider: type[Provider]):
+    bus = PostgresRuntimeEventBus(str(settings.ASYNC_DB_DSN).replace("+asyncpg", ""))
+    received: list[RuntimeEvent] = []
+
+    async def _collect(event: RuntimeEvent) -> None:
+        received.append(event)
+
+    bus.subscribe(_collect)
+    assert await bus.catch_up() == 0
+
+    server_id = uuid4()
+    for kind in (RuntimeEventKind.MOUNTED, RuntimeEventKind.UNMOUNTED):
+        _ = await bus.publish(RuntimeEvent(server_id, kind, "other-worker"))
+
+    assert await bus.catch_up() == 2
+    assert [e.kind for e in received] == [
+        RuntimeEventKind.MOUNTED,
+        RuntimeEventKind.UNMOUNTED,
+    ]
+    assert received[0].seq < received[1].seq
+    assert await bus.catch_up() == 0
@@ -0,0 +1,124 @@
+"""Tests for consistent-hash sharding of shared servers."""
+
+from uuid import uuid4
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from core.services.sharding import HashRing, ShardAssignment
+from entrypoints.api import middleware
+from entrypoints.api.middleware import MCPAccessMiddleware
+from settings import settings
+
+pytestmark = pytest.mark.anyio
+
+NODES = ["http://node-a", "http://node-b", "http://node-c"]
+
+
+def test_adding_a_node_only_moves_keys_to_it() -> None:
+    keys = [str(uuid4()) for _ in range(3000)]
+    before = HashRing(NODES)
+    after = HashRing([*NODES, "http://node-d"])
+
+    moved = [k for k in keys if before.owner(k) != after.owner(k)]
+
+    assert all(after.owner(k) == "http://node-d" for k in moved)
+    assert 0.15 < len(moved) / len(keys) < 0.35
+    for node in NODES:
+        share = sum(before.owner(k) == node for k in keys) / len(keys)
+        assert 0.2 < share < 0.45
+
+
+def test_unknown_self_node_is_rejected() -> None:
+    with pytest.raises(ValueError, match="MCP_SHARD_SELF"):
+        _ = ShardAssignment(NODES, "http://elsewhere")
+
+
+async def _echo(request: Request) -> JSONResponse:
+    return JSONResponse(
+        {
+            "authorization": request.headers.get("authorization"),
+            "forwarded": request.headers.get("x-mcp-shard-forwarded"),
+            "query": request.url.query,
+            "body": (await request.body()).decode(),
+        }
+    )
+
+
+def _node_app(shards: ShardAssignment) -> Starlette:
+    app = Starlette(routes=[Route("/mcp/{server_id}/mcp", _echo, methods=["POST"])])
+    app.add_middleware(MCPAccessMiddleware, shards=shards)
+    return app
+
+
+async def test_requests_for_other_shards_are_proxied_to_the_owner(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    assignments = {node: ShardAssignment(NODES, node) for node in NODES}
+    nodes = {node: _node_app(assignments[node]) for node in NODES}
+    proxy = AsyncClient(
+        mounts={f"{node}/": ASGITransport(app=app) for node, app in nodes.items()}
+    )
+    monkeypatch.setattr(middleware, "_shard_proxy_client", proxy)
+
+    assignment = assignments["http://node-a"]
+    ids = [uuid4() for _ in range(30)]
+    local = next(i for i in ids if assignment.owns(i))
+    remote = next(i for i in ids if not assignment.owns(i))
+    headers = {"Authorization": f"Bearer {settings.ADMIN_ROUTES_API_KEY}"}
+
+    transport = ASGITransport(app=nodes["http://node-a"])
+    async with AsyncClient(transport=transport, base_url="http://node-a") as client:
+        response = await client.post(f"/mcp/{local}/mcp", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["forwarded"] is None
+
+        # The owner gets the caller's Authorization header and accepts it
+        response = await client.post(
+            f"/mcp/{remote}/mcp?x=1", headers=headers, content=b"payload"
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            "authorization": headers["Authorization"],
+            "forwarded": "1",
+            "query": "x=1",
+            "body": "payload",
+        }
+
+        # Without credentials the owner, not the proxy, rejects the call
+        response = await client.post(f"/mcp/{remote}/mcp")
+        assert response.status_code == 401
+        assert "resource_metadata" in response.headers["www-authenticate"]
+
+    await proxy.aclose()
+
+
+async def test_forwarded_requests_are_never_forwarded_again(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # node-b thinks node-a owns everything and node-a thinks node-b does
+    node_a = _node_app(
+        ShardAssignment(["http://node-a", "http://node-b"], "http://node-a")
+    )
+    forwarded: list[str] = []
+
+    async def _node_b(scope, receive, send) -> None:
+        forwarded.append(scope["path"])
+        await node_a(scope, receive, send)
+
+    proxy = AsyncClient(mounts={"http://node-b/": ASGITransport(app=_node_b)})
+    monkeypatch.setattr(middleware, "_shard_proxy_client", proxy)
+    assignment = ShardAssignment(["http://node-a", "http://node-b"], "http://node-a")
+    remote = next(i for i in iter(uuid4, None) if not assignment.owns(i))
+
+    transport = ASGITransport(app=node_a)
+    async with AsyncClient(transport=transport, base_url="http://node-a") as client:
+        response = await client.post(f"/mcp/{remote}/mcp")
+
+    assert response.status_code == 421
+    assert forwarded == [f"/mcp/{remote}/mcp"]
+    await proxy.aclose()
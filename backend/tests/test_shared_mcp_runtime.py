@@ -1,17 +1,27 @@
 """Tests for shared MCP runtime - lifespan loading and dynamic registration."""
 
+import asyncio
+import json
+import time
 from contextlib import AsyncExitStack
 from typing import Type
+from uuid import uuid4
 
 import pytest
 from fastapi import FastAPI
 from fastmcp import Client
+from httpx import ASGITransport, AsyncClient
 
 from core.services.tier_service import Tier
 from core.services.tool_loader import get_tool_loader
 from entrypoints.mcp.shared_runtime import (
+    MCP_MOUNT_PATH,
+    LazyServerPool,
+    get_mcp_dispatcher,
     load_and_register_all_mcp_servers,
+    load_lazy_routing_table,
     register_new_customer_app,
+    unregister_mcp_app,
 )
 from fixtures import make_simple_tool_code
 from infrastructure.models import Customer
@@ -399,3 +409,318 @@ class TestMultipleServers:
             result = await client.call_tool(tools[0].name, {})
             assert len(result.content) == 1
             assert result.content[0].text == "deployed"
+
+
+class TestParallelStartup:
+    """Test the bounded-concurrency startup pipeline."""
+
+    async def test_startup_report_covers_every_server(
+        self, provider: type[Provider], customer: Customer
+    ):
+        """Each active server gets a timing entry, regardless of concurrency."""
+        server_ids = []
+        for i in range(4):
+            server = await Provider.mcp_server_repo().create(
+                MCPServerCreate(
+                    name=f"parallel_server_{i}",
+                    description=f"Parallel startup server {i}",
+                    customer_id=str(customer.id),
+                )
+            )
+            await Provider.mcp_tool_repo().create(
+                MCPToolCreate(
+                    server_id=server.id,
+                    name=f"parallel_tool_{i}",
+                    description=f"Parallel tool {i}",
+                    parameters_schema={"parameters": []},
+                    code=make_simple_tool_code(f"parallel_{i}"),
+                )
+            )
+            await Provider.deployment_repo().create(
+                DeploymentCreate(
+                    server_id=server.id,
+                    target=DeploymentTarget.SHARED.value,
+                    status=DeploymentStatus.ACTIVE.value,
+                    endpoint_url=f"/mcp/{server.id}",
+                )
+            )
+            server_ids.append(server.id)
+
+        app = FastAPI()
+        async with AsyncExitStack() as stack:
+            registered_servers = await load_and_register_all_mcp_servers(
+                app, stack, concurrency=2
+            )
+
+        assert set(registered_servers) == set(server_ids)
+        report = app.state.mcp_startup_report
+        assert {timing.server_id for timing in report} == set(server_ids)
+        assert all(timing.registered for timing in report)
+        assert all(timing.compile_ms >= 0 for timing in report)
+
+
+class TestDispatcher:
+    """Test routing through the single /mcp/{server_id} dispatcher."""
+
+    @staticmethod
+    def _compile(server_id, value: str):
+        return get_tool_loader().compile_tool(
+            tool_id=str(uuid4()),
+            name="dispatch_tool",
+            description="Dispatcher test tool",
+            parameters=[],
+            code=f"async def dispatch_tool():\n    return {value!r}\n",
+            customer_id=uuid4(),
+            server_id=server_id,
+        )
+
+    async def test_remount_does_not_add_routes(self):
+        """Registering the same server twice swaps the app instead of mounting again."""
+        app = FastAPI()
+        server_id = uuid4()
+        route_count = len(app.routes)
+
+        async with AsyncExitStack() as stack:
+            _ = await register_new_customer_app(
+                app, server_id, [self._compile(server_id, "v1")], stack
+            )
+            mcp_v2 = await register_new_customer_app(
+                app, server_id, [self._compile(server_id, "v2")], stack
+            )
+
+            mounts = [
+                r for r in app.routes if getattr(r, "path", None) == MCP_MOUNT_PATH
+            ]
+            assert len(mounts) == 1
+            assert len(app.routes) == route_count + 1
+            assert app.state.mcp_dispatcher.get(server_id) is not None
+
+            async with Client(mcp_v2) as client:
+                result = await client.call_tool("dispatch_tool", {})
+                assert result.content[0].text == "v2"
+
+    async def test_unregistered_server_returns_404(self):
+        app = FastAPI()
+        server_id = uuid4()
+
+        async with AsyncExitStack() as stack:
+            _ = await register_new_customer_app(
+                app, server_id, [self._compile(server_id, "v1")], stack
+            )
+            assert unregister_mcp_app(app, server_id) is True
+            assert unregister_mcp_app(app, server_id) is False
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as c:
+                response = await c.post(f"/mcp/{server_id}/mcp", json={})
+            assert response.status_code == 404
+
+
+INITIALIZE_REQUEST = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-06-18",
+        "capabilities": {},
+        "clientInfo": {"name": "test", "version": "0"},
+    },
+}
+
+
+def _install_lazy_pool(app: FastAPI, max_resident: int = 8) -> LazyServerPool:
+    dispatcher = get_mcp_dispatcher(app)
+    dispatcher.lazy_pool = LazyServerPool(
+        app, dispatcher, [], idle_ttl=60.0, max_resident=max_resident
+    )
+    return dispatcher.lazy_pool
+
+
+async def _register(app: FastAPI, server_id, stack: AsyncExitStack, value="v"):
+    return await register_new_customer_app(
+        app, server_id, [TestDispatcher._compile(server_id, value)], stack
+    )
+
+
+class TestServerLifecycle:
+    """Test that replaced and removed sub-apps have their lifespans closed."""
+
+    async def test_remount_closes_previous_lifespan(self):
+        app = FastAPI()
+        server_id = uuid4()
+
+        async with AsyncExitStack() as stack:
+            handles = []
+            for version in ("v1", "v2", "v3", "v4"):
+                _ = await _register(app, server_id, stack, version)
+                handles.append(app.state.mcp_dispatcher.get_handle(server_id))
+            dispatcher = app.state.mcp_dispatcher
+            _ = await asyncio.gather(*(h.task for h in handles[:-1]))
+
+            assert dispatcher.live_lifespans == 1
+            assert dispatcher.get_handle(server_id) is handles[-1]
+
+            assert unregister_mcp_app(app, server_id) is True
+            await handles[-1].task
+            assert dispatcher.live_lifespans == 0
+
+    async def test_retired_app_drains_in_flight_request(self):
+        """A request that started on the old app finishes before it is closed."""
+        app = FastAPI()
+        server_id = uuid4()
+        body = json.dumps(INITIALIZE_REQUEST).encode()
+        body_ready = asyncio.Event()
+        messages: list[dict] = []
+        received: list[bytes] = []
+
+        async def receive():
+            if received:
+                return {"type": "http.disconnect"}
+            await body_ready.wait()
+            received.append(body)
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": f"/mcp/{server_id}/mcp",
+            "raw_path": f"/mcp/{server_id}/mcp".encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [
+                (b"host", b"test"),
+                (b"content-type", b"application/json"),
+                (b"accept", b"application/json, text/event-stream"),
+            ],
+            "server": ("test", 80),
+            "client": ("test", 1234),
+        }
+
+        async with AsyncExitStack() as stack:
+            _ = await _register(app, server_id, stack, "v1")
+            dispatcher = app.state.mcp_dispatcher
+            old = dispatcher.get_handle(server_id)
+
+            request = asyncio.create_task(app(scope, receive, send))
+            while old.in_flight == 0:
+                await asyncio.sleep(0)
+
+            _ = await _register(app, server_id, stack, "v2")
+            assert dispatcher.live_lifespans == 2
+            assert not old.task.done()
+
+            body_ready.set()
+            await request
+            await old.task
+
+            assert messages[0]["status"] == 200
+            assert dispatcher.live_lifespans == 1
+
+
+class TestLazyActivation:
+    """Test on-demand activation, idle eviction and the resident LRU cap."""
+
+    async def test_idle_server_is_stopped_but_stays_routable(self):
+        app = FastAPI()
+        pool = _install_lazy_pool(app)
+        server_id = uuid4()
+
+        async with AsyncExitStack() as stack:
+            _ = await _register(app, server_id, stack)
+            handle = app.state.mcp_dispatcher.get_handle(server_id)
+            handle.in_flight += 1
+            assert pool.evict_idle(now=time.monotonic() + 3600) == []
+            handle.in_flight -= 1
+
+            assert pool.evict_idle(now=time.monotonic() + 3600) == [server_id]
+            assert not pool.is_resident(server_id)
+            assert server_id in pool
+            assert app.state.mcp_dispatcher.get(server_id) is None
+            await handle.task
+
+    async def test_evicted_server_releases_its_compiled_tools(self):
+        app = FastAPI()
+        pool = _install_lazy_pool(app)
+        server_id = uuid4()
+        loader = get_tool_loader()
+
+        async with AsyncExitStack() as stack:
+            _ = await _register(app, server_id, stack)
+            handle = app.state.mcp_dispatcher.get_handle(server_id)
+            tool = next(
+                e.tool for k, e in loader._tool_cache.items() if k[0] == server_id
+            )
+            assert server_id in loader._customer_namespaces
+
+            assert pool.evict_idle(now=time.monotonic() + 3600) == [server_id]
+            await handle.task
+
+            assert server_id not in loader._customer_namespaces
+            assert all(k[0] != server_id for k in loader._tool_cache)
+            assert all(t is not tool for t in loader._compiled_tools.values())
+            assert server_id in pool
+
+    async def test_lru_cap_skips_servers_with_requests_in_flight(self):
+        app = FastAPI()
+        pool = _install_lazy_pool(app, max_resident=2)
+        first, second, third = uuid4(), uuid4(), uuid4()
+
+        async with AsyncExitStack() as stack:
+            for server_id in (first, second):
+                _ = await _register(app, server_id, stack)
+            busy = app.state.mcp_dispatcher.get_handle(first)
+            busy.in_flight += 1
+
+            # first is busy, so the least recently used idle server goes
+            _ = await _register(app, third, stack)
+            assert pool.is_resident(first)
+            assert not pool.is_resident(second)
+            assert pool.is_resident(third)
+            assert pool.resident_count == 2
+            busy.in_flight -= 1
+
+    async def test_resident_server_is_served_through_dispatcher(self):
+        app = FastAPI()
+        pool = _install_lazy_pool(app)
+        server_id = uuid4()
+
+        async with AsyncExitStack() as stack:
+            _ = await _register(app, server_id, stack)
+            assert pool.is_resident(server_id)
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as c:
+                response = await c.post(
+                    f"/mcp/{server_id}/mcp",
+                    headers={"Accept": "application/json, text/event-stream"},
+                    json=INITIALIZE_REQUEST,
+                )
+                assert response.status_code == 200
+
+                assert unregister_mcp_app(app, server_id) is True
+                assert server_id not in pool
+                response = await c.post(f"/mcp/{server_id}/mcp", json={})
+                assert response.status_code == 404
+
+    async def test_routing_table_defers_compilation(
+        self, active_server_with_tool: tuple[MCPServer, MCPTool]
+    ):
+        """Boot loads only ids; the first request compiles and starts the server."""
+        server, _ = active_server_with_tool
+        app = FastAPI()
+
+        async with AsyncExitStack() as stack:
+            pool = await load_lazy_routing_table(app, stack)
+            assert server.id in pool
+            assert pool.resident_count == 0
+
+            handle = await pool.activate(server.id)
+            assert handle is not None
+            assert pool.is_resident(server.id)
+            assert await pool.activate(server.id) is handle
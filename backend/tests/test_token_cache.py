@@ -0,0 +1,231 @@
+"""Unit tests for the validated access token cache and revocation index."""
+
+import time
+from datetime import UTC, datetime, timedelta
+from uuid import UUID, uuid4
+
+import pytest
+
+from core.services.oauth_service import OAuthService
+from core.services.token_cache import (
+    AccessTokenCache,
+    LocalRevocationChannel,
+    RevocationIndex,
+    TokenRevocation,
+)
+from infrastructure.repositories.oauth import RevokedAccessToken
+from infrastructure.repositories.repo_provider import Provider
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _claims(jti: str, sub: str = "user-1", aud: str = "srv-1", exp: float = 2_000):
+    return {"jti": jti, "sub": sub, "aud": aud, "exp": exp}
+
+
+def test_hit_requires_same_token_and_audience() -> None:
+    cache = AccessTokenCache(clock=FakeClock())
+    cache.put("token-a", "srv-1", _claims("a"))
+
+    assert cache.get("token-a", "srv-1") == _claims("a")
+    assert cache.get("token-a", "srv-2") is None
+    assert cache.get("token-b", "srv-1") is None
+
+    stats = cache.stats
+    assert stats.hits == 1
+    assert stats.misses == 2
+
+
+def test_entry_expires_at_token_exp() -> None:
+    clock = FakeClock()
+    cache = AccessTokenCache(max_ttl=10_000, clock=clock)
+    cache.put("token-a", "srv-1", _claims("a", exp=1_050))
+
+    clock.now = 1_049
+    assert cache.get("token-a", "srv-1") is not None
+    clock.now = 1_050
+    assert cache.get("token-a", "srv-1") is None
+    assert cache.stats.entries == 0
+
+
+def test_max_ttl_caps_long_lived_tokens() -> None:
+    clock = FakeClock()
+    cache = AccessTokenCache(max_ttl=60, clock=clock)
+    cache.put("token-a", "srv-1", _claims("a", exp=1_000_000))
+
+    clock.now += 61
+    assert cache.get("token-a", "srv-1") is None
+
+
+def test_lru_bound_evicts_least_recently_used() -> None:
+    cache = AccessTokenCache(max_entries=2, clock=FakeClock())
+    cache.put("token-a", "srv-1", _claims("a"))
+    cache.put("token-b", "srv-1", _claims("b"))
+    _ = cache.get("token-a", "srv-1")
+    cache.put("token-c", "srv-1", _claims("c"))
+
+    assert cache.get("token-a", "srv-1") is not None
+    assert cache.get("token-b", "srv-1") is None
+    assert cache.stats.entries == 2
+
+
+def test_invalidate_by_jti_and_by_user() -> None:
+    cache = AccessTokenCache(clock=FakeClock())
+    cache.put("token-a", "srv-1", _claims("a"))
+    cache.put("token-b", "srv-1", _claims("b"))
+    cache.put("token-c", "srv-2", _claims("c", aud="srv-2"))
+
+    assert cache.invalidate(TokenRevocation(jti="a")) == 1
+    assert cache.invalidate(TokenRevocation(user_id="user-1", audience="srv-1")) == 1
+    assert cache.get("token-b", "srv-1") is None
+    assert cache.get("token-c", "srv-2") is not None
+
+
+def test_put_after_concurrent_revocation_is_dropped() -> None:
+    cache = AccessTokenCache(clock=FakeClock())
+    generation = cache.generation
+    _ = cache.invalidate(TokenRevocation(jti="a"))
+
+    cache.put("token-a", "srv-1", _claims("a"), generation=generation)
+    assert cache.get("token-a", "srv-1") is None
+
+
+@pytest.mark.anyio
+async def test_channel_publish_invalidates_subscribed_caches() -> None:
+    channel = LocalRevocationChannel()
+    caches = [AccessTokenCache(clock=FakeClock()) for _ in range(2)]
+    for cache in caches:
+        cache.put("token-a", "srv-1", _claims("a"))
+        channel.subscribe(cache.invalidate)
+
+    await channel.publish(TokenRevocation(jti="a"))
+
+    assert all(cache.get("token-a", "srv-1") is None for cache in caches)
+
+
+class FakeRevocationLoader:
+    def __init__(self) -> None:
+        self.rows: list[RevokedAccessToken] = []
+        self.calls: list[datetime | None] = []
+
+    async def __call__(self, since: datetime | None) -> list[RevokedAccessToken]:
+        self.calls.append(since)
+        return [r for r in self.rows if since is None or r.updated_at >= since]
+
+
+def _revoked(jti: str, updated_at: datetime, ttl: float = 3600) -> RevokedAccessToken:
+    return RevokedAccessToken(
+        jti=jti,
+        expires_at=datetime.now(UTC) + timedelta(seconds=ttl),
+        updated_at=updated_at,
+    )
+
+
+@pytest.mark.anyio
+async def test_revocation_index_fails_closed_until_loaded_and_when_stale() -> None:
+    clock = FakeClock()
+    index = RevocationIndex(FakeRevocationLoader(), max_staleness=30, clock=clock)
+
+    assert index.might_be_revoked("any")
+    _ = await index.refresh()
+    assert not index.might_be_revoked("any")
+
+    clock.now += 31
+    assert index.might_be_revoked("any")
+
+
+@pytest.mark.anyio
+async def test_revocation_index_loads_incrementally_by_updated_at() -> None:
+    loader = FakeRevocationLoader()
+    index = RevocationIndex(loader, clock=FakeClock())
+    t0 = datetime(2026, 1, 1, 12, 0, 0)
+    loader.rows = [_revoked("a", t0), _revoked("expired", t0, ttl=-1)]
+
+    assert await index.refresh() == 2
+    assert index.might_be_revoked("a")
+    assert not index.might_be_revoked("expired")
+    assert len(index) == 1
+
+    loader.rows.append(_revoked("b", t0 + timedelta(minutes=1)))
+    _ = await index.refresh()
+
+    assert loader.calls[-1] == t0 - RevocationIndex.WATERMARK_OVERLAP
+    assert index.might_be_revoked("b")
+    assert not index.might_be_revoked("c")
+
+
+@pytest.mark.anyio
+async def test_revocation_index_add_applies_local_revocations_immediately() -> None:
+    index = RevocationIndex(FakeRevocationLoader(), clock=FakeClock())
+    _ = await index.refresh()
+
+    index.add("local", expires_at=4_102_444_800)
+
+    assert index.might_be_revoked("local")
+
+
+@pytest.mark.anyio
+async def test_refresh_drops_cached_tokens_revoked_on_another_worker() -> None:
+    loader = FakeRevocationLoader()
+    cache = AccessTokenCache(clock=FakeClock())
+    index = RevocationIndex(loader, clock=FakeClock(), on_revoked=cache.invalidate_jtis)
+    _ = await index.refresh()
+    cache.put("token-a", "srv-1", _claims("a"))
+    cache.put("token-b", "srv-1", _claims("b"))
+
+    # Another worker revokes "a"; this worker only sees it through the DB
+    loader.rows.append(_revoked("a", datetime(2026, 1, 1, 12, 0, 0)))
+    _ = await index.refresh()
+
+    assert cache.get("token-a", "srv-1") is None
+    assert cache.get("token-b", "srv-1") is not None
+    assert index.might_be_revoked("a")
+
+
+class FakeTokenRepo:
+    def __init__(self) -> None:
+        self.revoked: list[tuple[str, UUID | None]] = []
+
+    async def revoke_all_for_user(self, user_id: str, server_id: UUID | None) -> int:
+        self.revoked.append((user_id, server_id))
+        return 1
+
+    async def get_revoked_since(
+        self, since: datetime | None
+    ) -> list[RevokedAccessToken]:
+        return []
+
+
+@pytest.mark.anyio
+async def test_revoke_all_for_user_invalidates_cached_tokens(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    access, refresh = FakeTokenRepo(), FakeTokenRepo()
+    monkeypatch.setattr(Provider, "_oauth_access_token_repo", access)
+    monkeypatch.setattr(Provider, "_oauth_refresh_token_repo", refresh)
+    service = OAuthService()
+    server_a, server_b = uuid4(), uuid4()
+    exp = time.time() + 3600
+    for token, sub, aud in [
+        ("a1", "user-1", server_a),
+        ("b1", "user-1", server_b),
+        ("a2", "user-2", server_a),
+    ]:
+        service.token_cache.put(token, str(aud), _claims(token, sub, str(aud), exp))
+
+    assert await service.revoke_all_for_user("user-1", server_a) == 2
+    assert access.revoked == refresh.revoked == [("user-1", server_a)]
+    assert service.token_cache.get("a1", str(server_a)) is None
+    assert service.token_cache.get("b1", str(server_b)) is not None
+    assert service.token_cache.get("a2", str(server_a)) is not None
+
+    # Without a server every audience of the user is dropped
+    _ = await service.revoke_all_for_user("user-1")
+    assert service.token_cache.get("b1", str(server_b)) is None
+    assert service.token_cache.get("a2", str(server_a)) is not None
@@ -0,0 +1,167 @@
+"""Tests for the runtime-managed database pools handed to tool code."""
+
+import asyncio
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+from core.services import tool_db
+from core.services.tool_db import (
+    PoolDriver,
+    ToolDBPoolError,
+    ToolDBPoolRegistry,
+    resolve_driver,
+)
+from core.services.tool_loader import DynamicToolLoader
+
+pytestmark = pytest.mark.anyio
+
+
+class FakePool:
+    def __init__(self, dsn: str) -> None:
+        self.dsn = dsn
+        self.closed = False
+        self.max_size = 3
+
+
+@pytest.fixture
+def opened(monkeypatch: pytest.MonkeyPatch) -> list[FakePool]:
+    pools: list[FakePool] = []
+
+    async def _open(dsn: str, max_size: int, idle_seconds: float) -> Any:
+        await asyncio.sleep(0)
+        pools.append(FakePool(dsn))
+        return pools[-1]
+
+    async def _close(pool: Any, timeout: float) -> None:
+        pool.closed = True
+
+    monkeypatch.setitem(tool_db.DRIVERS, "fake", PoolDriver(_open, _close))
+    return pools
+
+
+@pytest.fixture
+def registry(monkeypatch: pytest.MonkeyPatch):
+    registry = ToolDBPoolRegistry(max_pools=2, max_size=3, idle_seconds=60)
+    monkeypatch.setattr(tool_db, "_tool_db_pools", registry)
+    yield registry
+    if registry._reaper is not None:
+        _ = registry._reaper.cancel()
+
+
+def test_driver_follows_the_dsn() -> None:
+    assert resolve_driver("postgresql://u:p@db/app") == "asyncpg"
+    assert resolve_driver("postgresql+psycopg://u:p@db/app") == "psycopg"
+    assert resolve_driver("mysql://u:p@db/app") == "aiomysql"
+    assert resolve_driver("postgres://db/app", driver="psycopg") == "psycopg"
+    with pytest.raises(ToolDBPoolError, match="sqlite"):
+        _ = resolve_driver("sqlite:///app.db")
+
+
+async def test_pools_are_shared_capped_and_reaped(
+    opened: list[FakePool], registry: ToolDBPoolRegistry
+) -> None:
+    server_id = uuid4()
+
+    first, again = await asyncio.gather(
+        registry.acquire(server_id, "fake://db/1"),
+        registry.acquire(server_id, "fake://db/1"),
+    )
+    assert first is again and len(opened) == 1
+
+    # A third DSN closes the server's least recently used pool
+    _ = await registry.acquire(server_id, "fake://db/2")
+    _ = await registry.acquire(server_id, "fake://db/1")
+    _ = await registry.acquire(server_id, "fake://db/3")
+    await asyncio.gather(*registry._closing)
+    assert [p.dsn for p in opened if p.closed] == ["fake://db/2"]
+    assert registry.pool_count(server_id) == 2
+
+    # A pool closed by tool code is reopened
+    opened[0].closed = True
+    assert await registry.acquire(server_id, "fake://db/1") is not first
+
+    for entry in registry._pools.values():
+        entry.last_used -= 120
+    assert await registry.reap_idle() == 2
+    assert registry.pool_count() == 0
+    assert all(p.closed for p in opened)
+
+
+async def test_pools_leased_by_a_call_are_not_closed_under_it(
+    opened: list[FakePool], registry: ToolDBPoolRegistry
+) -> None:
+    server_id = uuid4()
+    holding, release = asyncio.Event(), asyncio.Event()
+
+    async def _call() -> int:
+        pool = await registry.acquire(server_id, "fake://db/1")
+        holding.set()
+        await release.wait()
+        return pool.max_size
+
+    call = asyncio.create_task(registry.leased(_call)())
+    await holding.wait()
+
+    # Other DSNs (e.g. a caller's X-Env-* override) evict around the lease
+    _ = await registry.acquire(server_id, "fake://db/2")
+    _ = await registry.acquire(server_id, "fake://db/3")
+    await asyncio.gather(*registry._closing)
+    assert [p.dsn for p in opened if p.closed] == ["fake://db/2"]
+
+    # Neither the idle reaper nor retiring the server closes it either
+    for entry in registry._pools.values():
+        entry.last_used -= 120
+    assert await registry.reap_idle() == 1
+    registry.retire_server(server_id)
+    assert await registry.reap_idle() == 0
+    assert not opened[0].closed
+
+    release.set()
+    assert await call == 3
+    assert await registry.reap_idle() == 1
+    assert opened[0].closed
+
+
+async def test_tool_pools_follow_env_vars_and_unmount(
+    opened: list[FakePool], registry: ToolDBPoolRegistry
+) -> None:
+    loader = DynamicToolLoader()
+    code = (
+        "async def query():\n"
+        "    pool = await get_db_pool('DATABASE_URL')\n"
+        "    return pool\n"
+    )
+    customer_id, server_id = uuid4(), uuid4()
+
+    def _compile(dsn: str) -> Any:
+        _ = loader.compile_tool(
+            "t1",
+            "query",
+            "d",
+            [],
+            code,
+            customer_id,
+            env_vars={"DATABASE_URL": dsn},
+            server_id=server_id,
+        )
+        return loader._customer_namespaces[server_id]["query"]
+
+    query = _compile("fake://db/old")
+    old = await query()
+    assert await query() is old
+
+    # New env vars retire the old pool instead of reusing it, even when the
+    # recompile runs in a worker thread as it does at startup
+    query = await asyncio.to_thread(_compile, "fake://db/new")
+    assert registry.pool_count(server_id) == 0
+    assert not old.closed
+    new = await query()
+    assert new.dsn == "fake://db/new"
+    _ = await registry.reap_idle()
+    assert old.closed and not new.closed
+
+    await registry.close_server(server_id)
+    assert new.closed
+    assert registry.pool_count() == 0
@@ -0,0 +1,95 @@
+"""Tests for per-tool timeouts and concurrency limits in the shared runtime."""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import ToolError
+from fastmcp.tools.tool import FunctionTool
+
+from core.services.metrics import mcp_tool_rejections_total
+from core.services.tool_limits import ToolExecutionLimiter
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_slow_tool_times_out_with_mcp_error():
+    limiter = ToolExecutionLimiter(timeout=0.05)
+    server_id = uuid4()
+
+    async def slow_tool(seconds: float) -> str:
+        await asyncio.sleep(seconds)
+        return "done"
+
+    tool = FunctionTool.from_function(
+        limiter.wrap(slow_tool, "slow_tool", server_id, uuid4())
+    )
+    assert tool.parameters["properties"] == {"seconds": {"type": "number"}}
+
+    async with Client(FastMCP("limits", tools=[tool])) as client:
+        fast = await client.call_tool("slow_tool", {"seconds": 0})
+        slow = await client.call_tool("slow_tool", {"seconds": 1}, raise_on_error=False)
+
+    assert fast.data == "done"
+    assert slow.is_error
+    assert "timed out" in slow.content[0].text
+    assert mcp_tool_rejections_total.value(str(server_id), "slow_tool", "timeout") == 1
+
+
+async def test_tool_raising_timeout_error_is_not_counted_as_timeout():
+    limiter = ToolExecutionLimiter(timeout=5)
+    server_id = uuid4()
+
+    async def flaky() -> None:
+        raise TimeoutError("upstream")
+
+    with pytest.raises(TimeoutError, match="upstream"):
+        await limiter.wrap(flaky, "flaky", server_id, uuid4())()
+    assert mcp_tool_rejections_total.value(str(server_id), "flaky", "timeout") == 0
+
+
+async def test_server_semaphore_rejects_when_queue_wait_expires():
+    limiter = ToolExecutionLimiter(server_concurrency=1, queue_timeout=0.01)
+    server_id = uuid4()
+    release = asyncio.Event()
+
+    async def blocking() -> str:
+        _ = await release.wait()
+        return "ok"
+
+    call = limiter.wrap(blocking, "blocking", server_id, uuid4())
+    first = asyncio.create_task(call())
+    await asyncio.sleep(0)
+
+    with pytest.raises(ToolError, match="busy"):
+        await limiter.wrap(blocking, "blocking", server_id, uuid4())()
+
+    release.set()
+    assert await first == "ok"
+    assert (
+        mcp_tool_rejections_total.value(str(server_id), "blocking", "server_busy") == 1
+    )
+
+
+async def test_customer_in_flight_cap_spans_servers():
+    limiter = ToolExecutionLimiter(customer_in_flight=1)
+    customer_id = uuid4()
+    release = asyncio.Event()
+
+    async def blocking() -> str:
+        _ = await release.wait()
+        return "ok"
+
+    first = asyncio.create_task(
+        limiter.wrap(blocking, "blocking", uuid4(), customer_id)()
+    )
+    await asyncio.sleep(0)
+    assert limiter.in_flight(customer_id) == 1
+
+    with pytest.raises(ToolError, match="Too many concurrent"):
+        await limiter.wrap(blocking, "blocking", uuid4(), customer_id)()
+
+    release.set()
+    assert await first == "ok"
+    assert limiter.in_flight(customer_id) == 0
@@ -0,0 +1,283 @@
+"""Unit tests for the DynamicToolLoader compiled-tool cache."""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from core.services.tier_service import Tier
+from core.services.tool_http import ServerHTTPClient
+from core.services.tool_loader import DynamicToolLoader
+
+
+def _code(name: str, value: str) -> str:
+    return f"async def {name}():\n    return {value!r}\n"
+
+
+def test_unchanged_tool_is_reused() -> None:
+    """Recompiling identical code for the same server returns the cached tool."""
+    loader = DynamicToolLoader()
+    customer_id, server_id = uuid4(), uuid4()
+
+    first = loader.compile_tool(
+        "t1",
+        "greet",
+        "desc",
+        [],
+        _code("greet", "hi"),
+        customer_id,
+        server_id=server_id,
+    )
+    second = loader.compile_tool(
+        "t1",
+        "greet",
+        "desc",
+        [],
+        _code("greet", "hi"),
+        customer_id,
+        server_id=server_id,
+    )
+
+    assert second is first
+    stats = loader.cache_stats
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.entries == 1
+
+
+def test_description_change_reuses_compiled_function() -> None:
+    """A description-only edit keeps the function but updates the tool metadata."""
+    loader = DynamicToolLoader()
+    customer_id, server_id = uuid4(), uuid4()
+
+    first = loader.compile_tool(
+        "t1", "greet", "old", [], _code("greet", "hi"), customer_id, server_id=server_id
+    )
+    second = loader.compile_tool(
+        "t1", "greet", "new", [], _code("greet", "hi"), customer_id, server_id=server_id
+    )
+
+    assert second.description == "new"
+    assert second.fn is first.fn
+    assert loader.cache_stats.hits == 1
+
+
+def test_code_env_and_tier_changes_miss() -> None:
+    """Code, env vars and tier are all part of the cache key."""
+    loader = DynamicToolLoader()
+    customer_id, server_id = uuid4(), uuid4()
+
+    def compile_with(code: str, env: dict[str, str], tier: Tier):
+        return loader.compile_tool(
+            "t1",
+            "greet",
+            "desc",
+            [],
+            code,
+            customer_id,
+            tier=tier,
+            env_vars=env,
+            server_id=server_id,
+        )
+
+    _ = compile_with(_code("greet", "a"), {}, Tier.FREE)
+    _ = compile_with(_code("greet", "b"), {}, Tier.FREE)
+    _ = compile_with(_code("greet", "b"), {"KEY": "v"}, Tier.FREE)
+    _ = compile_with(_code("greet", "b"), {"KEY": "v"}, Tier.PAID)
+
+    stats = loader.cache_stats
+    assert stats.hits == 0
+    assert stats.misses == 4
+    # Replaced in place, not accumulated
+    assert stats.entries == 1
+
+
+def test_code_object_shared_across_servers() -> None:
+    """Identical source on different servers is compiled to bytecode once."""
+    loader = DynamicToolLoader()
+    customer_id = uuid4()
+    code = _code("greet", "hi")
+
+    a = loader.compile_tool(
+        "t1", "greet", "d", [], code, customer_id, server_id=uuid4()
+    )
+    b = loader.compile_tool(
+        "t2", "greet", "d", [], code, customer_id, server_id=uuid4()
+    )
+
+    assert a is not b
+    assert a.fn.__code__ is b.fn.__code__
+    stats = loader.cache_stats
+    assert stats.code_misses == 1
+    assert stats.code_hits == 1
+
+
+def test_invalidate_server_tools_drops_entries() -> None:
+    loader = DynamicToolLoader()
+    customer_id, server_id = uuid4(), uuid4()
+    code = _code("greet", "hi")
+
+    _ = loader.compile_tool(
+        "t1", "greet", "d", [], code, customer_id, server_id=server_id
+    )
+    loader.invalidate_server_tools(server_id)
+    _ = loader.compile_tool(
+        "t1", "greet", "d", [], code, customer_id, server_id=server_id
+    )
+
+    assert loader.cache_stats.misses == 2
+
+
+def test_namespaces_share_read_only_builtins_and_own_only_overlay() -> None:
+    """Servers share one builtins mapping; their namespaces hold only what differs."""
+    loader = DynamicToolLoader()
+    customer_id, server_a, server_b = uuid4(), uuid4(), uuid4()
+    for server_id in (server_a, server_b):
+        _ = loader.compile_tool(
+            "t1",
+            "greet",
+            "d",
+            [],
+            _code("greet", "hi"),
+            customer_id,
+            server_id=server_id,
+        )
+
+    ns_a = loader._customer_namespaces[server_a]
+    ns_b = loader._customer_namespaces[server_b]
+    shared = ns_a["__builtins__"]
+    assert ns_b["__builtins__"] is shared
+    assert "json" in shared and "len" in shared
+    assert "open" not in shared and "os" not in shared
+    with pytest.raises(TypeError):
+        shared["len"] = None  # type: ignore[index]
+    assert "json" not in ns_a
+    assert ns_a["os"] is not ns_b["os"]
+
+
+def test_os_import_resolves_to_the_servers_mock_os() -> None:
+    loader = DynamicToolLoader()
+    code = (
+        "async def read():\n"
+        "    import os\n"
+        "    return os.environ.get('TOKEN'), os.getenv('TOKEN'), os.sep\n"
+    )
+    customer_id, server_id = uuid4(), uuid4()
+    _ = loader.compile_tool(
+        "t1",
+        "read",
+        "d",
+        [],
+        code,
+        customer_id,
+        env_vars={"TOKEN": "abc"},
+        server_id=server_id,
+    )
+
+    read = loader._customer_namespaces[server_id]["read"]
+    assert asyncio.run(read()) == ("abc", "abc", os.sep)
+
+
+def test_server_tools_share_one_pooled_http_client() -> None:
+    loader = DynamicToolLoader()
+    code = (
+        "async def fetch():\n"
+        "    async with http_client as client:\n"
+        "        return client\n"
+    )
+    customer_id, server_a, server_b = uuid4(), uuid4(), uuid4()
+    for server_id in (server_a, server_b):
+        _ = loader.compile_tool(
+            "t1", "fetch", "d", [], code, customer_id, server_id=server_id
+        )
+
+    ns_a = loader._customer_namespaces[server_a]
+    client = ns_a["http_client"]
+    assert client is not loader._customer_namespaces[server_b]["http_client"]
+
+    async def _run() -> None:
+        # Tool code cannot close the shared client
+        assert await ns_a["fetch"]() is client
+        assert not client.is_closed
+
+        await loader.close_http_client(server_a)
+        assert client.is_closed
+        assert not ns_a["http_client"].is_closed
+
+    asyncio.run(_run())
+
+
+def test_shared_http_client_keeps_no_state_between_calls() -> None:
+    def _handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/login":
+            return httpx.Response(200, headers={"Set-Cookie": "session=user-a"})
+        return httpx.Response(
+            200,
+            json={
+                "cookie": request.headers.get("cookie"),
+                "token": request.headers.get("x-token"),
+            },
+        )
+
+    async def _run() -> None:
+        client = ServerHTTPClient(transport=httpx.MockTransport(_handler))
+        # User A's call logs in and tries to leave a default header behind
+        _ = await client.get("https://upstream.test/login")
+        client.headers["X-Token"] = "user-a"
+        with pytest.raises(AttributeError, match="read-only"):
+            client.headers = {"X-Token": "user-a"}
+        with pytest.raises(AttributeError, match="read-only"):
+            client.cookies = {"session": "user-a"}
+
+        # User B's call sends neither
+        response = await client.get("https://upstream.test/me")
+        assert response.json() == {"cookie": None, "token": None}
+
+        # Per-request cookies and headers still work
+        response = await client.get(
+            "https://upstream.test/me",
+            headers={"X-Token": "user-b", "Cookie": "session=user-b"},
+        )
+        assert response.json() == {"cookie": "session=user-b", "token": "user-b"}
+        await client.close_pool()
+
+    asyncio.run(_run())
+
+
+def test_concurrent_compiles_from_threads_stay_consistent() -> None:
+    """Startup compiles servers in worker threads against one loader."""
+    loader = DynamicToolLoader()
+    customer_id = uuid4()
+    servers = [uuid4() for _ in range(40)]
+
+    def _compile_server(server_id) -> None:
+        for i in range(5):
+            _ = loader.compile_tool(
+                f"{server_id}-{i}",
+                f"tool_{i}",
+                "d",
+                [],
+                _code(f"tool_{i}", str(i)),
+                customer_id,
+                server_id=server_id,
+            )
+        loader.invalidate_server_tools(server_id)
+        _ = loader.compile_tool(
+            f"{server_id}-0",
+            "tool_0",
+            "d",
+            [],
+            _code("tool_0", "0"),
+            customer_id,
+            server_id=server_id,
+        )
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        _ = list(pool.map(_compile_server, servers))
+
+    assert set(loader._customer_namespaces) == set(servers)
+    assert loader.cache_stats.entries == len(servers)
+    assert loader.cache_stats.code_entries == 5
@@ -0,0 +1,125 @@
+"""Tests for the process-pool tool execution backend."""
+
+import asyncio
+import os
+from typing import Any
+from uuid import UUID, uuid4
+
+import pytest
+from fastmcp.exceptions import ToolError
+
+from core.services import tool_limits, tool_process_pool
+from core.services.request_context import request_env_vars
+from core.services.tool_limits import ToolExecutionLimiter
+from core.services.tool_loader import DynamicToolLoader
+from core.services.tool_process_pool import ProcessToolError, ProcessToolExecutor
+from settings import settings
+
+pytestmark = pytest.mark.anyio
+
+CODE = """
+import os
+
+
+async def where(label: str) -> dict:
+    if label == "fail":
+        raise ValueError("bad label")
+    return {
+        "label": label,
+        "pid": os.getpid(),
+        "token": os.environ.get("TOKEN"),
+        "region": os.getenv("REGION"),
+    }
+"""
+
+
+@pytest.fixture
+def executor(monkeypatch: pytest.MonkeyPatch):
+    executor = ProcessToolExecutor(max_workers=1)
+    monkeypatch.setattr(tool_process_pool, "_process_tool_executor", executor)
+    monkeypatch.setattr(settings, "MCP_TOOL_EXECUTION_BACKEND", "process")
+    yield executor
+    executor.shutdown()
+
+
+async def test_tool_runs_in_a_worker_with_env_layers(executor: ProcessToolExecutor):
+    tool = DynamicToolLoader().compile_tool(
+        tool_id=str(uuid4()),
+        name="where",
+        description="Report where the tool ran",
+        parameters=[{"name": "label", "type": "string", "required": True}],
+        code=CODE,
+        customer_id=uuid4(),
+        env_vars={"TOKEN": "static-token", "REGION": "static-region"},
+        server_id=uuid4(),
+    )
+
+    env_token = request_env_vars.set({"REGION": "from-request"})
+    try:
+        result = await tool.fn(label="x")
+    finally:
+        request_env_vars.reset(env_token)
+
+    assert result == {
+        "label": "x",
+        "pid": result["pid"],
+        "token": "static-token",
+        "region": "from-request",
+    }
+    assert result["pid"] != os.getpid()
+
+    with pytest.raises(ProcessToolError, match="ValueError: bad label"):
+        _ = await tool.fn(label="fail")
+
+
+SPIN_CODE = """
+async def spin(rounds: int) -> int:
+    total = 0
+    while rounds < 0 or total < rounds:
+        total += 1
+    return total
+"""
+
+
+def _compile_spin(customer_id: UUID) -> Any:
+    return DynamicToolLoader().compile_tool(
+        tool_id=str(uuid4()),
+        name="spin",
+        description="Busy-loop without awaiting",
+        parameters=[{"name": "rounds", "type": "integer", "required": True}],
+        code=SPIN_CODE,
+        customer_id=customer_id,
+        server_id=uuid4(),
+    )
+
+
+async def test_timed_out_call_frees_its_worker(
+    executor: ProcessToolExecutor, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _ = await asyncio.wrap_future(executor.pool.submit(os.getpid))
+    monkeypatch.setattr(tool_limits, "_tool_limiter", ToolExecutionLimiter(timeout=2))
+    tool_customer = uuid4()
+    tool = _compile_spin(tool_customer)
+
+    with pytest.raises(ToolError, match="timed out"):
+        _ = await tool.fn(rounds=-1)
+    assert executor.in_flight(tool_customer) == 0
+
+    # The single worker stopped the spinning call and is free again
+    assert await tool.fn(rounds=10) == 10
+
+
+async def test_customer_cannot_take_every_worker(
+    executor: ProcessToolExecutor,
+) -> None:
+    executor.max_customer_calls = 1
+    customer_id = uuid4()
+    tool = _compile_spin(customer_id)
+
+    slow = asyncio.create_task(tool.fn(rounds=3_000_000))
+    await asyncio.sleep(0)
+    assert executor.in_flight(customer_id) == 1
+    with pytest.raises(ToolError, match="limit 1"):
+        _ = await tool.fn(rounds=1)
+    assert await _compile_spin(uuid4()).fn(rounds=1) == 1
+    assert await slow == 3_000_000
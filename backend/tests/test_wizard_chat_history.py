@@ -0,0 +1,77 @@
+"""Tests for wizard chat history persistence."""
+
+import asyncio
+
+import pytest
+
+from core.services.wizard_steps_services import WizardStepsService
+from infrastructure.models import Customer
+from infrastructure.repositories.repo_provider import Provider
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_appends_keep_every_message(
+    provider: type[Provider], customer: Customer
+):
+    service = WizardStepsService()
+    server = await service.start_wizard_session(customer.id)
+
+    _ = await asyncio.gather(
+        *(
+            service._append_chat_message(
+                server.id, {"role": "user", "content": f"message {i}"}
+            )
+            for i in range(5)
+        )
+    )
+
+    messages = await Provider.mcp_server_repo().get_chat_messages(server.id)
+    assert [m.seq for m in messages] == [1, 2, 3, 4, 5]
+    contents = sorted(m.content for m in messages)
+    assert contents == [f"message {i}" for i in range(5)]
+
+
+async def test_assistant_turn_is_saved_with_details_and_description(
+    provider: type[Provider], customer: Customer
+):
+    service = WizardStepsService()
+    server = await service.start_wizard_session(customer.id)
+    _ = await Provider.mcp_server_repo().merge_meta(server.id, {"other": "kept"})
+    history = [{"role": "user", "content": "weather tools please"}]
+    await service._append_chat_message(server.id, history[0])
+
+    reply = (
+        f"{service.TECHNICAL_DETAILS_MARKER}uses open-meteo"
+        f"{service.END_TECHNICAL_DETAILS_MARKER}\n"
+        f"{service.READY_TO_START_MARKER}Weather lookup server"
+        f"{service.END_READY_MARKER}"
+    )
+    await service._post_process_assistant_response(server.id, reply, history)
+
+    messages = await Provider.mcp_server_repo().get_chat_messages(server.id)
+    assert [m.role for m in messages] == ["user", "assistant"]
+    assert await service.is_spec_ready(server.id)
+    stored = await Provider.mcp_server_repo().get(server.id)
+    assert stored is not None
+    assert stored.meta["technical_details"] == ["uses open-meteo"]
+    assert stored.meta["other"] == "kept"
+    assert stored.description == "Weather lookup server"
+
+
+async def test_chat_tail_is_paginated_by_seq(
+    provider: type[Provider], customer: Customer
+):
+    service = WizardStepsService()
+    server = await service.start_wizard_session(customer.id)
+    repo = Provider.mcp_server_repo()
+    _ = await repo.append_chat_messages(
+        server.id, [{"role": "user", "content": f"m{i}"} for i in range(1, 8)]
+    )
+
+    tail = await repo.get_chat_messages(server.id, limit=3)
+    assert [m.content for m in tail] == ["m5", "m6", "m7"]
+
+    page = await repo.get_chat_messages(server.id, limit=3, before_seq=tail[0].seq)
+    assert [m.content for m in page] == ["m2", "m3", "m4"]
+    assert not await service.is_spec_ready(server.id)